@@ -1,44 +1,46 @@
 # استيراد المكتبات اللازمة للعبة
 import tkinter as tk
 from tkinter import messagebox
-from typing import Optional, List, Dict, Set
-from dataclasses import dataclass
+from typing import Optional, Tuple
 from base_game_gui import BaseGameGUI
+from ai_player import AIPlayer
 from player import Player
 from move import Move
 from game_state import GameState
 from theme import Theme
-import heapq
-
-# تعريف فئة Node لتمثيل حالة في شجرة البحث
-@dataclass
-class Node:
-    # تخزين الحالة الحالية للعبة
-    state: GameState  
-    # تخزين الحركة التي أدت إلى هذه الحالة
-    move: Move  
-    # تخزين تكلفة المسار من البداية إلى هذه الحالة
-    g_cost: float  
-    # تخزين التكلفة التقديرية المتوقعة للوصول للهدف
-    h_cost: float  
-    # تخزين مرجع للعقدة الأب (الحالة السابقة)
-    parent: Optional['Node'] = None  
-
-    # حساب التكلفة الكلية (f = g + h)
-    def f_cost(self) -> float:
-        # حساب التكلفة الكلية بجمع تكلفة المسار والتكلفة التقديرية
-        return self.g_cost + self.h_cost
-
-    # تعريف عملية المقارنة بين العقد حسب التكلفة الكلية
-    def __lt__(self, other):
-        # تعريف كيفية مقارنة العقد مع بعضها البعض باستخدام التكلفة الكلية
-        return self.f_cost() < other.f_cost()
+from rules import Rules
+from search_budget import SearchBudget
+from difficulty import Difficulty
+from background_search import SearchTask
+from pondering import Ponderer
+from search_stats import SearchStats
+from position_cache import shared_position_cache
+from game_record import HUMAN
+
+# أقل وقت قبل ظهور حركة الكمبيوتر (بالثواني) - تأخير شكلي يشمل وقت الحساب ولا يُضاف إليه
+AI_MOVE_DELAY = 0.5
+# الفترة بين كل فحص لنتيجة البحث وتحديث مؤشر التقدم (بالمللي ثانية)
+PROGRESS_INTERVAL = 100
+SPINNER = '⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏'
 
 # فئة اللعب ضد الذكاء الاصطناعي
+# الواجهة من BaseGameGUI، واختيار الحركة من لاعب الكمبيوتر (AIPlayer) الذي تملكه اللعبة
 class AIGame(BaseGameGUI):
-    def __init__(self, window: tk.Tk, theme: Theme):
+    def __init__(self, window: tk.Tk, theme: Theme, difficulty: Difficulty = Difficulty.HARD,
+                 engine: str = 'alphabeta', weights: Optional[Tuple[float, ...]] = None,
+                 ponder: bool = True, rules: Rules = Rules.CLASSIC):
         # تهيئة الفئة الأساسية للواجهة الرسومية
-        super().__init__(window, theme)
+        super().__init__(window, theme, rules)
+        # لاعب الكمبيوتر: محركات البحث وجدول التحويلات
+        self.ai = AIPlayer(difficulty, engine, weights)
+        # نتائج البحث تُحفظ على القرص وتُستخدم في الجلسات التالية
+        self.ai.position_cache = shared_position_cache()
+        # البحث الجاري في الخيط الخلفي وموعد الفحص التالي له
+        self._ai_task: Optional[SearchTask] = None
+        self._ai_after: Optional[str] = None
+        self._ai_ticks = 0
+        # التفكير أثناء دور اللاعب (None لتعطيله)
+        self.ponderer: Optional[Ponderer] = self._create_ponderer(self.ai) if ponder else None
         # إنشاء الواجهة الرسومية الأساسية للعبة
         self.create_base_gui("Tic Tac Toe vs AI")
         # تهيئة متغير لتخزين دالة الرجوع للقائمة الرئيسية
@@ -47,174 +49,196 @@ class AIGame(BaseGameGUI):
     # معالجة حركة اللاعب
     def _handle_move(self, row: int, col: int):
         # التحقق من أن المربع فارغ وأنه دور اللاعب X
-        if self.board.grid[row][col] == Player.EMPTY and self.current_player == Player.X:
+        if self.board.cell(row, col) == Player.EMPTY and self.current_player == Player.X:
             move = Move(row, col)  # إنشاء حركة جديدة
             self._make_player_move(move)  # تنفيذ حركة اللاعب
             # التحقق من انتهاء اللعبة بعد حركة اللاعب
             if not self._check_game_end(Player.X):
                 self.current_player = Player.O  # تغيير الدور للكمبيوتر
                 self.turn_indicator.configure(text=self._get_turn_text())  # تحديث مؤشر الدور
-                self.window.after(500, self._make_ai_move)  # تنفيذ حركة الكمبيوتر بعد نصف ثانية
+                self._start_ai_move()  # حساب حركة الكمبيوتر في الخلفية
 
     # تنفيذ حركة اللاعب على اللوحة
     def _make_player_move(self, move: Move):
         if self.board.make_move(move, Player.X):  # إذا كانت الحركة صحيحة
-            button = self.buttons[move.row][move.col]  # الحصول على الزر المناسب
-            button.configure(  # تحديث شكل الزر
-                text=Player.X.value,
-                fg=self.current_theme.value['x_color']
-            )
+            self._set_cell(move.row, move.col, Player.X)  # تحديث شكل الزر
+
+    # بدء حساب حركة الكمبيوتر في خيط خلفي
+    # الحالة تُنسخ من اللوحة هنا في خيط الواجهة، والخيط الخلفي لا يلمس اللوحة أو عناصر Tkinter
+    def _start_ai_move(self):
+        self._cancel_ai_move(stop_pondering=False)  # التفكير المسبق ينتهي داخل _answer
+        state = self._ai_state()
+        # الخيط الخلفي يستخدم اللاعب والتفكير المسبق الحاليين حتى لو استُبدلا بعد إلغائه
+        ai, ponderer = self.ai, self.ponderer
+        self._ai_task = SearchTask(lambda budget: self._answer(ai, ponderer, state, budget),
+                                   SearchBudget.from_difficulty(self.ai.difficulty))
+        self._ai_ticks = 0
+        self._ai_after = self.window.after(PROGRESS_INTERVAL, self._poll_ai_move)
+
+    # فحص دوري من خيط الواجهة: تحديث مؤشر التقدم أو تنفيذ الحركة عند جاهزيتها
+    def _poll_ai_move(self):
+        self._ai_after = None
+        task = self._ai_task
+        if task is None:
+            return
+        if not task.done or task.elapsed < AI_MOVE_DELAY:
+            self._ai_ticks += 1
+            self.turn_indicator.configure(text=self._get_progress_text(task))
+            self._ai_after = self.window.after(PROGRESS_INTERVAL, self._poll_ai_move)
+            return
+        self._ai_task = None
+        self._make_ai_move(task.get())
+
+    # رد الكمبيوتر: من نتائج التفكير المسبق إن وجدت، وإلا بالبحث العادي (في الخيط الخلفي)
+    # لا تقرأ self.ai أو self.ponderer لأنهما قد يُستبدلان من خيط الواجهة أثناء البحث
+    def _answer(self, ai: AIPlayer, ponderer: Optional[Ponderer], state: GameState,
+                budget: SearchBudget) -> Optional[Move]:
+        if ponderer is not None:
+            stats = SearchStats(ai.engine, state.size, state.player.value,
+                                ai.transposition_table) if ai.instrument else None
+            move = ponderer.finish(state.x_bits, state.o_bits, budget)
+            if move is not None or budget.cancelled:
+                if stats is not None and move is not None:
+                    stats.source = 'ponder'
+                    stats.finish(move, 0)
+                    ai.record_stats(stats)
+                return move
+        return ai.get_move(state, budget)
+
+    # التفكير المسبق مرتبط بلاعب واحد: يبحث بمحركاته ويقرأ جدول تحويلاته
+    def _create_ponderer(self, ai: AIPlayer) -> Ponderer:
+        return Ponderer(lambda state, budget: ai.get_move(state, budget, 'ponder'),
+                        lambda: SearchBudget.from_difficulty(ai.difficulty),
+                        ai.transposition_table)
+
+    # بدء التفكير في ردود اللاعب المحتملة بعد أن لعب الكمبيوتر
+    def _start_pondering(self):
+        if self.ponderer is not None:
+            self.ponderer.start(GameState.from_bits(self.board.size, self.board.x_bits,
+                                                    self.board.o_bits, Player.X,
+                                                    weights=self.ai.weights,
+                                                    win_length=self.board.win_length,
+                                                    neighborhood=self.rules.value['neighborhood']))
+
+    # إلغاء البحث الجاري والتفكير المسبق (عند بدء لعبة جديدة أو مغادرة اللعبة)
+    # ننتظر توقف الخيط لأن المحركات وجدول التحويلات مشتركة مع البحث التالي،
+    # والمحركات تلاحظ الإلغاء عادة خلال بضع مئات من العقد. الانتظار محدود حتى لا تتجمد
+    # الواجهة: إذا لم يتوقف البحث في الوقت المحدد يبقى اللاعب القديم للخيط القديم وحده،
+    # ويبدأ البحث التالي بلاعب جديد (محركات وجدول تحويلات جديدة) وتفكير مسبق جديد
+    def _cancel_ai_move(self, stop_pondering: bool = True):
+        if self._ai_after is not None:
+            self.window.after_cancel(self._ai_after)
+            self._ai_after = None
+        stopped = True
+        if self._ai_task is not None:
+            stopped = self._ai_task.stop()
+            self._ai_task = None
+        if stop_pondering and self.ponderer is not None:
+            stopped = self.ponderer.stop() and stopped
+        if not stopped:
+            self._replace_ai()
+
+    # لاعب جديد بنفس الإعدادات بدلاً من لاعب ما زال خيط ملغى يستخدمه
+    # (عمليات البحث المتوازي للاعب القديم تُغلق تلقائياً عندما يتوقف استخدامه)
+    def _replace_ai(self):
+        old = self.ai
+        self.ai = AIPlayer(old.difficulty, old.engine, old.weights, old.seed)
+        self.ai.position_cache = old.position_cache
+        self.ai.memory_limit = old.memory_limit
+        self.ai.instrument = old.instrument
+        if self.ponderer is not None:
+            self.ponderer = self._create_ponderer(self.ai)
+
+    # نص مؤشر التقدم أثناء تفكير الكمبيوتر
+    def _get_progress_text(self, task: SearchTask) -> str:
+        text = f"AI is thinking {SPINNER[self._ai_ticks % len(SPINNER)]} {task.elapsed:.1f}s"
+        alpha_beta = self.ai.alpha_beta
+        if self.ai.engine == 'alphabeta' and alpha_beta.completed_depth:
+            text += f" (depth {alpha_beta.completed_depth}, {alpha_beta.nodes:,} nodes)"
+        return text
 
     # تنفيذ حركة الكمبيوتر
-    def _make_ai_move(self):
-        move = self._get_ai_move()  # الحصول على أفضل حركة من الخوارزمية
+    def _make_ai_move(self, move: Optional[Move]):
         if move:  # إذا وجدت حركة ممكنة
             if self.board.make_move(move, Player.O):  # تنفيذ الحركة
-                button = self.buttons[move.row][move.col]  # تحديث الزر
-                button.configure(
-                    text=Player.O.value,
-                    fg=self.current_theme.value['o_color']
-                )
+                self._set_cell(move.row, move.col, Player.O)  # تحديث الزر
                 # التحقق من انتهاء اللعبة والتغيير للاعب التالي
+                if self.debug_visible and self.ai.last_stats is not None:
+                    self.show_debug(self.ai.last_stats.summary())
                 if not self._check_game_end(Player.O):
                     self.current_player = Player.X
                     self.turn_indicator.configure(text=self._get_turn_text())
+                    self._start_pondering()
+
+    # التراجع عن حركة الكمبيوتر وحركة اللاعب معاً حتى يعود الدور للاعب
+    def undo_move(self):
+        if self.current_player != Player.X:
+            return  # الكمبيوتر على وشك اللعب
+        if len(self.board.history) >= 2:
+            self._cancel_ai_move()  # التفكير المسبق كان لوضع لم يعد موجوداً
+            super().undo_move()
+            super().undo_move()
+            self._start_pondering()
+
+    # إعادة حركة اللاعب وحركة الكمبيوتر التي تلتها
+    def redo_move(self):
+        if self.current_player != Player.X:
+            return
+        if len(self.board.redo_stack) >= 2:
+            self._cancel_ai_move()
+            super().redo_move()
+            super().redo_move()
+            self._start_pondering()
+
+    # حالة البحث المأخوذة من اللوحة الحالية (دور الكمبيوتر)
+    def _ai_state(self) -> GameState:
+        return GameState.from_bits(self.board.size, self.board.x_bits, self.board.o_bits,
+                                   Player.O, weights=self.ai.weights,
+                                   win_length=self.board.win_length,
+                                   neighborhood=self.rules.value['neighborhood'])
 
     # الحصول على أفضل حركة للكمبيوتر
-    def _get_ai_move(self) -> Optional[Move]:
-        # معالجة الحركة الأولى بشكل خاص
-        if all(cell == Player.EMPTY for row in self.board.grid for cell in row):
-            if self.board.grid[1][1] == Player.EMPTY:
-                return Move(1, 1)  # اختيار المركز إذا كان متاحاً
-            return Move(0, 0)  # اختيار الزاوية إذا كان المركز مشغولاً
-
-        # إنشاء حالة أولية وتنفيذ خوارزمية A*
-        initial_state = GameState([row.copy() for row in self.board.grid], Player.O)
-        return self._a_star_search(initial_state)
-
-    # حساب قيمة تقديرية لحالة اللعبة
-    def _calculate_heuristic(self, state: GameState) -> float:
-        # تهيئة متغير لتخزين النتيجة التقديرية
-        score = 0.0
-        
-        # فحص الصفوف والأعمدة والأقطار
-        for i in range(state.size):
-            # استخراج الصف الحالي من اللوحة
-            row = [state.grid[i][j] for j in range(state.size)]  # فحص الصف
-            # إضافة تقييم الصف للنتيجة الكلية
-            score += self._evaluate_line(row)
-            
-            # استخراج العمود الحالي من اللوحة
-            col = [state.grid[j][i] for j in range(state.size)]  # فحص العمود
-            # إضافة تقييم العمود للنتيجة الكلية
-            score += self._evaluate_line(col)
-
-        # فحص الأقطار
-        # استخراج القطر الرئيسي
-        diag1 = [state.grid[i][i] for i in range(state.size)]
-        # استخراج القطر الثانوي
-        diag2 = [state.grid[i][state.size-1-i] for i in range(state.size)]
-        # إضافة تقييم القطرين للنتيجة الكلية
-        score += self._evaluate_line(diag1)
-        score += self._evaluate_line(diag2)
-
-        return score
-
-    # تقييم خط معين (صف، عمود، أو قطر)
-    def _evaluate_line(self, line: List[Player]) -> float:
-        o_count = line.count(Player.O)
-        x_count = line.count(Player.X)
-        empty_count = line.count(Player.EMPTY)
-
-        if o_count == 3:
-            return 100.0  # فوز للكمبيوتر
-        elif x_count == 3:
-            return -100.0  # فوز للاعب
-        elif o_count == 2 and empty_count == 1:
-            return 10.0  # فرصة فوز للكمبيوتر
-        elif x_count == 2 and empty_count == 1:
-            return -10.0  # فرصة فوز للاعب
-        elif o_count == 1 and empty_count == 2:
-            return 1.0  # أفضلية مبكرة للكمبيوتر
-        elif x_count == 1 and empty_count == 2:
-            return -1.0  # أفضلية مبكرة للاعب
-        return 0.0
-
-    # خوارزمية البحث A* للعثور على أفضل حركة
-    def _a_star_search(self, initial_state: GameState) -> Optional[Move]:
-        # إنشاء قائمة الحالات المفتوحة التي سيتم استكشافها
-        open_set: List[Node] = []
-        # إنشاء مجموعة الحالات المغلقة التي تم استكشافها
-        closed_set: Set[str] = set()
-        
-        # إنشاء العقدة الأولية مع الحالة الابتدائية
-        start_node = Node(
-            state=initial_state,
-            move=None,
-            g_cost=0,
-            h_cost=self._calculate_heuristic(initial_state)
-        )
-        
-        # إضافة العقدة الأولية إلى قائمة الحالات المفتوحة
-        heapq.heappush(open_set, start_node)
-        
-        while open_set:
-            current = heapq.heappop(open_set)
-            
-            # تخطي إذا تم استكشاف هذه الحالة مسبقاً
-            state_hash = str([str(row) for row in current.state.grid])
-            if state_hash in closed_set:
-                continue
-                
-            closed_set.add(state_hash)
-            
-            # التحقق مما إذا كانت هذه حالة فوز
-            if current.state.check_winner(Player.O):
-                # التراجع للحصول على الحركة الأولية
-                while current.parent and current.parent.parent:
-                    current = current.parent
-                return current.move
-            
-            # توليد الخلفاء
-            for next_state, move in current.state.get_successors():
-                if str([str(row) for row in next_state.grid]) in closed_set:
-                    continue
-                    
-                g_cost = current.g_cost + 1
-                h_cost = self._calculate_heuristic(next_state)
-                
-                successor = Node(
-                    state=next_state,
-                    move=move,
-                    g_cost=g_cost,
-                    h_cost=h_cost,
-                    parent=current
-                )
-                
-                heapq.heappush(open_set, successor)
-        
-        # إذا لم يتم العثور على مسار فوز، إرجاع الحركة ذات القيمة التقديرية الأفضل
-        best_move = None
-        best_value = float('-inf')
-        
-        for next_state, move in initial_state.get_successors():
-            value = self._calculate_heuristic(next_state)
-            if value > best_value:
-                best_value = value
-                best_move = move
-                
-        return best_move
+    # تُستدعى من الخيط الخلفي، لذلك تعتمد على الحالة المنسوخة فقط وليس على اللوحة
+    def _get_ai_move(self, initial_state: Optional[GameState] = None,
+                     budget: Optional[SearchBudget] = None) -> Optional[Move]:
+        if initial_state is None:
+            initial_state = self._ai_state()
+        return self.ai.get_move(initial_state, budget)
+
+    # إلغاء تفكير الكمبيوتر عند بدء جولة جديدة
+    def reset_board(self):
+        self._cancel_ai_move()
+        super().reset_board()
+
+    # إيقاف البحث الجاري وعمليات البحث المتوازي عند مغادرة اللعبة
+    def close(self):
+        self._cancel_ai_move()
+        self.ai.close()
+        super().close()
+
+    # اللاعب يلعب بـ X والكمبيوتر بـ O
+    def _record_players(self) -> Tuple[str, str]:
+        return HUMAN, self.ai.engine
+
+    # القياس يعمل ما دامت لوحة التصحيح ظاهرة (أو عند تحديد ملف السجل)
+    def _on_debug_toggled(self, visible: bool):
+        self.ai.instrument = visible or self.ai.trace is not None
+        if visible:
+            self.show_debug(self.ai.last_stats.summary() if self.ai.last_stats is not None
+                            else "Search stats appear after the AI's next move")
 
     # التحقق من انتهاء اللعبة
     def _check_game_end(self, player: Player) -> bool:
         if self.board.check_winner(player):
             self.update_scores(player)
+            self.record_game(player)
             messagebox.showinfo("Game Over",
                               f"{'Player' if player == Player.X else 'AI'} {player.value} wins!")
             self.reset_board()
             return True
 
         if self.board.is_full():
+            self.record_game(None)
             messagebox.showinfo("Game Over", "It's a tie!")
             self.reset_board()
             return True
@@ -0,0 +1,423 @@
+# منطق اختيار حركة الكمبيوتر بمعزل عن الواجهة الرسومية
+# يستخدمه AIGame داخل نافذة Tkinter، ويمكن استخدامه مباشرة في أي برنامج دون واجهة (مثل arena.py)
+import sys
+import time
+from functools import lru_cache
+from typing import Optional, List, Tuple
+from player import Player
+from move import Move
+from game_state import GameState
+from transposition import CLOSED, TranspositionTable
+from perfect_play import perfect_play_table
+from tablebase import open_tablebase
+from alphabeta import AlphaBetaSearch
+from search_budget import SearchBudget, SearchTimeout
+from difficulty import Difficulty
+from evaluation import encode_line, pattern_scores
+from parallel_search import PARALLEL_MIN_SIZE, ParallelSearch
+from mcts import MCTSSearch
+from threats import THREAT_MIN_SIZE, ThreatSearch
+from position_cache import PositionCache
+from search_stats import SearchStats, SearchTrace
+import heapq
+
+# عقدة A* في القائمة المفتوحة صف (tuple) ثابت الحجم بدلاً من كائن يحمل حالة كاملة:
+# (الأولوية f = g + h محسوبة مسبقاً، g، مفتاح الحالة، القناعان في عدد واحد،
+#  خلية حركة الجذر، هل فاز O)
+# الحالة الكاملة تُبنى فقط عند توسيع العقدة
+F_COST, G_COST, KEY, PACKED, ROOT_MOVE, O_WINS = range(6)
+# الحد الافتراضي لذاكرة القائمة المفتوحة في A* (بالبايت)
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+# قيمة خاصة يُرجعها IDA* عند إيجاد مسار فوز
+FOUND = -1.0
+
+
+# ضغط القناعين في عدد واحد: خلايا X في البتات المنخفضة وخلايا O فوقها
+def pack_bits(size: int, x_bits: int, o_bits: int) -> int:
+    return x_bits | o_bits << (size * size)
+
+
+def unpack_bits(size: int, packed: int) -> Tuple[int, int]:
+    cells = size * size
+    return packed & ((1 << cells) - 1), packed >> cells
+
+
+# تقدير حجم عقدة واحدة في الذاكرة (الصف مع الأعداد الكبيرة التي لا يشاركها مع غيره)
+@lru_cache(maxsize=None)
+def node_bytes(size: int) -> int:
+    sample = OpenNode((1e12, 1 << 40, (1 << 64) - 1, 1 << (2 * size * size), 0, False))
+    return sys.getsizeof(sample) + sum(sys.getsizeof(value) for value in sample[:4])
+
+
+# المقارنة بالأولوية f وحدها كما في العقدة الأصلية: العقد المتساوية في f لا تُرتَّب
+# بأي حقل آخر، فيبقى ترتيب سحبها من heapq (وبالتالي الحركة المختارة) كما كان
+class OpenNode(tuple):
+    __slots__ = ()
+
+    def __lt__(self, other: 'OpenNode') -> bool:
+        return self[F_COST] < other[F_COST]
+
+
+# لاعب الكمبيوتر: محركات البحث وجدول التحويلات الخاص بها
+class AIPlayer:
+    # محركات البحث المتاحة
+    ENGINES = ('alphabeta', 'parallel', 'mcts', 'astar', 'idastar')
+
+    # seed: بذرة المولد العشوائي لمحرك MCTS (None لبذرة مختلفة في كل تشغيل)
+    def __init__(self, difficulty: Difficulty = Difficulty.HARD, engine: str = 'alphabeta',
+                 weights: Optional[Tuple[float, ...]] = None, seed: Optional[int] = None):
+        self.difficulty = difficulty  # مستوى الصعوبة (ميزانية البحث)
+        self.engine = engine  # محرك البحث المستخدم
+        self.weights = weights  # أوزان تقييم الخطوط (None للقيم الافتراضية)
+        self.seed = seed  # بذرة MCTS (تُحفظ لإنشاء لاعب جديد بنفس الإعدادات)
+        # جدول التحويلات المشترك بين جميع محركات البحث
+        self.transposition_table = TranspositionTable()
+        self.alpha_beta = AlphaBetaSearch(self.transposition_table, self._calculate_heuristic)
+        # البحث المتوازي على عدة أنوية (يُنشأ عند أول استخدام)
+        self.parallel_search: Optional[ParallelSearch] = None
+        # شجرة مونت كارلو تُحفظ بين الحركات لإعادة استخدامها
+        self.mcts = MCTSSearch(seed=seed)
+        # بحث التهديدات الإجبارية يسبق جميع المحركات على اللوحات الكبيرة
+        self.threats = ThreatSearch()
+        # الحد الأقصى لذاكرة القائمة المفتوحة في A* (بالبايت)
+        self.memory_limit = DEFAULT_MEMORY_LIMIT
+        self._ida_depth = 0
+        self._ida_next_check = 0  # عدد العقد عند الفحص التالي للميزانية في IDA*
+        self.nodes = 0  # عدد العقد في آخر بحث
+        self.depth = 0  # العمق المكتمل في آخر بحث (0 للمحركات التي لا تبحث بالعمق)
+        self.value = 0.0  # قيمة الجذر لصاحب الدور في آخر بحث ألفا-بيتا
+        # ذاكرة دائمة لنتائج البحث بين الجلسات (معطلة افتراضياً، تفعّلها اللعبة)
+        self.position_cache: Optional[PositionCache] = None
+        # قياس كل عملية بحث (معطل افتراضياً، ويُفعَّل تلقائياً عند تحديد ملف السجل)
+        self.trace: Optional[SearchTrace] = SearchTrace.from_environment()
+        self.instrument = self.trace is not None
+        self.last_stats: Optional[SearchStats] = None
+
+    # الحصول على أفضل حركة لصاحب الدور في الحالة (X أو O)
+    # لا تعتمد على أي لوحة أو واجهة، لذلك يمكن استدعاؤها من خيط خلفي أو عملية أخرى
+    # context: يُسجَّل مع الإحصاءات لتمييز الحركات الفعلية عن بحث التفكير المسبق
+    def get_move(self, initial_state: GameState, budget: Optional[SearchBudget] = None,
+                 context: str = 'move') -> Optional[Move]:
+        if budget is None:
+            budget = SearchBudget.from_difficulty(self.difficulty)
+        self.nodes = 0
+        self.depth = 0
+        self.value = 0.0
+        if not self.instrument:
+            return self._select_move(initial_state, budget, None)
+
+        stats = SearchStats(self.engine, initial_state.size, initial_state.player.value,
+                            self.transposition_table, context)
+        move = self._select_move(initial_state, budget, stats)
+        stats.finish(move, self.nodes)
+        self.record_stats(stats)
+        return move
+
+    # حفظ إحصاءات آخر حركة وكتابتها في سجل القياس (تستدعيها اللعبة أيضاً لردود التفكير المسبق)
+    def record_stats(self, stats: SearchStats):
+        if stats.context == 'move':
+            self.last_stats = stats
+        if self.trace is not None:
+            self.trace.write(stats)
+
+    # stats: إحصاءات البحث الحالي (None عند تعطيل القياس)
+    def _select_move(self, initial_state: GameState, budget: SearchBudget,
+                     stats: Optional[SearchStats]) -> Optional[Move]:
+        # الجداول المحلولة مبنية لقاعدة الخط الكامل فقط (طول الفوز = حجم اللوحة)
+        if self.difficulty.value['perfect_tables'] and initial_state.win_length == initial_state.size:
+            # استخدام جدول اللعب المثالي إذا كان جاهزاً لهذا الحجم
+            table = perfect_play_table(initial_state.size)
+            if table is not None and table.ready:
+                move = table.best_move(initial_state)
+                if move:
+                    if stats is not None:
+                        stats.source = 'perfect_play'
+                    return move
+
+            # استخدام قاعدة النتائج المحفوظة على القرص إذا كان ملفها موجوداً (مثل 4×4)
+            tablebase = open_tablebase(initial_state.size)
+            if tablebase is not None:
+                move = tablebase.best_move(initial_state)
+                if move:
+                    if stats is not None:
+                        stats.source = 'tablebase'
+                    return move
+        if stats is not None:
+            stats.mark('tables')
+
+        # نتيجة محفوظة لنفس الموقف (أو موقف متماثل) من بحث سابق في هذه الجلسة أو جلسة سابقة
+        # النتائج بأوزان تقييم مخصصة لا تُحفظ لأنها لا تصلح لغيرها
+        cache = self.position_cache if self.weights is None else None
+        if cache is not None:
+            entry = cache.lookup(initial_state, self.engine, self.difficulty.name)
+            if entry is not None:
+                index = initial_state.from_canonical(entry.move)
+                if not (initial_state.x_bits | initial_state.o_bits) >> index & 1:
+                    if stats is not None:
+                        stats.source = 'cache'
+                        stats.depth = entry.depth
+                    return Move(index // initial_state.size, index % initial_state.size)
+
+        move = self._search_move(initial_state, budget, stats)
+        if cache is not None and move is not None and not budget.cancelled:
+            cache.store(initial_state, self.engine, self.difficulty.name,
+                        move.row * initial_state.size + move.col,
+                        self.value, self.depth)
+        return move
+
+    # البحث عن الحركة: التهديدات الإجبارية ثم المحرك المختار
+    def _search_move(self, initial_state: GameState, budget: SearchBudget,
+                     stats: Optional[SearchStats]) -> Optional[Move]:
+        # سلسلة فوز إجبارية تُلعب مباشرة، وإذا كان للخصم سلسلة فوز تُلعب الحركة الوحيدة التي تمنعها
+        # أو يُحصر جذر ألفا-بيتا في الحركات التي تمنعها إذا كانت أكثر من واحدة
+        forced = None
+        if self.difficulty.value['threat_search'] and initial_state.size >= THREAT_MIN_SIZE:
+            started = time.perf_counter()
+            forced = self.threats.forced_moves(initial_state, budget)
+            self.nodes = self.threats.nodes
+            if budget.time_limit is not None:
+                # المحرك يحصل على ما تبقى من وقت الحركة
+                budget = SearchBudget(max(0.0, budget.time_limit - (time.perf_counter() - started)),
+                                      budget.node_limit, budget.max_depth, budget.cancel_event)
+            if stats is not None:
+                stats.mark('threats')
+            if forced is not None and len(forced) == 1:
+                if stats is not None:
+                    stats.source = 'threats'
+                return Move(forced[0] // initial_state.size, forced[0] % initial_state.size)
+            if not forced:
+                forced = None  # لا توجد حركة تمنع الخسارة، فيختار المحرك أفضل ما يجده
+
+        if self.engine in ('astar', 'idastar'):
+            if initial_state.player == Player.X:
+                # A* و IDA* يبحثان عن مسار فوز لـ O فقط، لذلك يلعب X على لوحة بعلامات متبادلة
+                initial_state = GameState.from_bits(initial_state.size, initial_state.o_bits,
+                                                    initial_state.x_bits, Player.O,
+                                                    weights=initial_state.weights,
+                                                    win_length=initial_state.win_length,
+                                                    neighborhood=initial_state.neighborhood)
+            # على اللوحة الفارغة لا يوجد مسار فوز قريب يوجه البحث، فتُختار خلية المركز مباشرة
+            if not initial_state.x_bits | initial_state.o_bits:
+                center = initial_state.size // 2
+                return Move(center, center)
+            if self.engine == 'idastar':
+                return self._ida_star_search(initial_state, budget, stats)
+            return self._a_star_search(initial_state, budget, stats)
+
+        if self.engine == 'mcts':
+            # عدد المحاكاة = حد العقد في الميزانية، والمحرك يتوقف أيضاً عند انتهاء الوقت
+            move = self.mcts.search(initial_state, budget)
+            self.nodes += self.mcts.playouts
+            return move
+
+        if self.engine == 'parallel' and initial_state.size >= PARALLEL_MIN_SIZE:
+            # عدة عمليات تبحث في نفس الجذر وتتشارك جدول تحويلات في ذاكرة مشتركة
+            if self.parallel_search is None:
+                self.parallel_search = ParallelSearch()
+            move = self.parallel_search.search(initial_state, budget)
+            if budget.cancelled:
+                return None  # البحث أُلغي: لا حاجة لبحث ألفا-بيتا بعده
+            self.nodes += self.parallel_search.nodes
+            self.depth = self.parallel_search.completed_depth
+            if stats is not None:
+                stats.depth = self.depth
+            if move:
+                return move
+
+        # البحث بألفا-بيتا ضمن ميزانية مستوى الصعوبة
+        move = self.alpha_beta.search(initial_state, budget, root_moves=forced)
+        self.nodes += self.alpha_beta.nodes
+        self.depth = self.alpha_beta.completed_depth
+        self.value = self.alpha_beta.value
+        if stats is not None:
+            stats.depth = self.depth
+        return move
+
+    # إيقاف عمليات البحث المتوازي
+    def close(self):
+        if self.parallel_search is not None:
+            self.parallel_search.close()
+            self.parallel_search = None
+
+    # حساب قيمة تقديرية لحالة اللعبة
+    # الحالة تحتفظ بعدد العلامات في كل خط وتحدّث التقييم مع كل حركة، لذلك لا حاجة لإعادة الحساب
+    def _calculate_heuristic(self, state: GameState) -> float:
+        return state.score
+
+    # تقييم خط معين (صف، عمود، أو قطر) بقراءة واحدة من جدول الأنماط
+    def _evaluate_line(self, line: List[Player]) -> float:
+        return pattern_scores(len(line), len(line), self.weights)[encode_line(line)]
+
+    # خوارزمية البحث A* للعثور على أفضل حركة
+    # budget: عند انتهائه يتوقف البحث ويُرجع أفضل حركة تقديرية، وعند إلغائه يُرجع None
+    # ذاكرة القائمة المفتوحة محدودة بـ memory_limit: عند تجاوزها تُحذف العقد الأسوأ أولوية
+    def _a_star_search(self, initial_state: GameState,
+                       budget: Optional[SearchBudget] = None,
+                       stats: Optional[SearchStats] = None) -> Optional[Move]:
+        size = initial_state.size
+        # الحالات المغلقة تُسجَّل في جدول التحويلات (محدود الحجم) بدلاً من مجموعة غير محدودة
+        table = self.transposition_table
+        table.new_search()
+        max_open = max(2, self.memory_limit // node_bytes(size))
+        # حالة واحدة تُنقل بين العقد بدلاً من تخزين حالة كاملة في كل عقدة
+        path = initial_state.copy()
+
+        # إضافة العقدة الأولية إلى قائمة الحالات المفتوحة
+        h_cost = self._calculate_heuristic(initial_state)
+        open_set: List[OpenNode] = [OpenNode((h_cost, 0, initial_state.key,
+                                              pack_bits(size, initial_state.x_bits,
+                                                        initial_state.o_bits),
+                                              -1, False))]
+
+        if budget is not None:
+            budget.start()
+        while open_set:
+            if budget is not None and budget.expired(self.nodes):
+                if budget.cancelled:
+                    return None
+                break
+            if stats is not None and len(open_set) > stats.peak_frontier:
+                stats.peak_frontier = len(open_set)
+                stats.peak_bytes = stats.peak_frontier * node_bytes(size)
+            current = heapq.heappop(open_set)
+            self.nodes += 1
+
+            # تخطي إذا تم استكشاف هذه الحالة مسبقاً في هذا البحث
+            if self._is_closed(current[KEY]):
+                continue
+            root_move = current[ROOT_MOVE]
+            table.store(current[KEY], current[F_COST] - current[G_COST], current[G_COST], CLOSED,
+                        None if root_move < 0 else initial_state.to_canonical(root_move))
+            if stats is not None:
+                stats.closed += 1
+
+            # التحقق مما إذا كانت هذه حالة فوز: الحركة المطلوبة هي حركة الجذر في المسار
+            if current[O_WINS]:
+                return Move(root_move // size, root_move % size)
+
+            # توليد الخلفاء بتنفيذ كل حركة على نفس الحالة ثم التراجع عنها
+            # عند الجذر يتم حذف الحركات المتماثلة
+            g_cost = current[G_COST] + 1
+            if root_move < 0:
+                state = initial_state
+                moves = state.candidate_moves(unique=True)
+            else:
+                state = path
+                self._move_path(state, current[PACKED])
+                moves = state.candidate_moves()
+            for index in moves:
+                state.make(index)
+                key = state.key
+                if not self._is_closed(key):
+                    heapq.heappush(open_set, OpenNode((
+                        g_cost + self._calculate_heuristic(state), g_cost, key,
+                        pack_bits(size, state.x_bits, state.o_bits),
+                        index if root_move < 0 else root_move, state.check_winner(Player.O))))
+                state.unmake()
+
+            if len(open_set) > max_open:
+                # الإبقاء على أفضل نصف العقد فقط حتى لا تتجاوز الذاكرة الحد
+                open_set = heapq.nsmallest(max_open // 2, open_set)
+                if stats is not None:
+                    stats.pruned += max_open - len(open_set)
+
+        return self._best_heuristic_move(initial_state)
+
+    # نقل حالة المسار إلى العقدة المضغوطة: التراجع حتى أقرب حالة مشتركة ثم تنفيذ الخلايا الناقصة
+    # العقدة التالية غالباً ابن للعقدة السابقة، لذلك يكفي عادة تنفيذ حركة واحدة
+    # (التجزئات والتقييم تُحدَّث تدريجياً، وهذا أسرع من بناء الحالة من الصفر)
+    def _move_path(self, state: GameState, packed: int):
+        x_bits, o_bits = unpack_bits(state.size, packed)
+        while state.x_bits & ~x_bits or state.o_bits & ~o_bits:
+            state.unmake()
+        # الخلايا المضافة لصاحب الدور ثم لخصمه بالتناوب
+        mover = x_bits & ~state.x_bits
+        other = o_bits & ~state.o_bits
+        if state.player == Player.O:
+            mover, other = other, mover
+        while mover:
+            low = mover & -mover
+            state.make(low.bit_length() - 1)
+            mover, other = other, mover ^ low
+
+    # خوارزمية IDA*: نفس ترتيب A* (f = g + h) لكن بحث بالعمق أولاً بحد يزداد في كل دورة
+    # الذاكرة تقتصر على المسار الحالي، لذلك لا تحتاج قائمة مفتوحة أو جدول مغلق
+    def _ida_star_search(self, initial_state: GameState,
+                         budget: Optional[SearchBudget] = None,
+                         stats: Optional[SearchStats] = None) -> Optional[Move]:
+        if budget is None:
+            budget = SearchBudget()
+        budget.start()
+        state = initial_state
+        base = len(state.history)
+        root_moves = state.candidate_moves(unique=True)
+        bound = self._calculate_heuristic(state)
+        step = 1.0
+        self._ida_depth = 0
+        self._ida_next_check = budget.next_check(self.nodes)
+        try:
+            while bound != float('inf'):
+                next_bound = float('inf')
+                for index in root_moves:
+                    state.make(index)
+                    result = self._ida_visit(state, 1, bound, budget)
+                    state.unmake()
+                    if result == FOUND:
+                        return Move(index // state.size, index % state.size)
+                    next_bound = min(next_bound, result)
+                # رفع الحد بخطوة تتضاعف في كل دورة حتى لا تتكرر الدورات لفروق صغيرة في التقييم
+                bound = max(next_bound, bound + step)
+                step *= 2
+        except SearchTimeout:
+            # إرجاع الحالة إلى الجذر بعد الخروج المفاجئ من العمق
+            while len(state.history) > base:
+                state.unmake()
+            if budget.cancelled:
+                return None
+        finally:
+            if stats is not None:
+                stats.peak_frontier = self._ida_depth
+                stats.peak_bytes = self._ida_depth * node_bytes(state.size)
+        return self._best_heuristic_move(initial_state)
+
+    # زيارة عقدة في IDA*: تُرجع FOUND عند إيجاد فوز لـ O، وإلا أصغر قيمة f تجاوزت الحد
+    def _ida_visit(self, state: GameState, g_cost: int, bound: float, budget: SearchBudget) -> float:
+        f_cost = g_cost + self._calculate_heuristic(state)
+        if f_cost > bound:
+            return f_cost
+        self.nodes += 1
+        if self.nodes >= self._ida_next_check:
+            self._ida_next_check = budget.next_check(self.nodes)
+            if budget.expired(self.nodes):
+                raise SearchTimeout()
+        if g_cost > self._ida_depth:
+            self._ida_depth = g_cost
+        if state.check_winner(Player.O):
+            return FOUND
+        if state.check_winner(Player.X):
+            return float('inf')
+        minimum = float('inf')
+        for index in state.candidate_moves():
+            state.make(index)
+            result = self._ida_visit(state, g_cost + 1, bound, budget)
+            state.unmake()
+            if result == FOUND:
+                return FOUND
+            minimum = min(minimum, result)
+        return minimum
+
+    # إذا لم يتم العثور على مسار فوز، إرجاع الحركة ذات القيمة التقديرية الأفضل
+    def _best_heuristic_move(self, initial_state: GameState) -> Optional[Move]:
+        best_move = None
+        best_value = float('-inf')
+        for next_state, move in initial_state.get_successors(unique=True):
+            value = self._calculate_heuristic(next_state)
+            if value > best_value:
+                best_value = value
+                best_move = move
+        return best_move
+
+    # التحقق مما إذا كانت الحالة قد أُغلقت في البحث الحالي
+    def _is_closed(self, key: int) -> bool:
+        entry = self.transposition_table.probe(key)
+        return entry is not None and entry.generation == self.transposition_table.generation
@@ -0,0 +1,208 @@
+# محرك بحث Negamax مع تقليم ألفا-بيتا والتعميق التكراري
+# ترتيب الحركات: حركة جدول التحويلات أولاً ثم حسب جدول التاريخ (history heuristic)
+# البحث يتوقف عند انتهاء الميزانية ويُرجع أفضل حركة وجدها حتى تلك اللحظة
+from typing import Callable, Iterable, List, Optional, Tuple
+from player import Player
+from move import Move
+from game_state import GameState
+from bitboard import full_mask
+import batch_eval
+from search_budget import CHECK_INTERVAL, SearchBudget, SearchTimeout
+from transposition import CLOSED, EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+# قيمة الفوز المؤكد (تُنقص بعدد الحركات حتى يُفضَّل الفوز الأسرع)
+# يجب أن تكون أكبر بكثير من أي تقييم تقديري للوحة
+MATE = 1e15
+# أصغر حجم لوحة يُستخدم عنده التقييم الجماعي لأبناء العقد الأخيرة (أسرع من 5×5 فما فوق)
+BATCH_MIN_SIZE = 5
+
+
+class AlphaBetaSearch:
+    # table: جدول التحويلات المشترك
+    # evaluate: دالة تقييم من وجهة نظر O (نفس إشارة _calculate_heuristic)
+    def __init__(self, table: TranspositionTable, evaluate: Callable[[GameState], float]):
+        self.table = table
+        self.evaluate = evaluate
+        self.nodes = 0
+        self.completed_depth = 0
+        self.value = 0.0  # قيمة الجذر لصاحب الدور عند آخر عمق مكتمل
+        self._history = {Player.X: {}, Player.O: {}}
+        self._budget: Optional[SearchBudget] = None
+        self._next_check = CHECK_INTERVAL  # عدد العقد عند الفحص التالي للميزانية
+        # تقييم أبناء العقد على عمق 1 دفعة واحدة عبر NumPy إذا كانت متاحة
+        self.use_batch = batch_eval.available()
+
+    # البحث عن أفضل حركة ضمن الميزانية المحددة
+    # البحث يعمل على نفس كائن الحالة باستخدام make/unmake، وتعود الحالة كما كانت عند الانتهاء
+    # start_depth: أول عمق في التعميق التكراري (تستخدمه عمليات البحث المتوازي لتنويع العمل)
+    # root_moves: حصر حركات الجذر (مثلاً في الحركات التي تمنع فوزاً إجبارياً للخصم)
+    def search(self, state: GameState, budget: SearchBudget, start_depth: int = 1,
+               root_moves: Optional[List[int]] = None) -> Optional[Move]:
+        self.table.new_search()
+        self.nodes = 0
+        self.completed_depth = 0
+        self._budget = budget
+        self._next_check = budget.next_check(0)
+        budget.start()
+
+        if root_moves is None:
+            root_moves = state.candidate_moves(unique=True, forced_only=True)
+        if not root_moves:
+            return None
+        # الحركة الاحتياطية إذا انتهى الوقت قبل إكمال أول عمق
+        best_index = root_moves[0]
+
+        empty_count = len(list(state.legal_moves()))
+        max_depth = empty_count if budget.max_depth is None else min(budget.max_depth, empty_count)
+        self.value = 0.0
+        for depth in range(min(start_depth, max_depth), max_depth + 1):
+            value, index, finished = self._search_root(state, root_moves, depth)
+            if index is not None:
+                best_index = index
+            if not finished:
+                break
+            self.completed_depth = depth
+            self.value = value
+            # التوقف إذا ثبت الفوز أو الخسارة
+            if abs(value) >= MATE - state.size * state.size:
+                break
+        return Move(best_index // state.size, best_index % state.size)
+
+    # البحث من الجذر لعمق محدد
+    # تُرجع (القيمة، أفضل خلية، هل اكتمل العمق)
+    def _search_root(self, state: GameState, root_moves: List[int],
+                     depth: int) -> Tuple[float, Optional[int], bool]:
+        alpha, beta = -MATE - 1, MATE + 1
+        best_index = None
+        base = len(state.history)
+        for index in self._order(state, root_moves):
+            state.make(index)
+            try:
+                value = -self._negamax(state, depth - 1, -beta, -alpha, 1)
+            except SearchTimeout:
+                # إرجاع الحالة إلى الجذر بعد الخروج المفاجئ من العمق
+                while len(state.history) > base:
+                    state.unmake()
+                return alpha, best_index, False
+            state.unmake()
+            if value > alpha:
+                alpha = value
+                best_index = index
+        self.table.store(state.key, alpha, depth, EXACT, state.to_canonical(best_index))
+        return alpha, best_index, True
+
+    # خوارزمية Negamax: القيمة دائماً من وجهة نظر صاحب الدور
+    def _negamax(self, state: GameState, depth: int, alpha: float, beta: float, ply: int) -> float:
+        self.nodes += 1
+        # المقارنة بحد بدلاً من باقي القسمة لأن التقييم الجماعي يزيد العداد بعدد الأبناء دفعة واحدة
+        if self.nodes >= self._next_check:
+            self._next_check = self._budget.next_check(self.nodes)
+            if self._budget.expired(self.nodes):
+                raise SearchTimeout()
+
+        # اللاعب السابق فاز بالحركة الأخيرة
+        opponent = Player.X if state.player == Player.O else Player.O
+        if state.check_winner(opponent):
+            return -(MATE - ply)
+        if (state.x_bits | state.o_bits) == full_mask(state.size):
+            return 0.0
+        if depth <= 0:
+            value = self.evaluate(state)
+            return value if state.player == Player.O else -value
+
+        original_alpha = alpha
+        entry = self.table.probe(state.key)
+        if entry is not None and entry.flag == CLOSED:
+            entry = None  # علامات A* لا تحمل قيمة قابلة للاستخدام
+        if entry is not None and entry.depth >= depth:
+            value = _from_table(entry.value, ply)
+            if entry.flag == EXACT:
+                return value
+            if entry.flag == LOWER_BOUND:
+                alpha = max(alpha, value)
+            elif entry.flag == UPPER_BOUND:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        best_value = -MATE - 1
+        best_index = None
+        if depth == 1 and self.use_batch and state.size >= BATCH_MIN_SIZE:
+            best_value, best_index = self._score_frontier(state, ply)
+            moves = ()
+        else:
+            moves = self._order(state, state.candidate_moves(forced_only=True), entry)
+        for index in moves:
+            state.make(index)
+            value = -self._negamax(state, depth - 1, -beta, -alpha, ply + 1)
+            state.unmake()
+            if value > best_value:
+                best_value = value
+                best_index = index
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                # تحديث جدول التاريخ للحركة التي سببت القطع
+                history = self._history[state.player]
+                history[index] = history.get(index, 0) + depth * depth
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table.store(state.key, _to_table(best_value, ply), depth, flag,
+                         state.to_canonical(best_index))
+        return best_value
+
+    # تقييم جميع أبناء عقدة على عمق 1 في استدعاء واحد
+    # تُرجع (أفضل قيمة لصاحب الدور، رقم خليتها)
+    def _score_frontier(self, state: GameState, ply: int) -> Tuple[float, int]:
+        indices, terminal, winners, scores = batch_eval.score_children(
+            state, state.candidate_moves(forced_only=True))
+        self.nodes += len(indices)
+        mover = batch_eval.X if state.player == Player.X else batch_eval.O
+        sign = 1.0 if state.player == Player.O else -1.0
+        values = batch_eval.np.where(winners == mover, MATE - (ply + 1),
+                                     batch_eval.np.where(terminal, 0.0, sign * scores))
+        best = int(values.argmax())
+        return float(values[best]), indices[best]
+
+    # ترتيب الحركات: حركة الجدول أولاً ثم حسب نقاط التاريخ
+    def _order(self, state: GameState, moves: Iterable[int], entry=None) -> List[int]:
+        if entry is None:
+            entry = self.table.probe(state.key)
+        table_move = None
+        if entry is not None and entry.flag != CLOSED and entry.move is not None:
+            table_move = state.from_canonical(entry.move)
+        history = self._history[state.player]
+
+        def priority(index: int) -> float:
+            if index == table_move:
+                return float('inf')
+            return history.get(index, 0)
+
+        return sorted(moves, key=priority, reverse=True)
+
+    # مسح جدول التاريخ (مثلاً عند بدء لعبة جديدة)
+    def reset(self):
+        self._history = {Player.X: {}, Player.O: {}}
+
+
+# قيم الفوز المؤكد تُخزَّن نسبةً إلى العقدة الحالية حتى تبقى صحيحة من أي مسار
+def _to_table(value: float, ply: int) -> float:
+    if value >= MATE - 1000:
+        return value + ply
+    if value <= -(MATE - 1000):
+        return value - ply
+    return value
+
+
+def _from_table(value: float, ply: int) -> float:
+    if value >= MATE - 1000:
+        return value - ply
+    if value <= -(MATE - 1000):
+        return value + ply
+    return value
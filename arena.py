@@ -0,0 +1,186 @@
+# ساحة مباريات بين محركين دون واجهة رسومية
+# تُلعب المباريات على عدة عمليات، وكل زوج من المباريات يبدأ بنفس الافتتاحية العشوائية
+# مع تبديل الألوان حتى لا يستفيد أحد المحركين من البدء أولاً
+# الاستخدام: python arena.py --games 200 --size 4 --engine-a alphabeta --engine-b astar
+import argparse
+import json
+import multiprocessing as mp
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+from player import Player
+from game_state import GameState
+from ai_player import AIPlayer
+from perfect_play import perfect_play_table
+from search_budget import SearchBudget
+from difficulty import Difficulty
+from game_record import MAX_CELLS, GameRecord, GameRecordWriter
+
+# محركات الساحة (البحث المتوازي غير متاح لأن عمليات الساحة لا تستطيع إنشاء عمليات فرعية)
+ARENA_ENGINES = ('alphabeta', 'mcts', 'astar', 'idastar')
+PERCENTILES = (50, 90, 99)
+
+# إعدادات المباريات ولاعبا العملية الحالية (تُهيأ مرة واحدة لكل عملية)
+_config: Dict = {}
+_players: Dict[str, AIPlayer] = {}
+
+
+def _init_worker(config: Dict):
+    _config.update(config)
+    for side in ('a', 'b'):
+        _players[side] = AIPlayer(Difficulty[config[f'difficulty_{side}']], config[f'engine_{side}'])
+    # جدول اللعب المثالي يُحمَّل من الملف المحفوظ (أو يُحل) قبل أول مباراة
+    table = perfect_play_table(config['size']) if config['win_length'] in (None, config['size']) else None
+    if table is not None and any(player.difficulty.value['perfect_tables'] for player in _players.values()):
+        table.wait()
+
+
+# ميزانية البحث: ميزانية مستوى الصعوبة مع ما تم تجاوزه من سطر الأوامر
+def _budget(side: str) -> SearchBudget:
+    budget = SearchBudget.from_difficulty(_players[side].difficulty)
+    for name in ('time_limit', 'node_limit', 'max_depth'):
+        if _config[name] is not None:
+            setattr(budget, name, _config[name])
+    return budget
+
+
+# مباراة واحدة: المباريات الزوجية يلعب فيها المحرك A بـ X، والفردية يلعب فيها بـ O
+def play_game(game: int) -> Dict:
+    size = _config['size']
+    sides = {Player.X: 'a', Player.O: 'b'} if game % 2 == 0 else {Player.X: 'b', Player.O: 'a'}
+    state = GameState.from_bits(size, 0, 0, Player.X, win_length=_config['win_length'],
+                                neighborhood=_config['neighborhood'])
+    # الافتتاحية العشوائية مشتركة بين المباراتين في كل زوج
+    rng = random.Random(_config['seed'] * 1000003 + game // 2)
+    moves = []  # جميع حركات المباراة بما فيها الافتتاحية (لسجل المباريات)
+    for _ in range(_config['random_plies']):
+        if state.is_terminal():
+            break
+        moves.append(rng.choice(list(state.legal_moves())))
+        state.make(moves[-1])
+    state.history.clear()
+
+    latencies: Dict[str, List[float]] = {'a': [], 'b': []}
+    nodes = {'a': 0, 'b': 0}
+    while not state.is_terminal():
+        side = sides[state.player]
+        player = _players[side]
+        start = time.perf_counter()
+        move = player.get_move(state, _budget(side))
+        latencies[side].append(time.perf_counter() - start)
+        nodes[side] += player.nodes
+        moves.append(move.row * size + move.col)
+        state.make(moves[-1])
+
+    winner = None
+    for mark in (Player.X, Player.O):
+        if state.check_winner(mark):
+            winner = mark
+    # السجل يُبنى فقط عند طلبه: اللوحات الأكبر من MAX_CELLS لا تتسع حركاتها في بايت واحد
+    record = GameRecord(size, state.win_length, _config[f'engine_{sides[Player.X]}'],
+                        _config[f'engine_{sides[Player.O]}'], winner,
+                        bytes(moves)) if _config.get('record') else None
+    return {'game': game, 'winner': None if winner is None else sides[winner], 'record': record,
+            'latencies': latencies, 'nodes': nodes}
+
+
+# النسبة المئوية بطريقة الرتبة الأقرب
+def percentile(values: Sequence[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+# تشغيل جميع المباريات وتجميع الإحصاءات
+def run_arena(config: Dict, games: int, workers: Optional[int] = None) -> Dict:
+    start = time.perf_counter()
+    writer = GameRecordWriter(config['record']) if config.get('record') else None
+    results = []
+    with mp.Pool(workers, initializer=_init_worker, initargs=(config,)) as pool:
+        # السجلات تُكتب من العملية الرئيسية فقط، فلا تتداخل كتابة العمليات في الملف
+        for result in pool.imap_unordered(play_game, range(games)):
+            record = result.pop('record')
+            if writer is not None:
+                writer.write(record)
+            results.append(result)
+    if writer is not None:
+        writer.close()
+    wall = time.perf_counter() - start
+
+    report = {'config': config, 'games': games, 'seconds': wall, 'games_per_second': games / wall}
+    wins = {side: sum(1 for result in results if result['winner'] == side) for side in ('a', 'b')}
+    for side, other in (('a', 'b'), ('b', 'a')):
+        latencies = [value for result in results for value in result['latencies'][side]]
+        nodes = sum(result['nodes'][side] for result in results)
+        thinking = sum(latencies)
+        report[side] = {
+            'engine': config[f'engine_{side}'],
+            'difficulty': config[f'difficulty_{side}'],
+            'wins': wins[side] / games,
+            'draws': (games - wins[side] - wins[other]) / games,
+            'losses': wins[other] / games,
+            'moves': len(latencies),
+            'nodes': nodes,
+            'nodes_per_second': nodes / thinking if thinking else 0.0,
+            'latency': {f'p{percent}': percentile(latencies, percent) for percent in PERCENTILES},
+        }
+        report[side]['latency']['max'] = max(latencies, default=0.0)
+    return report
+
+
+def _print_report(report: Dict):
+    print(f"{report['games']} games in {report['seconds']:.2f}s "
+          f"({report['games_per_second']:.2f} games/s)")
+    for side in ('a', 'b'):
+        stats = report[side]
+        latency = ', '.join(f'{name} {value * 1000:.1f}ms' for name, value in stats['latency'].items())
+        print(f"{side.upper()} {stats['engine']}/{stats['difficulty']}: "
+              f"W {stats['wins']:.1%}  D {stats['draws']:.1%}  L {stats['losses']:.1%}  "
+              f"{stats['nodes_per_second']:,.0f} nodes/s  latency {latency}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play engine-vs-engine games without the GUI.")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int, help="marks in a row needed to win (default: board size)")
+    parser.add_argument('--neighborhood', type=int,
+                        help="only search empty cells within this distance of a mark (default: all cells)")
+    parser.add_argument('--engine-a', choices=ARENA_ENGINES, default='alphabeta')
+    parser.add_argument('--engine-b', choices=ARENA_ENGINES, default='astar')
+    levels = [level.name for level in Difficulty]
+    parser.add_argument('--difficulty-a', choices=levels, default=Difficulty.MEDIUM.name)
+    parser.add_argument('--difficulty-b', choices=levels, default=Difficulty.MEDIUM.name)
+    parser.add_argument('--time-limit', type=float, help="override the time limit per move (seconds)")
+    parser.add_argument('--node-limit', type=int, help="override the node limit per move")
+    parser.add_argument('--max-depth', type=int, help="override the search depth")
+    parser.add_argument('--random-plies', type=int, default=2,
+                        help="random opening moves before the engines take over")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help="processes (default: one per core)")
+    parser.add_argument('--json', help="also write the report to this file")
+    parser.add_argument('--record', help="append every game to this binary game record file")
+    args = parser.parse_args(argv)
+    # التحقق قبل تشغيل العمليات: السجل يخزن كل حركة في بايت واحد
+    if args.record and args.size * args.size > MAX_CELLS:
+        parser.error(f"--record supports boards up to {MAX_CELLS} cells, "
+                     f"{args.size}x{args.size} has {args.size * args.size}")
+
+    config = {
+        'size': args.size, 'win_length': args.win_length, 'neighborhood': args.neighborhood,
+        'engine_a': args.engine_a, 'engine_b': args.engine_b,
+        'difficulty_a': args.difficulty_a, 'difficulty_b': args.difficulty_b,
+        'time_limit': args.time_limit, 'node_limit': args.node_limit, 'max_depth': args.max_depth,
+        'random_plies': args.random_plies, 'seed': args.seed, 'record': args.record,
+    }
+    report = run_arena(config, args.games, args.workers)
+    _print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
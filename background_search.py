@@ -0,0 +1,63 @@
+# تشغيل بحث الكمبيوتر في خيط خلفي حتى لا تتجمد الواجهة الرسومية
+# الخيط لا يلمس عناصر Tkinter أبداً: الواجهة تستطلع حالة المهمة دورياً عبر window.after
+# وتقرأ النتيجة عند اكتمالها، والإلغاء يتم عبر ميزانية البحث
+import threading
+import time
+from typing import Any, Callable, Optional
+from search_budget import SearchBudget
+
+# أطول انتظار لتوقف بحث ملغى في خيط الواجهة (بالثواني)، بعده يُترك البحث ليتوقف وحده
+CANCEL_TIMEOUT = 0.2
+
+
+class SearchTask:
+    # target: دالة تستقبل الميزانية وتُرجع النتيجة (تُنفَّذ في الخيط الخلفي)
+    def __init__(self, target: Callable[[SearchBudget], Any], budget: SearchBudget):
+        self.budget = budget
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.started = time.perf_counter()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+
+    def _run(self, target: Callable[[SearchBudget], Any]):
+        try:
+            self.result = target(self.budget)
+        except Exception as error:  # يُعاد رفعه في خيط الواجهة عند قراءة النتيجة
+            self.error = error
+        finally:
+            self._done.set()
+
+    # هل انتهت المهمة؟
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    # الوقت المنقضي منذ بدء المهمة بالثواني
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def cancelled(self) -> bool:
+        return self.budget.cancelled
+
+    # طلب الإيقاف: المحركات تلاحظه عند الفحص الدوري للميزانية
+    def cancel(self):
+        self.budget.cancel()
+
+    # انتظار انتهاء الخيط (تُستخدم قبل بدء بحث جديد يستخدم نفس المحرك)
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    # الإلغاء ثم انتظار التوقف لمدة محدودة (تُرجع False إذا بقي الخيط يعمل بعدها)
+    def stop(self, timeout: float = CANCEL_TIMEOUT) -> bool:
+        self.cancel()
+        return self.wait(timeout)
+
+    # نتيجة المهمة بعد اكتمالها
+    def get(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
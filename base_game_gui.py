@@ -5,14 +5,21 @@ from player import Player
 from board import Board
 from move import Move
 from theme import Theme
-from typing import Dict 
+from rules import Rules
+from board_canvas import BoardCanvas
+from game_record import HUMAN, GameRecord, append_game
+from typing import Dict, Optional, Tuple
+
+# أصغر حجم لوحة تُرسم عنده على Canvas واحد بدلاً من زر لكل خلية
+CANVAS_MIN_SIZE = 7
 
 class BaseGameGUI:
-    def __init__(self, window: tk.Tk, theme: Theme):
+    def __init__(self, window: tk.Tk, theme: Theme, rules: Rules = Rules.CLASSIC):
         # تهيئة النافذة الرئيسية للعبة
         self.window = window  # تخزين النافذة الرئيسية
         self.current_theme = theme  # تخزين النمط الحالي (الألوان)
-        self.board = Board()  # إنشاء لوحة اللعب
+        self.rules = rules  # حجم اللوحة وطول الفوز
+        self.board = Board(rules.value['size'], rules.value['win_length'])  # إنشاء لوحة اللعب
         self.current_player = Player.X  # تعيين اللاعب الأول (X)
         self.scores = {Player.X: 0, Player.O: 0}  # تهيئة نقاط اللاعبين
         self.on_back_to_menu = None  # متغير للرجوع للقائمة الرئيسية
@@ -25,6 +32,7 @@ class BaseGameGUI:
         self._create_game_board()  # إنشاء لوحة اللعب
         self._create_controls()  # إنشاء أزرار التحكم
         self._create_turn_indicator()  # إنشاء مؤشر دور اللاعب
+        self._create_debug_overlay()  # لوحة معلومات التصحيح (F3)
         self.apply_theme()  # تطبيق النمط المختار
 
     def _create_container(self) -> tk.Frame:
@@ -63,7 +71,14 @@ class BaseGameGUI:
             borderwidth=2
         )  # Create a frame for the game board with a ridge border
         self.game_frame.pack(pady=10)  # Pack the frame with padding
-        self.buttons = self._create_board_buttons()  # Create buttons for the game board
+        # اللوحات الكبيرة تُرسم على Canvas واحد، لأن إنشاء زر لكل خلية وإعادة تهيئته بطيء
+        self.board_canvas = None
+        self.buttons = None
+        if self.board.size >= CANVAS_MIN_SIZE:
+            self.board_canvas = BoardCanvas(self.game_frame, self.board.size, self._handle_move)
+            self.board_canvas.pack()
+        else:
+            self.buttons = self._create_board_buttons()  # Create buttons for the game board
 
     def _create_board_buttons(self):
         buttons = [[None for _ in range(self.board.size)]
@@ -77,16 +92,19 @@ class BaseGameGUI:
 
     def _create_cell_button(self, row: int, col: int) -> tk.Button:
         # إنشاء زر لكل خلية في لوحة اللعب
+        # اللوحات الكبيرة تستخدم خطاً وهوامش أصغر حتى تبقى النافذة بحجم الشاشة
+        large = self.board.size > 4
         button = tk.Button(
             self.game_frame,
             text='',  # نص فارغ في البداية
-            font=('Helvetica', 24, 'bold'),  # نمط الخط
-            width=3,  # العرض
+            font=('Helvetica', 11 if large else 24, 'bold'),  # نمط الخط
+            width=2 if large else 3,  # العرض
             height=1,  # الارتفاع
             relief=tk.FLAT,  # نمط الحواف
             command=lambda: self._handle_move(row, col)  # الدالة التي تنفذ عند الضغط
         )
-        button.grid(row=row, column=col, padx=3, pady=3, sticky='nsew')
+        padding = 1 if large else 3
+        button.grid(row=row, column=col, padx=padding, pady=padding, sticky='nsew')
         # ربط أحداث حركة الماوس
         button.bind('<Enter>', self._on_enter)  # عند دخول المؤشر
         button.bind('<Leave>', self._on_leave)  # عند خروج المؤشر
@@ -98,6 +116,7 @@ class BaseGameGUI:
         self._create_back_button()  # Create the back button
         self._create_theme_button()  # Create the theme toggle button
         self._create_reset_button()  # Create the reset button
+        self._create_undo_redo_buttons()  # Create the undo/redo buttons
 
     def _create_back_button(self):
         self.back_button = tk.Button(
@@ -114,6 +133,7 @@ class BaseGameGUI:
         self.on_back_to_menu = callback
     def _back_to_menu(self):
         if messagebox.askyesno("Confirm", "Return to main menu? Current game progress will be lost."):
+            self.close()
             self.main_container.destroy()
             if self.on_back_to_menu:
                 self.on_back_to_menu()
@@ -142,6 +162,29 @@ class BaseGameGUI:
         )  # Create a button to reset the game
         self.reset_button.pack(side=tk.LEFT, padx=5)  # Pack the button to the left with padding
 
+    def _create_undo_redo_buttons(self):
+        self.undo_button = tk.Button(
+            self.control_frame,
+            text="↶ Undo",
+            command=self.undo_move,
+            relief=tk.FLAT,
+            font=('Helvetica', 10),
+            padx=15,
+            pady=5
+        )  # Create a button to take back the last move
+        self.undo_button.pack(side=tk.LEFT, padx=5)
+
+        self.redo_button = tk.Button(
+            self.control_frame,
+            text="↷ Redo",
+            command=self.redo_move,
+            relief=tk.FLAT,
+            font=('Helvetica', 10),
+            padx=15,
+            pady=5
+        )  # Create a button to replay a move that was taken back
+        self.redo_button.pack(side=tk.LEFT, padx=5)
+
     def _create_turn_indicator(self):
         self.turn_indicator = tk.Label(
             self.main_container,
@@ -151,6 +194,33 @@ class BaseGameGUI:
         )  # Create a label to indicate the current turn
         self.turn_indicator.pack()  # Pack the turn indicator
 
+    def _create_debug_overlay(self):
+        # لوحة معلومات البحث، مخفية حتى يضغط المستخدم F3
+        self.debug_visible = False
+        self.debug_label = tk.Label(
+            self.main_container,
+            text='',
+            font=('Courier', 9),
+            justify=tk.LEFT,
+            anchor='w'
+        )
+        self.window.bind('<F3>', self._toggle_debug_overlay)
+
+    def _toggle_debug_overlay(self, event=None):
+        self.debug_visible = not self.debug_visible
+        if self.debug_visible:
+            self.debug_label.pack(fill='x')
+        else:
+            self.debug_label.pack_forget()
+        self._on_debug_toggled(self.debug_visible)
+
+    def _on_debug_toggled(self, visible: bool):
+        # تعيد تعريفها الفئات الوراثية لتفعيل جمع المعلومات أو إيقافه
+        pass
+
+    def show_debug(self, text: str):
+        self.debug_label.configure(text=text)
+
     def _get_theme_button_text(self) -> str:
         return "🌙 Dark Mode" if self.current_theme == Theme.LIGHT else "☀️ Light Mode"  # Return the appropriate text for the theme button
 
@@ -185,10 +255,18 @@ class BaseGameGUI:
                                 'activebackground': colors['button_active']},
             self.back_button: {'bg': colors['toggle_bg'], 'fg': colors['toggle_fg'],
                                'activebackground': colors['button_active']},
-            self.turn_indicator: {'bg': colors['background'], 'fg': colors['button_fg']}
+            self.undo_button: {'bg': colors['toggle_bg'], 'fg': colors['toggle_fg'],
+                               'activebackground': colors['button_active']},
+            self.redo_button: {'bg': colors['toggle_bg'], 'fg': colors['toggle_fg'],
+                               'activebackground': colors['button_active']},
+            self.turn_indicator: {'bg': colors['background'], 'fg': colors['button_fg']},
+            self.debug_label: {'bg': colors['background'], 'fg': colors['button_fg']}
         }  # Return a dictionary of theme configurations for each widget
 
     def _update_button_colors(self, colors: Dict):
+        if self.board_canvas is not None:
+            self.board_canvas.apply_theme(colors)  # Only the colors that changed are sent
+            return
         for i in range(self.board.size):
             for j in range(self.board.size):
                 button = self.buttons[i][j]
@@ -210,12 +288,60 @@ class BaseGameGUI:
         if event.widget['text'] == '':
             event.widget.configure(bg=self.current_theme.value['button_bg'])  # Revert the button color on hover leave
 
+    def _set_cell(self, row: int, col: int, player: Player):
+        # تحديث شكل خلية واحدة حسب محتواها
+        if self.board_canvas is not None:
+            self.board_canvas.set_cell(row, col, player)
+            return
+        colors = self.current_theme.value
+        button = self.buttons[row][col]
+        if player == Player.EMPTY:
+            button.configure(text='', fg=colors['button_fg'], bg=colors['button_bg'])
+        else:
+            button.configure(
+                text=player.value,
+                fg=colors['x_color' if player == Player.X else 'o_color']
+            )
+
+    def undo_move(self):
+        # التراجع عن آخر حركة وإعادة الدور للاعب الذي نفذها
+        undone = self.board.undo_move()
+        if undone:
+            move, player = undone
+            self._set_cell(move.row, move.col, Player.EMPTY)
+            self.current_player = player
+            self.turn_indicator.configure(text=self._get_turn_text())
+
+    def redo_move(self):
+        # إعادة آخر حركة تم التراجع عنها وتمرير الدور للاعب الآخر
+        redone = self.board.redo_move()
+        if redone:
+            move, player = redone
+            self._set_cell(move.row, move.col, player)
+            self.current_player = Player.O if player == Player.X else Player.X
+            self.turn_indicator.configure(text=self._get_turn_text())
+
     def update_scores(self, winner: Player):
         self.scores[winner] += 1  # Increment the score for the winner
         self.score_labels[winner].configure(
             text=f"{'Player' if winner == Player.X else 'AI/Player'} {winner.value}: {self.scores[winner]}"
         )  # Update the score label for the winner
 
+    # اسما لاعبي X و O في سجل المباريات (تعيد تعريفها لعبة الكمبيوتر)
+    def _record_players(self) -> Tuple[str, str]:
+        return HUMAN, HUMAN
+
+    # إضافة المباراة المنتهية إلى سجل المباريات (winner: None للتعادل)
+    # الفشل في الكتابة لا يوقف اللعبة
+    def record_game(self, winner: Optional[Player]):
+        x_player, o_player = self._record_players()
+        record = GameRecord(self.board.size, self.board.win_length, x_player, o_player, winner,
+                            bytes(index for index, _ in self.board.history))
+        try:
+            append_game(record)
+        except OSError:
+            pass
+
     def reset_game(self):
         self.scores = {Player.X: 0, Player.O: 0}  # Reset the scores
         for player in [Player.X, Player.O]:
@@ -229,11 +355,18 @@ class BaseGameGUI:
         self.board.clear()  # مسح جميع الحركات
         self.current_player = Player.X  # إعادة تعيين اللاعب الحالي
         self.turn_indicator.configure(text=self._get_turn_text())  # تحديث مؤشر الدور
+        if self.board_canvas is not None:
+            self.board_canvas.clear()  # إعادة رسم الخلايا المشغولة فقط
+            return
         # مسح نصوص الأزرار
         for row in self.buttons:
             for button in row:
                 button.configure(text='', fg=self.current_theme.value['button_fg'])
 
+    def close(self):
+        # تحرير الموارد الخاصة باللعبة عند مغادرتها (تعيد تعريفها الفئات الوراثية عند الحاجة)
+        self.window.unbind('<F3>')
+
     def _handle_move(self, row: int, col: int):
         # دالة تجريدية يتم تنفيذها في الفئات الوراثية
         raise NotImplementedError("Subclasses must implement _handle_move")  # Raise an error if not implemented in subclasses
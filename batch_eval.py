@@ -0,0 +1,105 @@
+# تقييم مجموعات كبيرة من اللوحات دفعة واحدة باستخدام NumPy (اعتماد اختياري)
+# اللوحات مصفوفة (M, N, N) من النوع int8: 0 خلية فارغة، 1 للاعب X، 2 للاعب O
+# النتائج مطابقة لـ is_terminal و check_winner و _calculate_heuristic في الحالة الفردية
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+from bitboard import win_lines
+from evaluation import default_weights
+from game_state import GameState
+from player import Player
+
+try:
+    import numpy as np
+except ImportError:  # NumPy غير مثبت: الدوال ترفع خطأ واضحاً عند استدعائها
+    np = None
+
+EMPTY = 0
+X = 1
+O = 2
+
+
+# هل يمكن استخدام التقييم الجماعي؟
+def available() -> bool:
+    return np is not None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("batch evaluation requires NumPy (pip install numpy)")
+
+
+# أرقام الخلايا لكل خط فوز كمصفوفة (L, K) حيث K طول الفوز
+@lru_cache(maxsize=None)
+def _line_indices(size: int, win_length: Optional[int] = None):
+    return np.array(win_lines(size, win_length), dtype=np.intp)
+
+
+@lru_cache(maxsize=None)
+def _weights_array(weights: Tuple[float, ...]):
+    return np.array(weights, dtype=np.float64)
+
+
+# تحويل قائمة حالات إلى مصفوفة لوحات (M, N, N)
+def encode_states(states: Sequence[GameState]):
+    _require_numpy()
+    size = states[0].size
+    cells = size * size
+    width = (cells + 7) // 8
+    # تحويل كل قناع إلى بايتات ثم فك البتات دفعة واحدة (يعمل لأي حجم لوحة)
+    x_bytes = b''.join(state.x_bits.to_bytes(width, 'little') for state in states)
+    o_bytes = b''.join(state.o_bits.to_bytes(width, 'little') for state in states)
+    x_cells = np.unpackbits(np.frombuffer(x_bytes, dtype=np.uint8).reshape(len(states), width),
+                            axis=1, bitorder='little')[:, :cells]
+    o_cells = np.unpackbits(np.frombuffer(o_bytes, dtype=np.uint8).reshape(len(states), width),
+                            axis=1, bitorder='little')[:, :cells]
+    boards = x_cells.astype(np.int8) + 2 * o_cells.astype(np.int8)
+    return boards.reshape(len(states), size, size)
+
+
+# تقييم مجموعة لوحات دفعة واحدة
+# تُرجع (terminal, winners, scores):
+#   terminal: مصفوفة منطقية (M,) - انتهت اللعبة بفوز أو امتلاء
+#   winners: مصفوفة int8 (M,) - 0 لا فائز، 1 فاز X، 2 فاز O
+#   scores: مصفوفة float64 (M,) - التقييم من وجهة نظر O
+# win_length: طول الفوز (None لخط بطول اللوحة كاملة)
+def evaluate_batch(boards, weights: Optional[Tuple[float, ...]] = None,
+                   win_length: Optional[int] = None):
+    _require_numpy()
+    boards = np.asarray(boards, dtype=np.int8)
+    count, size = boards.shape[0], boards.shape[1]
+    length = size if win_length is None else win_length
+    flat = boards.reshape(count, size * size)
+    lines = flat[:, _line_indices(size, length)]  # (M, L, K)
+
+    x_counts = (lines == X).sum(axis=2)
+    o_counts = (lines == O).sum(axis=2)
+    x_wins = (x_counts == length).any(axis=1)
+    o_wins = (o_counts == length).any(axis=1)
+    full = (flat != EMPTY).all(axis=1)
+
+    # نفس قاعدة جدول الأنماط: الخط المختلط لا قيمة له، وإلا فالوزن حسب عدد العلامات
+    table = _weights_array(weights if weights is not None else default_weights(length))
+    top = len(table) - 1
+    x_values = table[np.minimum(x_counts, top)]
+    o_values = table[np.minimum(o_counts, top)]
+    mixed = (x_counts > 0) & (o_counts > 0)
+    scores = np.where(mixed, 0.0, o_values - x_values).sum(axis=1)
+
+    winners = np.where(o_wins, O, np.where(x_wins, X, 0)).astype(np.int8)
+    return x_wins | o_wins | full, winners, scores
+
+
+# توليد جميع أبناء حالة وتقييمها في استدعاء واحد
+# تُرجع (أرقام الخلايا، terminal، winners، scores) بنفس ترتيب legal_moves()
+def score_children(state: GameState, moves: Optional[Iterable[int]] = None,
+                   weights: Optional[Tuple[float, ...]] = None):
+    _require_numpy()
+    indices: List[int] = list(state.legal_moves() if moves is None else moves)
+    base = encode_states([state]).reshape(-1)
+    children = np.repeat(base[None, :], len(indices), axis=0)
+    children[np.arange(len(indices)), indices] = X if state.player == Player.X else O
+    size = state.size
+    terminal, winners, scores = evaluate_batch(children.reshape(len(indices), size, size),
+                                               weights if weights is not None else state.weights,
+                                               state.win_length)
+    return indices, terminal, winners, scores
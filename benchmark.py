@@ -0,0 +1,317 @@
+# قياس أداء المسارات الحرجة على مجموعة ثابتة من الأوضاع (أحجام 3 إلى 7)
+# النتائج تُحفظ كملف JSON مرجعي، ووضع المقارنة يُبلغ عن أي تباطؤ يتجاوز الحد المسموح
+# كما تُقارن حركات كل محرك مع حل كامل بالقوة الغاشمة (oracle) حتى لا يغير أي تسريع طريقة اللعب
+# الاستخدام:
+#   python benchmark.py --save baseline.json
+#   python benchmark.py --compare baseline.json --threshold 0.10
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from player import Player
+from board import Board
+from game_state import GameState
+from ai_player import AIPlayer
+from search_budget import SearchBudget
+from difficulty import Difficulty
+import batch_eval
+
+SIZES = (3, 4, 5, 6, 7)
+CORPUS_SEED = 20240101
+POSITIONS_PER_SIZE = 12
+# أوضاع يحلها الـ oracle بالكامل: عدد الخلايا الفارغة فيها
+ORACLE_EMPTIES = (4, 6, 8)
+ORACLE_POSITIONS_PER_SIZE = 6
+ENGINES = ('alphabeta', 'mcts', 'astar', 'idastar')
+# ميزانية ثابتة بعدد العقد (دون حد زمني) وبذرة ثابتة لـ MCTS حتى تكون الحركات متطابقة على أي جهاز
+ENGINE_BUDGET = {'node_limit': 2000, 'max_depth': 4}
+ENGINE_SEED = 20240102
+
+
+# وضع عشوائي غير منتهٍ بعدد محدد من الخلايا المشغولة (دور صاحب الحركة حسب عدد العلامات)
+def _random_position(rng: random.Random, size: int, filled: int) -> Optional[GameState]:
+    state = GameState.from_bits(size, 0, 0, Player.X)
+    for _ in range(filled):
+        state.make(rng.choice(list(state.legal_moves())))
+        if state.is_terminal():
+            return None
+    state.history.clear()
+    return state
+
+
+# مجموعة الأوضاع الثابتة لكل حجم: أوضاع بنسب امتلاء مختلفة، وأوضاع قريبة من النهاية للـ oracle
+def build_corpus(size: int) -> Tuple[List[GameState], List[GameState]]:
+    rng = random.Random(CORPUS_SEED + size)
+    cells = size * size
+    positions: List[GameState] = []
+    while len(positions) < POSITIONS_PER_SIZE:
+        filled = int(cells * (0.1 + 0.7 * len(positions) / POSITIONS_PER_SIZE))
+        state = _random_position(rng, size, filled)
+        if state is not None:
+            positions.append(state)
+    endgames: List[GameState] = []
+    while len(endgames) < ORACLE_POSITIONS_PER_SIZE:
+        empties = ORACLE_EMPTIES[len(endgames) % len(ORACLE_EMPTIES)]
+        state = _random_position(rng, size, cells - empties)
+        if state is not None:
+            endgames.append(state)
+    return positions, endgames
+
+
+# أفضل زمن (بالنانوثانية) لكل عملية من عدة تكرارات
+def _time_per_op(operation: Callable[[], int], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = operation()
+        best = min(best, (time.perf_counter() - start) / count)
+    return best * 1e9
+
+
+def _boards(positions: Sequence[GameState]) -> List[Board]:
+    boards = []
+    for state in positions:
+        board = Board(state.size)
+        board.x_bits, board.o_bits = state.x_bits, state.o_bits
+        boards.append(board)
+    return boards
+
+
+# القياسات الدقيقة لحجم واحد: {اسم القياس: نانوثانية لكل عملية}
+def micro_benchmarks(size: int, positions: Sequence[GameState], number: int,
+                     repeat: int) -> Dict[str, float]:
+    boards = _boards(positions)
+    player = AIPlayer(Difficulty.MEDIUM)
+
+    def check_winner() -> int:
+        for _ in range(number):
+            for board in boards:
+                board.check_winner(Player.X)
+                board.check_winner(Player.O)
+        return number * len(boards) * 2
+
+    def is_full() -> int:
+        for _ in range(number):
+            for board in boards:
+                board.is_full()
+        return number * len(boards)
+
+    def get_successors() -> int:
+        for _ in range(max(1, number // 10)):
+            for state in positions:
+                state.get_successors()
+        return max(1, number // 10) * len(positions)
+
+    # إعادة بناء الحالة بالكامل: رموز جميع الخطوط والتقييم وتجزئات Zobrist
+    def rebuild_state() -> int:
+        for _ in range(max(1, number // 10)):
+            for state in positions:
+                GameState.from_bits(size, state.x_bits, state.o_bits, state.player,
+                                    win_length=state.win_length, neighborhood=state.neighborhood)
+        return max(1, number // 10) * len(positions)
+
+    # التحديث التدريجي: تنفيذ كل حركة ممكنة ثم التراجع عنها
+    moves = [list(state.legal_moves()) for state in positions]
+
+    def make_unmake() -> int:
+        count = 0
+        for _ in range(max(1, number // 10)):
+            for state, legal in zip(positions, moves):
+                for index in legal:
+                    state.make(index)
+                    state.unmake()
+                count += len(legal)
+        return max(1, count)
+
+    # تقييم الخطوط واحداً واحداً بقراءة جدول الأنماط (صفوف وأعمدة كل وضع)
+    lines: List[List[Player]] = []
+    for state in positions:
+        grid = state.grid
+        lines += grid + [list(column) for column in zip(*grid)]
+
+    def evaluate_line() -> int:
+        for _ in range(number):
+            for line in lines:
+                player._evaluate_line(line)
+        return number * len(lines)
+
+    return {
+        f'board.check_winner/{size}': _time_per_op(check_winner, repeat),
+        f'board.is_full/{size}': _time_per_op(is_full, repeat),
+        f'state.get_successors/{size}': _time_per_op(get_successors, repeat),
+        f'state.from_bits/{size}': _time_per_op(rebuild_state, repeat),
+        f'state.make_unmake/{size}': _time_per_op(make_unmake, repeat),
+        f'ai._evaluate_line/{size}': _time_per_op(evaluate_line, repeat),
+    }
+
+
+# زمن اختيار الحركة الكاملة لكل محرك، مع الحركات المختارة (أرقام الخلايا)
+def engine_benchmarks(size: int, positions: Sequence[GameState],
+                      repeat: int) -> Tuple[Dict[str, float], Dict[str, List[int]]]:
+    timings: Dict[str, float] = {}
+    moves: Dict[str, List[int]] = {}
+    for engine in ENGINES:
+        chosen: List[int] = []
+
+        def run() -> int:
+            # لاعب جديد في كل تكرار حتى لا يؤثر جدول التحويلات أو جدول التاريخ على النتيجة
+            player = AIPlayer(Difficulty.MEDIUM, engine, seed=ENGINE_SEED)
+            chosen.clear()
+            for state in positions:
+                move = player.get_move(state.copy(), SearchBudget(**ENGINE_BUDGET))
+                chosen.append(move.row * size + move.col)
+            return len(positions)
+
+        timings[f'{engine}.get_move/{size}'] = _time_per_op(run, repeat)
+        moves[f'{engine}/{size}'] = list(chosen)
+    return timings, moves
+
+
+# الحل الكامل بالقوة الغاشمة على مصفوفة بسيطة، مستقل عن الأقنعة وجداول التحويلات في المحركات
+# القيمة لصاحب الدور: 1 فوز، 0 تعادل، -1 خسارة
+class BruteForceOracle:
+    def __init__(self, size: int):
+        self.size = size
+        lines = [[(i, j) for j in range(size)] for i in range(size)]
+        lines += [[(j, i) for j in range(size)] for i in range(size)]
+        lines.append([(i, i) for i in range(size)])
+        lines.append([(i, size - 1 - i) for i in range(size)])
+        self.lines = lines
+        self._memo: Dict[Tuple[Tuple[Player, ...], Player], int] = {}
+
+    def _wins(self, grid: List[List[Player]], player: Player) -> bool:
+        return any(all(grid[i][j] == player for i, j in line) for line in self.lines)
+
+    def value(self, grid: List[List[Player]], player: Player) -> int:
+        key = (tuple(cell for row in grid for cell in row), player)
+        if key in self._memo:
+            return self._memo[key]
+        opponent = Player.O if player == Player.X else Player.X
+        if self._wins(grid, opponent):
+            result = -1
+        else:
+            empty = [(i, j) for i in range(self.size) for j in range(self.size)
+                     if grid[i][j] == Player.EMPTY]
+            result = -1 if empty else 0
+            for i, j in empty:
+                grid[i][j] = player
+                result = max(result, -self.value(grid, opponent))
+                grid[i][j] = Player.EMPTY
+                if result == 1:
+                    break
+        self._memo[key] = result
+        return result
+
+    # هل تحافظ الحركة على القيمة النظرية للوضع؟
+    def agrees(self, state: GameState, index: int) -> bool:
+        grid = state.grid
+        best = self.value(grid, state.player)
+        row, col = divmod(index, self.size)
+        grid[row][col] = state.player
+        opponent = Player.O if state.player == Player.X else Player.X
+        return -self.value(grid, opponent) == best
+
+
+# مطابقة حركات كل محرك مع الـ oracle على الأوضاع القريبة من النهاية
+def oracle_check(size: int, endgames: Sequence[GameState]) -> Dict[str, Dict[str, int]]:
+    oracle = BruteForceOracle(size)
+    report: Dict[str, Dict[str, int]] = {}
+    for engine in ENGINES:
+        player = AIPlayer(Difficulty.MEDIUM, engine, seed=ENGINE_SEED)
+        agree = 0
+        for state in endgames:
+            move = player.get_move(state.copy(), SearchBudget(**ENGINE_BUDGET))
+            agree += oracle.agrees(state, move.row * size + move.col)
+        report[f'{engine}/{size}'] = {'checked': len(endgames), 'agree': agree}
+    return report
+
+
+def run(sizes: Sequence[int], number: int, repeat: int) -> Dict:
+    results: Dict = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'numpy': batch_eval.available(),
+            'number': number,
+            'repeat': repeat,
+        },
+        'timings': {},
+        'moves': {},
+        'oracle': {},
+    }
+    for size in sizes:
+        positions, endgames = build_corpus(size)
+        results['timings'].update(micro_benchmarks(size, positions, number, repeat))
+        timings, moves = engine_benchmarks(size, positions, repeat)
+        results['timings'].update(timings)
+        results['moves'].update(moves)
+        results['oracle'].update(oracle_check(size, endgames))
+        print(f'size {size} done', file=sys.stderr)
+    return results
+
+
+# مقارنة النتائج مع ملف مرجعي؛ تُرجع قائمة المشاكل (فارغة إذا لم يوجد تراجع)
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    problems: List[str] = []
+    print(f"{'benchmark':36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, value in current['timings'].items():
+        old = baseline['timings'].get(name)
+        if old is None:
+            print(f'{name:36} {"-":>12} {value:12.0f}')
+            continue
+        change = value / old - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            problems.append(f'{name} is {change:.1%} slower')
+        print(f'{name:36} {old:12.0f} {value:12.0f} {change:+8.1%}{flag}')
+
+    for name, moves in current['moves'].items():
+        old = baseline['moves'].get(name)
+        if old is not None and old != moves:
+            changed = sum(1 for a, b in zip(old, moves) if a != b)
+            problems.append(f'{name}: {changed} of {len(moves)} moves changed')
+    for name, stats in current['oracle'].items():
+        old = baseline['oracle'].get(name)
+        if old is not None and stats['agree'] < old['agree']:
+            problems.append(f"{name}: oracle agreement fell from {old['agree']} to {stats['agree']}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the board, state, evaluation and engine hot paths.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--number', type=int, default=200, help="loops per micro benchmark run")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark (best is kept)")
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="compare with a JSON baseline and fail on regressions")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed slowdown before a benchmark is flagged (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.number, args.repeat)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    for name, stats in results['oracle'].items():
+        print(f"oracle {name}: {stats['agree']}/{stats['checked']} moves keep the solved value")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        problems = compare(baseline, results, args.threshold)
+        for problem in problems:
+            print(f'FAIL {problem}')
+        return 1 if problems else 0
+
+    for name, value in results['timings'].items():
+        print(f'{name:36} {value:12.0f} ns/op')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# دوال مساعدة لتمثيل اللوحة كأعداد صحيحة (bitboards)
+# كل لاعب له قناع خاص به، والبت رقم (row * size + col) يمثل الخلية (row, col)
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from player import Player
+
+# أكبر عدد خلايا نبني له جدول فوز كامل (2^16 = 65536 بايت)
+WIN_TABLE_MAX_CELLS = 16
+# الاتجاهات الأربعة لخطوط الفوز: أفقي، رأسي، قطري، قطري معاكس
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+# حساب رقم البت المقابل لخلية معينة
+def cell_index(size: int, row: int, col: int) -> int:
+    return row * size + col
+
+
+# قناع يحتوي على جميع خلايا اللوحة
+@lru_cache(maxsize=None)
+def full_mask(size: int) -> int:
+    return (1 << (size * size)) - 1
+
+
+# طول الخط المطلوب للفوز: None يعني خطاً بطول اللوحة كاملة (القاعدة الأصلية)
+def resolve_win_length(size: int, win_length: Optional[int]) -> int:
+    if win_length is None:
+        return size
+    if not 1 <= win_length <= size:
+        raise ValueError(f"win length must be between 1 and {size}, got {win_length}")
+    return win_length
+
+
+# خطوط الفوز كقوائم أرقام خلايا، مرة واحدة لكل حجم وطول فوز
+# عند win_length == size: الصفوف والأعمدة والقطرين (بنفس الترتيب الأصلي)
+# عند win_length < size: كل نافذة بطول win_length في الاتجاهات الأربعة (مثل Gomoku)
+@lru_cache(maxsize=None)
+def win_lines(size: int, win_length: Optional[int] = None) -> Tuple[Tuple[int, ...], ...]:
+    length = resolve_win_length(size, win_length)
+    if length == size:
+        lines = []
+        for i in range(size):
+            lines.append(tuple(cell_index(size, i, j) for j in range(size)))  # الصف
+            lines.append(tuple(cell_index(size, j, i) for j in range(size)))  # العمود
+        lines.append(tuple(cell_index(size, i, i) for i in range(size)))  # القطر الرئيسي
+        lines.append(tuple(cell_index(size, i, size - 1 - i) for i in range(size)))  # القطر الثانوي
+        return tuple(lines)
+    lines = []
+    for row in range(size):
+        for col in range(size):
+            for d_row, d_col in DIRECTIONS:
+                end_row = row + d_row * (length - 1)
+                end_col = col + d_col * (length - 1)
+                if 0 <= end_row < size and 0 <= end_col < size:
+                    lines.append(tuple(cell_index(size, row + d_row * step, col + d_col * step)
+                                       for step in range(length)))
+    return tuple(lines)
+
+
+# لكل خلية: أزواج (رقم الخط، 3^موقع الخلية في الخط) لتحديث رمز الخط في النظام الثلاثي
+@lru_cache(maxsize=None)
+def cell_line_powers(size: int,
+                     win_length: Optional[int] = None) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    through = [[] for _ in range(size * size)]
+    for line_id, line in enumerate(win_lines(size, win_length)):
+        for position, index in enumerate(line):
+            through[index].append((line_id, 3 ** position))
+    return tuple(tuple(pairs) for pairs in through)
+
+
+# أقنعة خطوط الفوز
+@lru_cache(maxsize=None)
+def win_masks(size: int, win_length: Optional[int] = None) -> Tuple[int, ...]:
+    return tuple(sum(1 << index for index in line) for line in win_lines(size, win_length))
+
+
+# لكل خلية: أقنعة خطوط الفوز المارة بها فقط (في الاتجاهات الأربعة، حتى win_length خط لكل اتجاه)
+@lru_cache(maxsize=None)
+def cell_win_masks(size: int, win_length: Optional[int] = None) -> Tuple[Tuple[int, ...], ...]:
+    masks = win_masks(size, win_length)
+    return tuple(tuple(masks[line_id] for line_id, _ in pairs)
+                 for pairs in cell_line_powers(size, win_length))
+
+
+# لكل خلية: قناع الخلايا التي تبعد عنها distance خلايا على الأكثر في أي اتجاه (تشمل الخلية نفسها)
+# تُستخدم لحصر الحركات المرشحة في جوار العلامات الموجودة على اللوحات الكبيرة
+@lru_cache(maxsize=None)
+def neighborhood_masks(size: int, distance: int) -> Tuple[int, ...]:
+    masks = []
+    for row in range(size):
+        for col in range(size):
+            mask = 0
+            for near_row in range(max(0, row - distance), min(size, row + distance + 1)):
+                for near_col in range(max(0, col - distance), min(size, col + distance + 1)):
+                    mask |= 1 << cell_index(size, near_row, near_col)
+            masks.append(mask)
+    return tuple(masks)
+
+
+# قناع الحركات المرشحة: جميع الخلايا الفارغة، أو الفارغة منها داخل near_bits (اتحاد جوار العلامات)
+# عند تحديد neighborhood. على لوحة فارغة: خلية المركز، أو الخلايا الأربع الوسطى للحجم الزوجي
+def candidate_mask(size: int, occupied: int, near_bits: int, neighborhood: Optional[int]) -> int:
+    empty = ~occupied & full_mask(size)
+    if neighborhood is None:
+        return empty
+    if not occupied:
+        middle = {(size - 1) // 2, size // 2}
+        return sum(1 << cell_index(size, row, col) for row in middle for col in middle)
+    near = near_bits & empty
+    return near if near else empty
+
+
+# جدول بحث مباشر: table[bits] == 1 إذا كان القناع يحتوي على خط فوز
+# يُبنى فقط للوحات الصغيرة (حتى 4×4) لأن حجمه 2^(size*size)
+@lru_cache(maxsize=None)
+def win_table(size: int, win_length: Optional[int] = None) -> Optional[bytearray]:
+    cells = size * size
+    if cells > WIN_TABLE_MAX_CELLS:
+        return None
+    table = bytearray(1 << cells)
+    everything = full_mask(size)
+    for mask in win_masks(size, win_length):
+        # المرور على كل المجموعات الجزئية من الخلايا خارج الخط
+        rest = everything & ~mask
+        subset = rest
+        while True:
+            table[mask | subset] = 1
+            if subset == 0:
+                break
+            subset = (subset - 1) & rest
+    return table
+
+
+# التحقق من وجود خط فوز في قناع لاعب (فحص كامل للوحة)
+def has_line(bits: int, size: int, win_length: Optional[int] = None) -> bool:
+    table = win_table(size, win_length)
+    if table is not None:
+        return table[bits] == 1
+    for mask in win_masks(size, win_length):
+        if bits & mask == mask:
+            return True
+    return False
+
+
+# التحقق من خط فوز يمر بالخلية index فقط (الحركة الأخيرة)
+# يكفي بعد كل حركة لأن أي خط فوز جديد يجب أن يمر بها، وتكلفته O(win_length) بدلاً من O(N²)
+def has_line_through(bits: int, size: int, index: int, win_length: Optional[int] = None) -> bool:
+    table = win_table(size, win_length)
+    if table is not None:
+        return table[bits] == 1
+    for mask in cell_win_masks(size, win_length)[index]:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+# تحويل مصفوفة اللاعبين إلى قناعين (X, O)
+def grid_to_bits(grid: List[List[Player]]) -> Tuple[int, int]:
+    size = len(grid)
+    x_bits = o_bits = 0
+    for i in range(size):
+        for j in range(size):
+            cell = grid[i][j]
+            if cell == Player.X:
+                x_bits |= 1 << cell_index(size, i, j)
+            elif cell == Player.O:
+                o_bits |= 1 << cell_index(size, i, j)
+    return x_bits, o_bits
+
+
+# بناء مصفوفة اللاعبين من القناعين (عرض فقط للواجهة القديمة)
+def bits_to_grid(size: int, x_bits: int, o_bits: int) -> List[List[Player]]:
+    grid = [[Player.EMPTY for _ in range(size)] for _ in range(size)]
+    for i in range(size):
+        for j in range(size):
+            bit = 1 << cell_index(size, i, j)
+            if x_bits & bit:
+                grid[i][j] = Player.X
+            elif o_bits & bit:
+                grid[i][j] = Player.O
+    return grid
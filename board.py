@@ -1,43 +1,88 @@
 # استيراد المكتبات والكلاسات اللازمة
-from typing import List
+from typing import List, Optional, Tuple
 from player import Player
 from move import Move
+from bitboard import bits_to_grid, cell_index, full_mask, has_line, has_line_through, \
+    resolve_win_length
 
 class Board:
     # تهيئة لوحة اللعب بحجم محدد (الحجم الافتراضي 3×3)
-    def __init__(self, size: int = 3):
+    # يتم تخزين اللوحة كقناعين من البتات: واحد لكل لاعب
+    # win_length: عدد العلامات المتتالية المطلوبة للفوز (None لخط بطول اللوحة كاملة)
+    def __init__(self, size: int = 3, win_length: Optional[int] = None):
         self.size = size
+        self.win_length = resolve_win_length(size, win_length)
+        self.full_mask = full_mask(size)
         self.clear()
 
+    # عرض اللوحة كمصفوفة ثنائية الأبعاد (للقراءة فقط)
+    @property
+    def grid(self) -> List[List[Player]]:
+        return bits_to_grid(self.size, self.x_bits, self.o_bits)
+
+    # قراءة محتوى خلية واحدة دون بناء المصفوفة كاملة
+    def cell(self, row: int, col: int) -> Player:
+        bit = 1 << cell_index(self.size, row, col)
+        if self.x_bits & bit:
+            return Player.X
+        if self.o_bits & bit:
+            return Player.O
+        return Player.EMPTY
+
     # دالة لتنفيذ حركة اللاعب على اللوحة
     # تقوم بوضع رمز اللاعب في المكان المحدد إذا كان فارغاً
+    # الحركة تُحفظ في مكدس السجل، وأي حركة جديدة تلغي إمكانية الإعادة
     def make_move(self, move: Move, player: Player) -> bool:
-        if self.grid[move.row][move.col] == Player.EMPTY:
-            self.grid[move.row][move.col] = player
-            return True
-        return False
+        index = cell_index(self.size, move.row, move.col)
+        if (self.x_bits | self.o_bits) & (1 << index):
+            return False
+        self._place(index, player)
+        self.redo_stack.clear()
+        return True
+
+    def _place(self, index: int, player: Player):
+        if player == Player.X:
+            self.x_bits |= 1 << index
+        else:
+            self.o_bits |= 1 << index
+        self.history.append((index, player))
+
+    # التراجع عن آخر حركة وإرجاعها مع اللاعب الذي نفذها
+    def undo_move(self) -> Optional[Tuple[Move, Player]]:
+        if not self.history:
+            return None
+        index, player = self.history.pop()
+        if player == Player.X:
+            self.x_bits &= ~(1 << index)
+        else:
+            self.o_bits &= ~(1 << index)
+        self.redo_stack.append((index, player))
+        return Move(index // self.size, index % self.size), player
+
+    # إعادة آخر حركة تم التراجع عنها
+    def redo_move(self) -> Optional[Tuple[Move, Player]]:
+        if not self.redo_stack:
+            return None
+        index, player = self.redo_stack.pop()
+        self._place(index, player)
+        return Move(index // self.size, index % self.size), player
 
     # التحقق مما إذا كانت اللوحة ممتلئة بالكامل
     def is_full(self) -> bool:
-        return all(cell != Player.EMPTY for row in self.grid for cell in row)
+        return (self.x_bits | self.o_bits) == self.full_mask
 
     # تنظيف اللوحة وإعادتها إلى الحالة الأولية
-    # تقوم بإنشاء مصفوفة ثنائية الأبعاد وملئها بقيم فارغة
     def clear(self):
-        self.grid = [[Player.EMPTY for _ in range(self.size)] for _ in range(self.size)]
+        self.x_bits = 0
+        self.o_bits = 0
+        self.history: List[Tuple[int, Player]] = []     # الحركات المنفذة بالترتيب
+        self.redo_stack: List[Tuple[int, Player]] = []  # الحركات التي تم التراجع عنها
 
     # التحقق من وجود فائز
-    # تفحص جميع الصفوف والأعمدة والخطوط القطرية
+    # إذا كان اللاعب صاحب آخر حركة تُفحص فقط الخطوط المارة بخليتها (الاتجاهات الأربعة)،
+    # وإلا يُقارن قناعه مع جميع أقنعة خطوط الفوز المحسوبة مسبقاً
     def check_winner(self, player: Player) -> bool:
-        # فحص الصفوف والأعمدة
-        for i in range(self.size):
-            # فحص الصف الأفقي
-            if all(self.grid[i][j] == player for j in range(self.size)) or \
-                    all(self.grid[j][i] == player for j in range(self.size)):
-                return True
-
-        # فحص القطرين الرئيسي والثانوي
-        if all(self.grid[i][i] == player for i in range(self.size)) or \
-                all(self.grid[i][self.size - 1 - i] == player for i in range(self.size)):
-            return True
-        return False
\ No newline at end of file
+        bits = self.x_bits if player == Player.X else self.o_bits
+        if self.history and self.history[-1][1] == player:
+            return has_line_through(bits, self.size, self.history[-1][0], self.win_length)
+        return has_line(bits, self.size, self.win_length)
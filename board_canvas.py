@@ -0,0 +1,116 @@
+# رسم لوحة اللعب على Canvas واحد بدلاً من زر لكل خلية (للوحات الكبيرة)
+# الخلية المضغوطة تُحسب من إحداثيات المؤشر، ولا يُعاد رسم إلا الخلايا التي تغير محتواها
+# تغيير النمط يُطبَّق كفرق: أمر واحد لكل وسم (tag) تغير لونه بدلاً من إعادة تهيئة كل خلية
+import tkinter as tk
+from typing import Callable, Dict, List, Optional
+from player import Player
+
+CELL_SIZE = 30  # Cell width and height in pixels
+GAP = 2         # Space between cells (shows the border color)
+FONT = ('Helvetica', 13, 'bold')
+
+# لون كل وسم من ألوان النمط: الوسم -> (خاصية العنصر، مفتاح اللون في النمط)
+TAG_COLORS = {
+    'cell': ('fill', 'button_bg'),
+    'hover': ('fill', 'hover'),
+    'mark_X': ('fill', 'x_color'),
+    'mark_O': ('fill', 'o_color'),
+}
+
+
+class BoardCanvas:
+    # parent: الإطار الذي يحتوي اللوحة
+    # on_click: تُستدعى بـ (الصف، العمود) عند النقر على خلية
+    def __init__(self, parent: tk.Widget, size: int, on_click: Callable[[int, int], None]):
+        self.size = size
+        self.on_click = on_click
+        pitch = CELL_SIZE + GAP
+        self.canvas = tk.Canvas(parent, width=size * pitch + GAP, height=size * pitch + GAP,
+                                highlightthickness=0, borderwidth=0)
+        # عنصران لكل خلية: مستطيل الخلفية ونص العلامة
+        self._rects: List[int] = []
+        self._texts: List[int] = []
+        for row in range(size):
+            for col in range(size):
+                left, top = GAP + col * pitch, GAP + row * pitch
+                self._rects.append(self.canvas.create_rectangle(
+                    left, top, left + CELL_SIZE, top + CELL_SIZE, width=0, tags=('cell',)))
+                self._texts.append(self.canvas.create_text(
+                    left + CELL_SIZE // 2, top + CELL_SIZE // 2, text='', font=FONT))
+        # المحتوى المرسوم حالياً لكل خلية، للمقارنة قبل أي إعادة رسم
+        self._cells: List[Player] = [Player.EMPTY] * (size * size)
+        self._hovered: Optional[int] = None
+        self._colors: Optional[Dict] = None  # ألوان النمط المطبق حالياً
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Motion>', self._on_motion)
+        self.canvas.bind('<Leave>', lambda event: self._set_hover(None))
+
+    def pack(self, **options):
+        self.canvas.pack(**options)
+
+    # رقم الخلية تحت المؤشر، أو None للفواصل وخارج اللوحة
+    def cell_at(self, x: int, y: int) -> Optional[int]:
+        pitch = CELL_SIZE + GAP
+        col, col_offset = divmod(x - GAP, pitch)
+        row, row_offset = divmod(y - GAP, pitch)
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return None
+        if col_offset >= CELL_SIZE or row_offset >= CELL_SIZE:
+            return None
+        return row * self.size + col
+
+    # تحديث محتوى خلية واحدة (لا شيء يُرسم إذا لم يتغير)
+    def set_cell(self, row: int, col: int, player: Player):
+        index = row * self.size + col
+        if self._cells[index] == player:
+            return
+        self._cells[index] = player
+        if player == Player.EMPTY:
+            self.canvas.itemconfigure(self._texts[index], text='', tags=())
+        else:
+            color = self._colors['x_color' if player == Player.X else 'o_color'] if self._colors else ''
+            self.canvas.itemconfigure(self._texts[index], text=player.value, fill=color,
+                                      tags=(f'mark_{player.value}',))
+            if index == self._hovered:
+                self._set_hover(None)
+
+    # مسح اللوحة: الخلايا الفارغة أصلاً لا تُلمس
+    def clear(self):
+        for index, player in enumerate(self._cells):
+            if player != Player.EMPTY:
+                self.set_cell(index // self.size, index % self.size, Player.EMPTY)
+
+    # تطبيق نمط جديد: تُرسل فقط الألوان التي تختلف عن النمط الحالي، بأمر واحد لكل وسم
+    def apply_theme(self, colors: Dict):
+        previous = self._colors or {}
+        if previous.get('border') != colors['border']:
+            self.canvas.configure(bg=colors['border'])
+        for tag, (option, key) in TAG_COLORS.items():
+            if previous.get(key) != colors[key]:
+                self.canvas.itemconfigure(tag, **{option: colors[key]})
+        self._colors = colors
+
+    def _on_click(self, event):
+        index = self._cell_from_event(event)
+        if index is not None:
+            self.on_click(index // self.size, index % self.size)
+
+    def _on_motion(self, event):
+        index = self._cell_from_event(event)
+        if index != self._hovered:
+            self._set_hover(index)
+
+    def _cell_from_event(self, event) -> Optional[int]:
+        return self.cell_at(int(self.canvas.canvasx(event.x)), int(self.canvas.canvasy(event.y)))
+
+    # تلوين الخلية الفارغة تحت المؤشر وإرجاع الخلية السابقة للونها العادي
+    def _set_hover(self, index: Optional[int]):
+        colors = self._colors or {}
+        if self._hovered is not None:
+            rect = self._rects[self._hovered]
+            self.canvas.itemconfigure(rect, fill=colors.get('button_bg', ''), tags=('cell',))
+        if index is not None and self._cells[index] != Player.EMPTY:
+            index = None
+        if index is not None:
+            self.canvas.itemconfigure(self._rects[index], fill=colors.get('hover', ''), tags=('hover',))
+        self._hovered = index
@@ -0,0 +1,30 @@
+# أدوات مشتركة لاختبارات pytest
+from typing import List
+import pytest
+from player import Player
+from game_state import GameState
+from benchmark import BruteForceOracle
+
+
+# جميع المواقع غير المنتهية على 3×3، موقع واحد لكل صنف من المواقع المتماثلة
+@pytest.fixture(scope='session')
+def positions_3x3() -> List[GameState]:
+    positions = {}
+
+    def visit(state: GameState):
+        if state.key in positions or state.is_terminal():
+            return
+        positions[state.key] = GameState.from_bits(3, state.x_bits, state.o_bits, state.player)
+        for index in list(state.legal_moves()):
+            state.make(index)
+            visit(state)
+            state.unmake()
+
+    visit(GameState.from_bits(3, 0, 0, Player.X))
+    return list(positions.values())
+
+
+# الحل الكامل بالقوة الغاشمة (تُحفظ نتائجه بين الاختبارات)
+@pytest.fixture(scope='session')
+def oracle_3x3() -> BruteForceOracle:
+    return BruteForceOracle(3)
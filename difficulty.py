@@ -0,0 +1,30 @@
+from enum import Enum
+
+# مستويات صعوبة الكمبيوتر معبراً عنها كميزانيات بحث
+class Difficulty(Enum):
+    EASY = {
+        'label': 'Easy',
+        'time_limit': 0.05,      # 50 ms per move
+        'node_limit': 200,       # Very shallow look-ahead
+        'max_depth': 1,          # Only the AI's own next move
+        'perfect_tables': False, # Never use solved tables
+        'threat_search': False   # Does not look for forced winning sequences
+    }
+
+    MEDIUM = {
+        'label': 'Medium',
+        'time_limit': 0.2,       # 200 ms per move
+        'node_limit': 5000,
+        'max_depth': 3,
+        'perfect_tables': False,
+        'threat_search': True    # Plays forced wins and blocks forced losses first
+    }
+
+    HARD = {
+        'label': 'Hard',
+        'time_limit': 1.0,       # One second per move, whatever the board size
+        'node_limit': None,
+        'max_depth': None,       # Iterative deepening until the deadline
+        'perfect_tables': True,  # Use the solved 3x3 table and tablebases when available
+        'threat_search': True
+    }
@@ -0,0 +1,80 @@
+# تقييم خطوط اللوحة من وجهة نظر الكمبيوتر (O) باستخدام جدول أنماط
+# كل خط يُرمَّز كعدد في النظام الثلاثي: الرقم 0 للخلية الفارغة، 1 للاعب X و 2 للاعب O،
+# ثم تُقرأ قيمته مباشرة من جدول محسوب مسبقاً لطول الخط وطول الفوز والأوزان المختارة
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+from player import Player
+
+# أكبر طول خط يُبنى له جدول كامل (3^10 = 59049 قيمة)، الخطوط الأطول تُحسب قيمها عند الحاجة
+MAX_DENSE_LENGTH = 10
+
+DIGITS = {Player.EMPTY: 0, Player.X: 1, Player.O: 2}
+
+
+# أكبر أس للأوزان الافتراضية حتى يبقى مجموع التقييم أقل بكثير من قيمة الفوز المؤكد في البحث
+MAX_WEIGHT_EXPONENT = 12
+
+
+# الأوزان الافتراضية: weights[c] قيمة خط فيه c علامات للاعب واحد فقط
+# لخط من 3 خلايا: (0, 1, 10, 100) وهي نفس قيم التقييم الأصلية
+def default_weights(win_length: int) -> Tuple[float, ...]:
+    return (0.0,) + tuple(10.0 ** min(count - 1, MAX_WEIGHT_EXPONENT)
+                          for count in range(1, win_length + 1))
+
+
+# قيمة نمط واحد: الخط الذي يحتوي على علامات اللاعبين معاً لا قيمة له
+def pattern_score(code: int, length: int, weights: Sequence[float]) -> float:
+    x_count = o_count = 0
+    for _ in range(length):
+        digit = code % 3
+        if digit == 1:
+            x_count += 1
+        elif digit == 2:
+            o_count += 1
+        code //= 3
+    if x_count and o_count:
+        return 0.0
+    top = len(weights) - 1
+    if o_count:
+        return weights[min(o_count, top)]   # أفضلية للكمبيوتر
+    if x_count:
+        return -weights[min(x_count, top)]  # أفضلية للاعب
+    return 0.0
+
+
+# جدول يحسب قيمة النمط عند أول طلب فقط (للخطوط الطويلة جداً)
+class _LazyPatternScores(dict):
+    def __init__(self, length: int, weights: Sequence[float]):
+        super().__init__()
+        self.length = length
+        self.weights = weights
+
+    def __missing__(self, code: int) -> float:
+        value = pattern_score(code, self.length, self.weights)
+        self[code] = value
+        return value
+
+
+# جدول قيم الأنماط لطول خط وطول فوز معينين
+# weights: أوزان اختيارية (الافتراضي default_weights)
+@lru_cache(maxsize=None)
+def pattern_scores(length: int, win_length: Optional[int] = None,
+                   weights: Optional[Tuple[float, ...]] = None) -> Sequence[float]:
+    if weights is None:
+        weights = default_weights(win_length or length)
+    if length > MAX_DENSE_LENGTH:
+        return _LazyPatternScores(length, weights)
+    return [pattern_score(code, length, weights) for code in range(3 ** length)]
+
+
+# ترميز خط من اللاعبين كعدد في النظام الثلاثي
+def encode_line(line: List[Player]) -> int:
+    code = 0
+    for position, cell in enumerate(line):
+        code += DIGITS[cell] * 3 ** position
+    return code
+
+
+# دالة التقييم العامة لمحركات البحث: التقييم محفوظ في الحالة ويُحدَّث مع كل حركة
+def state_score(state) -> float:
+    return state.score
@@ -1,20 +1,50 @@
+import threading
 import tkinter as tk
 from typing import Callable
 from theme import Theme
-from ai_game import AIGame
-from two_player_game import TwoPlayerGame
-import webbrowser
+from difficulty import Difficulty
+from rules import Rules
+
+# أسماء محركات البحث في القائمة (نفس ترتيب AIPlayer.ENGINES)
+ENGINE_LABELS = {
+    'alphabeta': 'Alpha-Beta',
+    'parallel': 'Parallel',
+    'mcts': 'MCTS',
+    'astar': 'A*',
+    'idastar': 'IDA*'
+}
+
+# القائمة تستورد ما تحتاجه للرسم فقط: أنماط اللعب (ومعها المحركات و NumPy) وجدول اللعب
+# المثالي 3×3 تُحمَّل هنا في خيط خلفي بعد ظهور القائمة، أو عند أول استخدام إذا ضغط المستخدم
+# قبل اكتمال التحميل
+def _preload():
+    import ai_game
+    import two_player_game
+    from perfect_play import perfect_play_table
+    perfect_play_table(3).start()  # تحميل أو حل الجدول في خيط خاص به
+
 
 # فئة القائمة الرئيسية للعبة
 class GameMenu:
     # دالة البداية - تهيئة النافذة الرئيسية
-    def __init__(self, window: tk.Tk):
+    # الإعدادات تُمرَّر عند الرجوع من اللعبة حتى تبقى اختيارات المستخدم كما هي
+    def __init__(self, window: tk.Tk, theme: Theme = Theme.DARK,
+                 difficulty: Difficulty = Difficulty.HARD, rules: Rules = Rules.CLASSIC,
+                 engine: str = 'alphabeta'):
         self.window = window  # تخزين النافذة الرئيسية
         self.window.title("Tic Tac Toe")  # تعيين عنوان النافذة
         self.window.resizable(False, False)  # تعطيل إمكانية تغيير حجم النافذة
-        self.current_theme = Theme.DARK  # تعيين النمط المظلم كنمط افتراضي
+        self.current_theme = theme  # النمط المظلم افتراضياً
+        self.difficulty = difficulty  # مستوى الصعوبة
+        self.rules = rules  # حجم اللوحة وطول الفوز
+        self.engine = engine  # محرك البحث
         self._create_menu()  # إنشاء واجهة القائمة
         self._center_window()  # توسيط النافذة على الشاشة
+        # بدء التحميل الخلفي بعد رسم القائمة: الاستدعاء الخامل ينتظر انتهاء الرسم ثم يضيف مؤقتاً
+        self.window.after_idle(lambda: self.window.after(0, self._start_preload))
+
+    def _start_preload(self):
+        threading.Thread(target=_preload, daemon=True).start()
 
     # دالة لتوسيط النافذة على الشاشة
     def _center_window(self):
@@ -50,6 +80,21 @@ class GameMenu:
         # إنشاء أزرار وضع اللعب
         self._create_menu_button("Play vs AI", self._start_ai_game)  # زر اللعب ضد الكمبيوتر
         self._create_menu_button("Play vs Friend", self._start_two_player_game)  # زر اللعب ضد صديق
+        # زر تغيير مستوى الصعوبة
+        self.difficulty_button = self._create_menu_button(
+            self._get_difficulty_text(),
+            self._cycle_difficulty
+        )
+        # زر تغيير محرك البحث
+        self.engine_button = self._create_menu_button(
+            self._get_engine_text(),
+            self._cycle_engine
+        )
+        # زر تغيير حجم اللوحة وطول الفوز
+        self.rules_button = self._create_menu_button(
+            self._get_rules_text(),
+            self._cycle_rules
+        )
         self._create_menu_button("Exit", self.window.quit)  # زر الخروج من اللعبة
 
         # زر تغيير النمط (مظلم/مضيء)
@@ -117,12 +162,41 @@ class GameMenu:
         self.current_theme = Theme.DARK if self.current_theme == Theme.LIGHT else Theme.LIGHT
         self._update_menu_theme()  # تحديث مظهر القائمة
 
+    def _get_difficulty_text(self) -> str:
+        return f"AI Level: {self.difficulty.value['label']}"
+
+    def _cycle_difficulty(self):
+        # الانتقال إلى مستوى الصعوبة التالي
+        levels = list(Difficulty)
+        self.difficulty = levels[(levels.index(self.difficulty) + 1) % len(levels)]
+        self.difficulty_button.configure(text=self._get_difficulty_text())
+
+    def _get_engine_text(self) -> str:
+        return f"AI Engine: {ENGINE_LABELS[self.engine]}"
+
+    def _cycle_engine(self):
+        # الانتقال إلى محرك البحث التالي
+        engines = list(ENGINE_LABELS)
+        self.engine = engines[(engines.index(self.engine) + 1) % len(engines)]
+        self.engine_button.configure(text=self._get_engine_text())
+
+    def _get_rules_text(self) -> str:
+        return f"Board: {self.rules.value['label']}"
+
+    def _cycle_rules(self):
+        # الانتقال إلى القواعد التالية (حجم اللوحة وطول الفوز)
+        variants = list(Rules)
+        self.rules = variants[(variants.index(self.rules) + 1) % len(variants)]
+        self.rules_button.configure(text=self._get_rules_text())
+
     def _open_github(self):
         # فتح صفحة GitHub في المتصفح
+        import webbrowser
         webbrowser.open('https://github.com/aliabdelmoaty')
 
     def _open_linkedin(self):
         # فتح صفحة LinkedIn في المتصفح
+        import webbrowser
         webbrowser.open('https://www.linkedin.com/in/ali-abdelmoaty10')
 
     def _update_menu_theme(self):
@@ -177,13 +251,20 @@ class GameMenu:
 
     # دالة بدء اللعب ضد الكمبيوتر
     def _start_ai_game(self):
+        from ai_game import AIGame  # محمل مسبقاً في الخلفية عادةً
         self.menu_frame.destroy()  # إزالة القائمة الرئيسية
-        game = AIGame(self.window, self.current_theme)  # إنشاء لعبة جديدة ضد الكمبيوتر
-        game.on_back_to_menu = lambda: GameMenu(self.window)  # تعيين دالة الرجوع للقائمة
+        game = AIGame(self.window, self.current_theme, self.difficulty, self.engine,
+                      rules=self.rules)  # إنشاء لعبة جديدة ضد الكمبيوتر
+        game.on_back_to_menu = lambda: self._back_to_menu(game)  # تعيين دالة الرجوع للقائمة
 
     # دالة بدء اللعب ضد صديق
     def _start_two_player_game(self):
+        from two_player_game import TwoPlayerGame
         self.menu_frame.destroy()  # إزالة القائمة الرئيسية
-        game = TwoPlayerGame(self.window, self.current_theme)  # إنشاء لعبة جديدة للاعبين
-        game.on_back_to_menu = lambda: GameMenu(self.window)  # تعيين دالة الرجوع للقائمة
+        game = TwoPlayerGame(self.window, self.current_theme, self.rules)  # إنشاء لعبة جديدة للاعبين
+        game.on_back_to_menu = lambda: self._back_to_menu(game)  # تعيين دالة الرجوع للقائمة
+
+    # قائمة جديدة بنفس الإعدادات المختارة، وبالنمط الذي تركته اللعبة (يمكن تغييره أثناء اللعب)
+    def _back_to_menu(self, game) -> 'GameMenu':
+        return GameMenu(self.window, game.current_theme, self.difficulty, self.rules, self.engine)
 
@@ -0,0 +1,109 @@
+# سجل المباريات بصيغة ثنائية مضغوطة: ملف واحد تُضاف إليه المباريات المنتهية
+# الملف يبدأ بمعرّف الصيغة، ثم سجل لكل مباراة: رأس من 7 بايت (حجم اللوحة، طول الفوز،
+# لاعبا X و O، النتيجة، عدد الحركات) ثم الحركات بالترتيب، بايت واحد لكل حركة (رقم الخلية)
+# القارئ مولّد يقرأ سجلاً واحداً في كل مرة، فيمر على ملايين المباريات بذاكرة ثابتة
+# الاستخدام: python game_record.py games.bin لعرض ملخص الملف
+import argparse
+import struct
+from collections import Counter
+from typing import Iterator, NamedTuple, Optional
+from player import Player
+from storage import data_path
+
+FILE_HEADER = b'TTTR\x01'  # معرّف الصيغة ورقم إصدارها
+GAMES_FILENAME = 'games.bin'
+# الرأس: الحجم، طول الفوز، رمز لاعب X، رمز لاعب O، النتيجة، عدد الحركات
+RECORD = struct.Struct('<BBBBBH')
+# رموز اللاعبين: الإنسان ثم محركات AIPlayer (الأسماء الجديدة تُضاف في النهاية فقط حتى تبقى
+# الملفات القديمة قابلة للقراءة)
+PLAYERS = ('human', 'alphabeta', 'parallel', 'mcts', 'astar', 'idastar')
+HUMAN = 'human'
+# النتيجة: 0 تعادل، 1 فوز X، 2 فوز O
+RESULTS = (None, Player.X, Player.O)
+# أكبر لوحة يمكن تخزين خلاياها في بايت واحد
+MAX_CELLS = 256
+
+
+class GameRecord(NamedTuple):
+    size: int
+    win_length: int
+    x_player: str              # 'human' أو اسم المحرك
+    o_player: str
+    winner: Optional[Player]   # None للتعادل
+    moves: bytes               # أرقام الخلايا بالترتيب، X يبدأ
+
+    # ترميز السجل كبايتات جاهزة للإضافة إلى الملف
+    def encode(self) -> bytes:
+        if self.size * self.size > MAX_CELLS:
+            raise ValueError(f"board {self.size}x{self.size} does not fit one byte per move")
+        return RECORD.pack(self.size, self.win_length, PLAYERS.index(self.x_player),
+                           PLAYERS.index(self.o_player), RESULTS.index(self.winner),
+                           len(self.moves)) + self.moves
+
+
+class GameRecordWriter:
+    # path: مسار الملف (None للملف الافتراضي في مجلد البيانات)
+    # الملف يبقى مفتوحاً حتى close، ومعرّف الصيغة يُكتب فقط إذا كان الملف جديداً
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or data_path(GAMES_FILENAME)
+        self._file = open(self.path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER)
+
+    def write(self, record: GameRecord):
+        self._file.write(record.encode())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> 'GameRecordWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# إضافة مباراة واحدة إلى الملف (تستخدمها الواجهة عند انتهاء كل مباراة)
+def append_game(record: GameRecord, path: Optional[str] = None):
+    with GameRecordWriter(path) as writer:
+        writer.write(record)
+
+
+# قراءة السجلات واحداً تلو الآخر
+# سجل ناقص في نهاية الملف (مثلاً بعد انقطاع أثناء الكتابة) يُتجاهل
+def read_records(path: Optional[str] = None) -> Iterator[GameRecord]:
+    with open(path or data_path(GAMES_FILENAME), 'rb') as file:
+        if file.read(len(FILE_HEADER)) != FILE_HEADER:
+            raise ValueError("not a game record file")
+        while True:
+            header = file.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            size, win_length, x_code, o_code, result, count = RECORD.unpack(header)
+            moves = file.read(count)
+            if len(moves) < count:
+                return
+            yield GameRecord(size, win_length, PLAYERS[x_code], PLAYERS[o_code], RESULTS[result], moves)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a binary game record file.")
+    parser.add_argument('path', nargs='?', help="record file (default: games.bin in the data folder)")
+    args = parser.parse_args(argv)
+
+    games = Counter()
+    results = Counter()
+    moves = 0
+    for record in read_records(args.path):
+        variant = f'{record.size}x{record.size}/{record.win_length} {record.x_player}-{record.o_player}'
+        games[variant] += 1
+        results[variant, 'draw' if record.winner is None else record.winner.value] += 1
+        moves += len(record.moves)
+    print(f"{sum(games.values())} games, {moves} moves")
+    for variant, count in sorted(games.items()):
+        print(f"{variant}: {count} games  X {results[variant, 'X']}  O {results[variant, 'O']}  "
+              f"draw {results[variant, 'draw']}")
+
+
+if __name__ == '__main__':
+    main()
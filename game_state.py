@@ -1,59 +1,237 @@
 # استيراد المكتبات اللازمة للتعامل مع الأنواع والكلاسات المطلوبة
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 from player import Player
 from move import Move
+from bitboard import bits_to_grid, candidate_mask, cell_line_powers, full_mask, grid_to_bits, \
+    has_line, has_line_through, neighborhood_masks, resolve_win_length, win_lines
+from evaluation import pattern_scores
+from symmetry import inverse_symmetries, symmetric_hashes, symmetries, unique_move_indices, \
+    update_hashes
 
 class GameState:
     # دالة البناء: تأخذ حالة اللوحة الحالية واللاعب الحالي
     # grid: مصفوفة تمثل حالة اللوحة
     # player: اللاعب الحالي (X أو O)
-    def __init__(self, grid: List[List[Player]], player: Player):
-        self.grid = grid        # تخزين حالة اللوحة
+    # weights: أوزان تقييم الخطوط (اختيارية، انظر evaluation.default_weights)
+    # win_length: عدد العلامات المتتالية المطلوبة للفوز (None لخط بطول اللوحة كاملة)
+    # neighborhood: الحركات المرشحة للبحث هي الخلايا الفارغة التي تبعد هذا العدد من الخلايا
+    #   على الأكثر عن علامة موجودة (None لجميع الخلايا الفارغة)
+    def __init__(self, grid: List[List[Player]], player: Player,
+                 weights: Tuple[float, ...] = None, win_length: int = None,
+                 neighborhood: int = None):
+        x_bits, o_bits = grid_to_bits(grid)
+        self._init_bits(len(grid), x_bits, o_bits, player, None, weights, win_length, neighborhood)
+
+    # إنشاء حالة مباشرة من القناعين دون المرور بالمصفوفة
+    # hashes: تجزئات Zobrist محسوبة مسبقاً (إن وجدت) لتجنب إعادة حسابها
+    @classmethod
+    def from_bits(cls, size: int, x_bits: int, o_bits: int, player: Player,
+                  hashes: Tuple[int, ...] = None,
+                  weights: Tuple[float, ...] = None,
+                  win_length: int = None,
+                  neighborhood: int = None) -> 'GameState':
+        state = cls.__new__(cls)
+        state._init_bits(size, x_bits, o_bits, player, hashes, weights, win_length, neighborhood)
+        return state
+
+    def _init_bits(self, size: int, x_bits: int, o_bits: int, player: Player,
+                   hashes: Tuple[int, ...] = None, weights: Tuple[float, ...] = None,
+                   win_length: int = None, neighborhood: int = None):
+        self.size = size        # تخزين حجم اللوحة
+        self.win_length = resolve_win_length(size, win_length)  # طول الخط المطلوب للفوز
+        self.x_bits = x_bits    # قناع خلايا اللاعب X
+        self.o_bits = o_bits    # قناع خلايا اللاعب O
         self.player = player    # تخزين اللاعب الحالي
-        self.size = len(grid)   # تخزين حجم اللوحة
+        # تجزئات Zobrist للحالة تحت التحويلات الثمانية، تُحدَّث تدريجياً مع كل حركة
+        if hashes is None:
+            hashes = symmetric_hashes(size, x_bits, o_bits, player)
+        self.hashes = hashes
+        self.hash = hashes[0]   # تجزئة اللوحة كما هي دون تحويل
+        # رمز كل خط فوز في النظام الثلاثي، وتقييم اللوحة من وجهة نظر O
+        # يتم تحديثهما مع كل حركة للخطوط المارة بالخلية فقط بدلاً من إعادة حسابهما
+        self.weights = weights
+        self.patterns = pattern_scores(self.win_length, self.win_length, weights)
+        self.line_codes = [
+            sum((1 if x_bits >> index & 1 else 2 if o_bits >> index & 1 else 0) * 3 ** position
+                for position, index in enumerate(line))
+            for line in win_lines(size, self.win_length)
+        ]
+        self.score = sum(self.patterns[code] for code in self.line_codes)
+        # اتحاد جوار جميع العلامات، يُوسَّع مع كل حركة ويُستعاد من المكدس عند التراجع
+        self.neighborhood = neighborhood
+        self.near_bits = 0
+        if neighborhood is not None:
+            masks = neighborhood_masks(size, neighborhood)
+            occupied = x_bits | o_bits
+            while occupied:
+                low = occupied & -occupied
+                self.near_bits |= masks[low.bit_length() - 1]
+                occupied ^= low
+        # مكدس الحركات المنفذة بـ make: (رقم الخلية، التجزئات والتقييم والجوار قبل الحركة)
+        self.history: List[Tuple[int, Tuple[int, ...], float, int]] = []
+
+    # نسخة مستقلة من الحالة (بدون سجل الحركات)
+    def copy(self) -> 'GameState':
+        state = GameState.__new__(GameState)
+        state.size = self.size
+        state.win_length = self.win_length
+        state.x_bits = self.x_bits
+        state.o_bits = self.o_bits
+        state.player = self.player
+        state.hashes = self.hashes
+        state.hash = self.hash
+        state.weights = self.weights
+        state.patterns = self.patterns
+        state.line_codes = self.line_codes.copy()
+        state.score = self.score
+        state.neighborhood = self.neighborhood
+        state.near_bits = self.near_bits
+        state.history = []
+        return state
+
+    # المفتاح القانوني: أصغر تجزئة بين الحالات المتماثلة
+    # الحالات المتماثلة بالدوران أو الانعكاس تشترك في نفس المفتاح
+    @property
+    def key(self) -> int:
+        return min(self.hashes)
+
+    # رقم التحويل الذي ينقل اللوحة إلى شكلها القانوني
+    @property
+    def canonical_transform(self) -> int:
+        return self.hashes.index(min(self.hashes))
+
+    # تحويل رقم خلية من اللوحة الحالية إلى الشكل القانوني
+    def to_canonical(self, index: int) -> int:
+        return symmetries(self.size)[self.canonical_transform][index]
+
+    # إرجاع رقم خلية من الشكل القانوني إلى اللوحة الحالية
+    def from_canonical(self, index: int) -> int:
+        return inverse_symmetries(self.size)[self.canonical_transform][index]
+
+    # عرض اللوحة كمصفوفة ثنائية الأبعاد (للقراءة فقط)
+    @property
+    def grid(self) -> List[List[Player]]:
+        return bits_to_grid(self.size, self.x_bits, self.o_bits)
+
+    # توليد الخلايا الفارغة بشكل كسول دون إنشاء قائمة
+    def legal_moves(self) -> Iterator[int]:
+        empty = ~(self.x_bits | self.o_bits) & full_mask(self.size)
+        while empty:
+            low = empty & -empty
+            yield low.bit_length() - 1
+            empty ^= low
+
+    # الحركات المرشحة للبحث كقناع (انظر bitboard.candidate_mask)
+    def candidate_mask(self) -> int:
+        return candidate_mask(self.size, self.x_bits | self.o_bits, self.near_bits, self.neighborhood)
+
+    # الحركات المرشحة كقائمة أرقام خلايا (unique: حذف الحركات المتماثلة، تُستخدم عند الجذر)
+    # عند حصر الحركات في الجوار تأتي الحركات الإجبارية أولاً: الفوز الفوري ثم منع فوز الخصم
+    # forced_only: إرجاع الحركات الإجبارية وحدها إذا وُجدت، لأن أي حركة أخرى لا تغير النتيجة
+    #   (الفوز الفوري هو الأفضل دائماً، وبدون منع فوز الخصم يخسر صاحب الدور في الحركة التالية)
+    def candidate_moves(self, unique: bool = False, forced_only: bool = False) -> List[int]:
+        size = self.size
+        mask = self.candidate_mask()
+        if unique:
+            moves = [index for index in unique_move_indices(size, self.x_bits, self.o_bits)
+                     if mask >> index & 1]
+        else:
+            moves = []
+            while mask:
+                low = mask & -mask
+                moves.append(low.bit_length() - 1)
+                mask ^= low
+        if self.neighborhood is None:
+            return moves
+
+        own, other = (self.x_bits, self.o_bits) if self.player == Player.X else \
+            (self.o_bits, self.x_bits)
+        wins, blocks, rest = [], [], []
+        for index in moves:
+            bit = 1 << index
+            if has_line_through(own | bit, size, index, self.win_length):
+                wins.append(index)
+            elif has_line_through(other | bit, size, index, self.win_length):
+                blocks.append(index)
+            else:
+                rest.append(index)
+        if forced_only and (wins or blocks):
+            return wins or blocks
+        return wins + blocks + rest
+
+    # تنفيذ حركة في نفس الكائن (دون نسخ) مع حفظها في المكدس للتراجع عنها لاحقاً
+    def make(self, index: int):
+        self.history.append((index, self.hashes, self.score, self.near_bits))
+        if self.neighborhood is not None:
+            self.near_bits |= neighborhood_masks(self.size, self.neighborhood)[index]
+        self.hashes = update_hashes(self.hashes, self.size, self.player, index)
+        self.hash = self.hashes[0]
+        if self.player == Player.X:
+            self.x_bits |= 1 << index
+            digit = 1
+            self.player = Player.O
+        else:
+            self.o_bits |= 1 << index
+            digit = 2
+            self.player = Player.X
+        # تعديل التقييم بالفرق فقط للخطوط المارة بالخلية (قراءة واحدة من الجدول لكل خط)
+        patterns, codes = self.patterns, self.line_codes
+        score = self.score
+        for line, power in cell_line_powers(self.size, self.win_length)[index]:
+            code = codes[line]
+            new_code = code + digit * power
+            score += patterns[new_code] - patterns[code]
+            codes[line] = new_code
+        self.score = score
+
+    # التراجع عن آخر حركة منفذة بـ make وإرجاع رقم خليتها
+    def unmake(self) -> int:
+        index, self.hashes, self.score, self.near_bits = self.history.pop()
+        self.hash = self.hashes[0]
+        if self.player == Player.X:
+            self.o_bits &= ~(1 << index)
+            digit = 2
+            self.player = Player.O
+        else:
+            self.x_bits &= ~(1 << index)
+            digit = 1
+            self.player = Player.X
+        codes = self.line_codes
+        for line, power in cell_line_powers(self.size, self.win_length)[index]:
+            codes[line] -= digit * power
+        return index
 
-    # دالة لتوليد جميع الحركات الممكنة من الحالة الحالية
+    # دالة لتوليد الحركات الممكنة من الحالة الحالية
     # تُستخدم في خوارزمية A* للبحث عن أفضل حركة
-    def get_successors(self) -> List[Tuple['GameState', Move]]:
+    # unique: حذف الحركات المتماثلة (تُستخدم عند الجذر)
+    def get_successors(self, unique: bool = False) -> List[Tuple['GameState', Move]]:
         successors = []
-        # البحث في كل خلية في اللوحة
-        for i in range(self.size):
-            for j in range(self.size):
-                # إذا كانت الخلية فارغة، يمكن اللعب فيها
-                if self.grid[i][j] == Player.EMPTY:
-                    # نسخ اللوحة الحالية لإنشاء حالة جديدة
-                    new_grid = [row.copy() for row in self.grid]
-                    # وضع علامة اللاعب في الموقع المختار
-                    new_grid[i][j] = self.player
-                    # تبديل اللاعب للحركة التالية
-                    next_player = Player.X if self.player == Player.O else Player.O
-                    # إضافة الحالة الجديدة والحركة إلى قائمة الخيارات
-                    successors.append(
-                        (GameState(new_grid, next_player), Move(i, j))
-                    )
+        size = self.size
+        # جميع الخلايا الفارغة، أو الخلايا القريبة من العلامات فقط عند تحديد neighborhood
+        for index in self.candidate_moves(unique):
+            # نسخ الحالة ثم تنفيذ الحركة عليها (يشمل تبديل اللاعب وتحديث التقييم)
+            child = self.copy()
+            child.make(index)
+            child.history.clear()
+            successors.append((child, Move(index // size, index % size)))
         return successors
 
     # التحقق من انتهاء اللعبة
     # تُستخدم لمعرفة ما إذا وصلنا لنهاية المسار في شجرة البحث
     def is_terminal(self) -> bool:
         # اللعبة تنتهي إذا فاز أحد اللاعبين أو امتلأت اللوحة
-        return self.check_winner(Player.X) or self.check_winner(Player.O) or \
-               all(cell != Player.EMPTY for row in self.grid for cell in row)
+        return has_line(self.x_bits, self.size, self.win_length) or \
+               has_line(self.o_bits, self.size, self.win_length) or \
+               (self.x_bits | self.o_bits) == full_mask(self.size)
 
     # التحقق من وجود فائز
     # تُستخدم للتحقق من فوز لاعب معين
+    # إذا كان اللاعب هو من نفذ آخر حركة بـ make يكفي فحص الخطوط المارة بخليتها
     def check_winner(self, player: Player) -> bool:
-        # فحص الصفوف والأعمدة
-        for i in range(self.size):
-            if all(self.grid[i][j] == player for j in range(self.size)) or \
-               all(self.grid[j][i] == player for j in range(self.size)):
-                return True
-
-        # فحص القطرين
-        if all(self.grid[i][i] == player for i in range(self.size)) or \
-           all(self.grid[i][self.size - 1 - i] == player for i in range(self.size)):
-            return True
-        return False
+        bits = self.x_bits if player == Player.X else self.o_bits
+        if self.history and player != self.player:
+            return has_line_through(bits, self.size, self.history[-1][0], self.win_length)
+        return has_line(bits, self.size, self.win_length)
 
     # تقييم الحالة الحالية
     # تُستخدم في خوارزمية A* لتقييم مدى جودة الحالة
@@ -65,4 +243,4 @@ class GameState:
         elif self.check_winner(Player.X):
             return -1.0
         # إذا لم يفز أحد، نُرجع صفر
-        return 0.0
\ No newline at end of file
+        return 0.0
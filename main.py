@@ -1,10 +1,20 @@
+import time
+STARTED = time.perf_counter()  # قبل أي استيراد آخر لقياس زمن بدء التشغيل
 import tkinter as tk
+from startup import StartupTimer
 from game_menu import GameMenu
 
 def main():
+    timer = StartupTimer.from_environment(STARTED)
+    if timer is not None:
+        timer.mark('imports')
     window = tk.Tk()
     game_menu = GameMenu(window)
+    if timer is not None:
+        timer.mark('menu')
+        # الاستدعاءات الخاملة تُنفذ بعد أن ترسم Tk النافذة
+        window.after_idle(timer.first_paint)
     window.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
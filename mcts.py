@@ -0,0 +1,299 @@
+# محرك بحث شجرة مونت كارلو (MCTS) بصيغة UCT للوحات الكبيرة
+# العقد مخزنة في مصفوفات متوازية (array) بدلاً من كائن لكل عقدة: أبناء كل عقدة متجاورون
+# في المصفوفات، والحالة لا تُخزن في العقد بل يُعاد بناؤها بتطبيق الحركات على القناعين أثناء النزول
+# بعد كل حركة تُحفظ الشجرة، وفي البحث التالي يُعاد استخدام الفرع المطابق للوضع الجديد
+import math
+import random
+from array import array
+from typing import List, Optional
+from player import Player
+from move import Move
+from game_state import GameState
+from bitboard import candidate_mask, cell_win_masks, full_mask, has_line_through, neighborhood_masks, \
+    win_table
+from search_budget import SearchBudget
+
+ROLLOUT_POLICIES = ('random', 'greedy')
+X = 1
+O = 2
+# نتيجة العقدة: 0 غير منتهية، 1 فاز X، 2 فاز O، 3 تعادل
+OPEN = 0
+DRAW = 3
+NO_CHILDREN = -1
+
+
+class MCTSSearch:
+    # exploration: ثابت الاستكشاف في UCT
+    # rollout: سياسة المحاكاة ('random' عشوائية، 'greedy' تفوز أو تمنع الفوز الفوري إن أمكن)
+    # max_nodes: الحد الأقصى لحجم الشجرة (بعده تستمر المحاكاة دون توسيع)
+    def __init__(self, exploration: float = 1.4, rollout: str = 'greedy',
+                 max_nodes: int = 1 << 20, seed: Optional[int] = None):
+        if rollout not in ROLLOUT_POLICIES:
+            raise ValueError(f"unknown rollout policy {rollout!r}")
+        self.exploration = exploration
+        self.rollout = rollout
+        self.max_nodes = max_nodes
+        self.random = random.Random(seed)
+        self.playouts = 0
+        self.reused = 0  # عدد زيارات الجذر الموروثة من البحث السابق
+        self._clear()
+
+    def _clear(self):
+        self.size = 0
+        self.win_length = 0
+        self.neighborhood: Optional[int] = None  # حصر التوسيع في جوار العلامات (انظر GameState)
+        self.root_x = self.root_o = 0
+        self.root_near = 0
+        self.parent = array('i')
+        self.move = array('h')        # الخلية التي أدت إلى العقدة
+        self.player = array('b')      # اللاعب الذي نفذ تلك الحركة
+        self.first_child = array('i')
+        self.child_count = array('h')
+        self.result = array('b')
+        self.visits = array('l')
+        self.wins = array('d')        # من وجهة نظر اللاعب الذي نفذ الحركة (التعادل نصف نقطة)
+
+    def _add_node(self, parent: int, move: int, player: int, result: int) -> int:
+        self.parent.append(parent)
+        self.move.append(move)
+        self.player.append(player)
+        self.first_child.append(NO_CHILDREN)
+        self.child_count.append(0)
+        self.result.append(result)
+        self.visits.append(0)
+        self.wins.append(0.0)
+        return len(self.visits) - 1
+
+    # البحث عن أفضل حركة لصاحب الدور ضمن الميزانية (عدد المحاكاة = node_limit)
+    def search(self, state: GameState, budget: SearchBudget) -> Optional[Move]:
+        if not list(state.legal_moves()):
+            return None
+        self._reroot(state)
+        budget.start()
+        self.playouts = 0
+        # محاكاة واحدة على الأقل حتى يُوسَّع الجذر
+        while True:
+            self._playout()
+            self.playouts += 1
+            if budget.expired(self.playouts):
+                break
+
+        # الحركة الأكثر زيارة هي الأكثر موثوقية
+        start, count = self.first_child[0], self.child_count[0]
+        best = max(range(start, start + count), key=lambda child: self.visits[child])
+        return Move(self.move[best] // state.size, self.move[best] % state.size)
+
+    # إعادة استخدام الفرع المطابق للوضع الجديد إن وُجد، وإلا بناء شجرة جديدة
+    def _reroot(self, state: GameState):
+        same_rules = (self.size, self.win_length, self.neighborhood) == \
+            (state.size, state.win_length, state.neighborhood)
+        node = self._find(state) if same_rules and self.visits else None
+        if node is None:
+            self._clear()
+            self.size = state.size
+            self.win_length = state.win_length
+            self.neighborhood = state.neighborhood
+            mover = O if state.player == Player.X else X  # آخر من لعب
+            self._add_node(NO_CHILDREN, -1, mover, OPEN)
+            self.reused = 0
+        elif node != 0:
+            self._compact(node)
+            self.reused = self.visits[0]
+        else:
+            self.reused = self.visits[0]
+        self.root_x, self.root_o = state.x_bits, state.o_bits
+        self.root_near = state.near_bits
+
+    # النزول من الجذر الحالي عبر الحركات التي أضيفت منذ البحث السابق
+    def _find(self, state: GameState) -> Optional[int]:
+        if state.x_bits & self.root_x != self.root_x or state.o_bits & self.root_o != self.root_o:
+            return None
+        added = {X: state.x_bits & ~self.root_x, O: state.o_bits & ~self.root_o}
+        node = 0
+        while added[X] or added[O]:
+            mover = O if self.player[node] == X else X
+            if not added[mover] or self.first_child[node] == NO_CHILDREN:
+                return None
+            cell = (added[mover] & -added[mover]).bit_length() - 1
+            added[mover] &= added[mover] - 1
+            start = self.first_child[node]
+            for child in range(start, start + self.child_count[node]):
+                if self.move[child] == cell:
+                    node = child
+                    break
+            else:
+                return None
+        expected = X if state.player == Player.O else O
+        return node if self.player[node] == expected else None
+
+    # نسخ الفرع إلى مصفوفات جديدة بحيث يصبح جذره العقدة 0 (ترتيب عرضي يحافظ على تجاور الأبناء)
+    def _compact(self, root: int):
+        old = (self.move, self.player, self.first_child, self.child_count, self.result,
+               self.visits, self.wins)
+        old_move, old_player, old_first, old_count, old_result, old_visits, old_wins = old
+        self._clear_arrays()
+        self._add_node(NO_CHILDREN, -1, old_player[root], old_result[root])
+        self.visits[0], self.wins[0] = old_visits[root], old_wins[root]
+        queue: List[int] = [root]
+        new_index = [0]
+        head = 0
+        while head < len(queue):
+            source, target = queue[head], new_index[head]
+            head += 1
+            if old_first[source] == NO_CHILDREN:
+                continue
+            self.first_child[target] = len(self.visits)
+            self.child_count[target] = old_count[source]
+            start = old_first[source]
+            for child in range(start, start + old_count[source]):
+                index = self._add_node(target, old_move[child], old_player[child], old_result[child])
+                self.visits[index], self.wins[index] = old_visits[child], old_wins[child]
+                queue.append(child)
+                new_index.append(index)
+
+    def _clear_arrays(self):
+        size, win_length, neighborhood = self.size, self.win_length, self.neighborhood
+        self._clear()
+        self.size, self.win_length, self.neighborhood = size, win_length, neighborhood
+
+    # محاكاة واحدة: اختيار، توسيع، محاكاة عشوائية، ثم نشر النتيجة للأعلى
+    def _playout(self):
+        x_bits, o_bits, near = self.root_x, self.root_o, self.root_near
+        masks = None if self.neighborhood is None else neighborhood_masks(self.size, self.neighborhood)
+        node = 0
+        first_child, child_count = self.first_child, self.child_count
+        # الاختيار: النزول بـ UCT حتى عقدة غير موسعة أو منتهية
+        while first_child[node] != NO_CHILDREN and self.result[node] == OPEN:
+            node = self._select(node)
+            if self.player[node] == X:
+                x_bits |= 1 << self.move[node]
+            else:
+                o_bits |= 1 << self.move[node]
+            if masks is not None:
+                near |= masks[self.move[node]]
+
+        result = self.result[node]
+        if result == OPEN:
+            # التوسيع بعد أول زيارة للعقدة (الجذر يُوسَّع فوراً)
+            if (self.visits[node] > 0 or node == 0) and len(self.visits) < self.max_nodes:
+                self._expand(node, x_bits, o_bits, near)
+                node = self._select(node)
+                if self.player[node] == X:
+                    x_bits |= 1 << self.move[node]
+                else:
+                    o_bits |= 1 << self.move[node]
+                if masks is not None:
+                    near |= masks[self.move[node]]
+                result = self.result[node]
+            if result == OPEN:
+                mover = O if self.player[node] == X else X
+                result = self._rollout(x_bits, o_bits, mover, near)
+
+        # النشر: كل عقدة تُقيَّم من وجهة نظر اللاعب الذي أدى إليها
+        visits, wins, player, parent = self.visits, self.wins, self.player, self.parent
+        while node != NO_CHILDREN:
+            visits[node] += 1
+            if result == DRAW:
+                wins[node] += 0.5
+            elif result == player[node]:
+                wins[node] += 1.0
+            node = parent[node]
+
+    # اختيار الابن صاحب أعلى قيمة UCT (الأبناء غير المزارين أولاً)
+    def _select(self, node: int) -> int:
+        start = self.first_child[node]
+        visits, wins = self.visits, self.wins
+        scale = self.exploration * math.sqrt(math.log(visits[node] + 1))
+        best, best_value = start, -1.0
+        for child in range(start, start + self.child_count[node]):
+            count = visits[child]
+            if count == 0:
+                return child
+            value = wins[child] / count + scale / math.sqrt(count)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    # الأبناء هم الحركات المرشحة فقط (جميع الخلايا الفارغة ما لم يُحدَّد neighborhood)
+    def _expand(self, node: int, x_bits: int, o_bits: int, near: int):
+        mover = O if self.player[node] == X else X
+        occupied = x_bits | o_bits
+        candidates = candidate_mask(self.size, occupied, near, self.neighborhood)
+        self.first_child[node] = len(self.visits)
+        count = 0
+        for cell in range(self.size * self.size):
+            bit = 1 << cell
+            if not candidates & bit:
+                continue
+            bits = (x_bits if mover == X else o_bits) | bit
+            if has_line_through(bits, self.size, cell, self.win_length):
+                result = mover
+            elif occupied | bit == full_mask(self.size):
+                result = DRAW
+            else:
+                result = OPEN
+            self._add_node(node, cell, mover, result)
+            count += 1
+        self.child_count[node] = count
+
+    # لعب الحركات حتى نهاية اللعبة وفق سياسة المحاكاة، وإرجاع النتيجة
+    # عند تحديد neighborhood تُختار الحركات من جوار العلامات فقط، وهذا لا يفوّت أي فوز فوري
+    # لأن خلية الفوز تجاور دائماً علامة من نفس الخط
+    def _rollout(self, x_bits: int, o_bits: int, mover: int, near: int = 0) -> int:
+        size, win_length = self.size, self.win_length
+        everything = full_mask(size)
+        masks = None if self.neighborhood is None else neighborhood_masks(size, self.neighborhood)
+        empty = [cell for cell in range(size * size) if not (x_bits | o_bits) & (1 << cell)]
+        choice = self.random.randrange
+        greedy = self.rollout == 'greedy'
+        while empty:
+            own, other = (x_bits, o_bits) if mover == X else (o_bits, x_bits)
+            positions = None
+            if masks is not None:
+                positions = [position for position, cell in enumerate(empty) if near >> cell & 1] or None
+            position = None
+            if greedy:
+                position = _winning_position(empty, own, size, win_length, positions)
+                if position is None:
+                    position = _winning_position(empty, other, size, win_length, positions)
+            if position is None:
+                position = choice(len(empty)) if positions is None else positions[choice(len(positions))]
+            cell = empty[position]
+            if masks is not None:
+                near |= masks[cell]
+            empty[position] = empty[-1]
+            empty.pop()
+            own |= 1 << cell
+            if mover == X:
+                x_bits = own
+            else:
+                o_bits = own
+            if has_line_through(own, size, cell, win_length):
+                return mover
+            if (x_bits | o_bits) == everything:
+                break
+            mover = O if mover == X else X
+        return DRAW
+
+    # نسيان الشجرة (مثلاً عند بدء لعبة جديدة)
+    def reset(self):
+        self._clear()
+
+
+# موقع أول خلية فارغة تكمل خطاً للقناع المعطى (positions: المواقع المسموحة فقط، None للجميع)
+# فحص الخطوط المارة بكل خلية مكتوب هنا مباشرة لأن هذه الحلقة أكثر ما يُنفَّذ في المحاكاة
+def _winning_position(empty: List[int], bits: int, size: int, win_length: int,
+                      positions: Optional[List[int]] = None) -> Optional[int]:
+    table = win_table(size, win_length)
+    through = cell_win_masks(size, win_length)
+    for position in range(len(empty)) if positions is None else positions:
+        cell = empty[position]
+        candidate = bits | (1 << cell)
+        if table is not None:
+            if table[candidate]:
+                return position
+            continue
+        for mask in through[cell]:
+            if candidate & mask == mask:
+                return position
+    return None
@@ -0,0 +1,219 @@
+# بحث متوازي على عدة أنوية بأسلوب Lazy SMP
+# كل عملية تبحث في نفس الجذر بمحرك ألفا-بيتا، وتتشارك جميعها جدول تحويلات واحداً
+# محفوظاً في ذاكرة مشتركة (multiprocessing.shared_memory) كمصفوفة مدخلات ثابتة الحجم
+# دون أي نسخ أو تسلسل (pickling) للجدول بين العمليات
+import multiprocessing as mp
+import os
+import queue
+import struct
+import time
+import weakref
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+from player import Player
+from move import Move
+from game_state import GameState
+from alphabeta import AlphaBetaSearch
+from evaluation import state_score
+from search_budget import SearchBudget
+from transposition import EXACT, TableEntry
+
+# أصغر حجم لوحة يستحق البحث المتوازي
+PARALLEL_MIN_SIZE = 4
+# الفترة بين كل فحص لطلب الإلغاء أثناء انتظار النتائج (بالثواني)
+POLL_INTERVAL = 0.05
+# أقصى انتظار لتوقف العمليات بعد الإلغاء
+STOP_TIMEOUT = 2.0
+
+# المدخل: (key ^ value_bits ^ meta، القيمة، meta) = 24 بايت
+# التحقق بـ XOR يكشف المدخلات الممزقة عند الكتابة المتزامنة دون الحاجة لأقفال
+ENTRY = struct.Struct('<QdQ')
+_VALUE_BITS = struct.Struct('<Q')
+_DOUBLE = struct.Struct('<d')
+NO_MOVE = 0xFFFF
+GENERATION_MASK = 0x7FFFFF
+OCCUPIED = 1 << 63  # البت الأعلى يميز المدخل المستخدم عن الذاكرة الفارغة
+MASK_64 = (1 << 64) - 1
+
+
+# ضغط العمق ونوع القيمة والحركة ورقم البحث في عدد واحد بطول 64 بت
+def _pack_meta(depth: int, flag: int, move: Optional[int], generation: int) -> int:
+    move = NO_MOVE if move is None else move
+    return (depth & 0xFFFF) | (flag & 0xFF) << 16 | (move & 0xFFFF) << 24 | \
+        (generation & GENERATION_MASK) << 40 | OCCUPIED
+
+
+def _unpack_meta(meta: int) -> Tuple[int, int, Optional[int], int]:
+    move = (meta >> 24) & 0xFFFF
+    return (meta & 0xFFFF, (meta >> 16) & 0xFF, None if move == NO_MOVE else move,
+            (meta >> 40) & GENERATION_MASK)
+
+
+def _value_bits(value: float) -> int:
+    return _VALUE_BITS.unpack(_DOUBLE.pack(value))[0]
+
+
+class SharedTranspositionTable:
+    # name: اسم الذاكرة المشتركة للانضمام إليها (None لإنشاء جدول جديد)
+    # الواجهة مطابقة لـ TranspositionTable حتى يعمل معها محرك ألفا-بيتا دون تغيير
+    def __init__(self, capacity: int = 1 << 20, name: Optional[str] = None):
+        self.capacity = capacity
+        self.owner = name is None
+        if self.owner:
+            self._memory = shared_memory.SharedMemory(create=True, size=capacity * ENTRY.size)
+            self._memory.buf[:] = bytes(capacity * ENTRY.size)
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+        self.name = self._memory.name
+        self._buffer = self._memory.buf
+        self.generation = 0
+        self.hits = 0
+        self.probes = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        self.probes += 1
+        check, value, meta = ENTRY.unpack_from(self._buffer, (key % self.capacity) * ENTRY.size)
+        if meta == 0 or check ^ _value_bits(value) ^ meta != key:
+            return None
+        self.hits += 1
+        depth, flag, move, generation = _unpack_meta(meta)
+        return TableEntry(key, value, depth, flag, move, generation)
+
+    # نفس سياسة الاستبدال في TranspositionTable: تفضيل العمق الأكبر في البحث الحالي
+    def store(self, key: int, value: float, depth: int, flag: int = EXACT, move: Optional[int] = None):
+        offset = (key % self.capacity) * ENTRY.size
+        check, old_value, old_meta = ENTRY.unpack_from(self._buffer, offset)
+        if old_meta:
+            old_key = check ^ _value_bits(old_value) ^ old_meta
+            old_depth, _, old_move, old_generation = _unpack_meta(old_meta)
+            if old_key != key and old_generation == self.generation & GENERATION_MASK \
+                    and old_depth > depth:
+                return
+            if move is None and old_key == key:
+                move = old_move
+        meta = _pack_meta(depth, flag, move, self.generation)
+        ENTRY.pack_into(self._buffer, offset, (key ^ _value_bits(value) ^ meta) & MASK_64, value, meta)
+
+    def clear(self):
+        self._buffer[:] = bytes(self.capacity * ENTRY.size)
+        self.hits = 0
+        self.probes = 0
+
+    def close(self):
+        self._buffer = None
+        self._memory.close()
+        if self.owner:
+            self._memory.unlink()
+
+
+# حلقة العملية الفرعية: تنضم إلى الجدول المشترك وتنفذ مهام البحث حتى تستلم None
+def _worker_main(table_name: str, capacity: int, tasks, results, stop, worker_id: int):
+    table = SharedTranspositionTable(capacity, table_name)
+    engine = AlphaBetaSearch(table, state_score)
+    engine.use_batch = False  # العمليات الفرعية تبقى خفيفة دون NumPy
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            size, win_length, neighborhood, x_bits, o_bits, player, weights, limits, generation = task
+            table.generation = generation
+            state = GameState.from_bits(size, x_bits, o_bits, Player(player), weights=weights,
+                                        win_length=win_length, neighborhood=neighborhood)
+            budget = SearchBudget(*limits, cancel_event=stop)
+            # العمليات ذات الرقم الفردي تبدأ من عمق أكبر بواحد لتنويع الشجرة (Lazy SMP)
+            move = engine.search(state, budget, start_depth=1 + worker_id % 2)
+            index = None if move is None else move.row * size + move.col
+            results.put((generation, worker_id, engine.completed_depth, engine.value, index,
+                         engine.nodes))
+    finally:
+        table.close()
+
+
+class ParallelSearch:
+    # workers: عدد العمليات (الافتراضي عدد الأنوية)
+    def __init__(self, workers: Optional[int] = None, capacity: int = 1 << 20):
+        self.workers = workers or os.cpu_count() or 1
+        self.table = SharedTranspositionTable(capacity)
+        self.nodes = 0
+        self.completed_depth = 0
+        # spawn آمن مع Tkinter والخيوط لأن العمليات لا ترث حالة النافذة
+        context = mp.get_context('spawn')
+        self._results = context.Queue()
+        self._tasks = [context.Queue() for _ in range(self.workers)]
+        self._stop = context.Event()  # إلغاء البحث الجاري في جميع العمليات
+        self._processes = [
+            context.Process(target=_worker_main,
+                            args=(self.table.name, capacity, self._tasks[i], self._results,
+                                  self._stop, i),
+                            daemon=True)
+            for i in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._finalizer = weakref.finalize(self, _shutdown, self._tasks, self._processes,
+                                           self._stop, self.table)
+
+    # البحث بجميع العمليات ثم اختيار نتيجة العملية التي أكملت أكبر عمق
+    # إلغاء الميزانية يوقف جميع العمليات ويُرجع None
+    def search(self, state: GameState, budget: SearchBudget) -> Optional[Move]:
+        self._stop.clear()
+        self.table.new_search()
+        limits = (budget.time_limit, budget.node_limit, budget.max_depth)
+        task = (state.size, state.win_length, state.neighborhood, state.x_bits, state.o_bits,
+                state.player.value, state.weights, limits, self.table.generation)
+        for tasks in self._tasks:
+            tasks.put(task)
+
+        # مهلة الانتظار: ميزانية الوقت مع هامش لتأخر العمليات
+        deadline = None if budget.time_limit is None else \
+            time.perf_counter() + budget.time_limit + 5.0
+        results = self._collect(lambda: budget.cancelled or
+                                (deadline is not None and time.perf_counter() >= deadline))
+        if budget.cancelled:
+            # العمليات تتوقف خلال بضع مئات من العقد، وننتظرها حتى لا تختلط بالبحث التالي
+            self._stop.set()
+            stop_deadline = time.perf_counter() + STOP_TIMEOUT
+            self._collect(lambda: time.perf_counter() >= stop_deadline, self.workers - len(results))
+            return None
+
+        self.nodes = sum(result[4] for result in results)
+        candidates = [result for result in results if result[3] is not None]
+        if not candidates:
+            return None
+        # الأعمق أولاً، ثم العملية الرئيسية (رقم 0) عند التساوي
+        worker_id, depth, value, index, _ = max(candidates, key=lambda r: (r[1], -r[0]))
+        self.completed_depth = depth
+        return Move(index // state.size, index % state.size)
+
+    # جمع نتائج البحث الحالي حتى تصل من جميع العمليات أو يتحقق شرط التوقف
+    def _collect(self, should_stop,
+                 count: Optional[int] = None) -> List[Tuple[int, int, float, Optional[int], int]]:
+        count = self.workers if count is None else count
+        results: List[Tuple[int, int, float, Optional[int], int]] = []
+        while len(results) < count and not should_stop():
+            try:
+                generation, *result = self._results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if generation == self.table.generation:  # تجاهل النتائج المتأخرة من بحث سابق
+                results.append(tuple(result))
+        return results
+
+    # إيقاف العمليات وتحرير الذاكرة المشتركة
+    def close(self):
+        self._finalizer()
+
+
+def _shutdown(tasks, processes, stop, table: SharedTranspositionTable):
+    stop.set()
+    for task_queue in tasks:
+        task_queue.put(None)
+    for process in processes:
+        process.join(timeout=2.0)
+        if process.is_alive():
+            process.terminate()
+    table.close()
@@ -0,0 +1,145 @@
+# جدول اللعب المثالي للوحة 3×3
+# يتم حل اللعبة بالكامل مرة واحدة (قيمة وأفضل حركة لكل حالة) في خيط خلفي،
+# أو تحميل الجدول من ملف محفوظ، ثم تصبح حركة الكمبيوتر مجرد بحث في قاموس
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from player import Player
+from move import Move
+from game_state import GameState
+from storage import data_path
+from symmetry import unique_move_indices
+from zobrist import ZOBRIST_SEED
+
+# الأحجام التي يتم حلها بالكامل (3×3 فقط: حوالي 5.5 ألف حالة)
+PERFECT_PLAY_SIZES = (3,)
+
+
+class PerfectPlayTable:
+    VERSION = 1
+
+    def __init__(self, size: int = 3):
+        self.size = size
+        self.filename = f'perfect_play_{size}x{size}.json'
+        # المفتاح القانوني للحالة -> (القيمة لصاحب الدور، أفضل حركة بإحداثيات الشكل القانوني)
+        self._entries: Dict[int, Tuple[int, Optional[int]]] = {}
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # هل الجدول جاهز للاستخدام؟
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    # بدء التحميل أو الحل في خيط خلفي (استدعاء متكرر لا يبدأ خيطاً جديداً)
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load_or_build, daemon=True)
+                self._thread.start()
+
+    # انتظار اكتمال الجدول (تُستخدم خارج الواجهة الرسومية)
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self.start()
+        return self._ready.wait(timeout)
+
+    def _load_or_build(self):
+        entries = self._load()
+        if entries is None:
+            entries = self.build()
+            self._save(entries)
+        self._entries = entries
+        self._ready.set()
+
+    # حل اللعبة بالكامل بدءاً من اللوحة الفارغة
+    def build(self) -> Dict[int, Tuple[int, Optional[int]]]:
+        entries: Dict[int, Tuple[int, Optional[int]]] = {}
+        self._solve(GameState.from_bits(self.size, 0, 0, Player.X), entries)
+        return entries
+
+    # خوارزمية Negamax مع حفظ النتائج
+    # القيمة موجبة إذا كان صاحب الدور سيفوز، وكلما كان الفوز أسرع كانت القيمة أكبر
+    def _solve(self, state: GameState, entries: Dict[int, Tuple[int, Optional[int]]]) -> int:
+        key = state.key
+        if key in entries:
+            return entries[key][0]
+
+        empty_count = self.size * self.size - bin(state.x_bits | state.o_bits).count('1')
+        opponent = Player.X if state.player == Player.O else Player.O
+        best_value, best_move = 0, None
+        if state.check_winner(opponent):
+            # اللاعب السابق فاز بالفعل
+            best_value = -(empty_count + 1)
+        elif empty_count > 0:
+            best_value = -(self.size * self.size + 1)
+            for index in unique_move_indices(self.size, state.x_bits, state.o_bits):
+                state.make(index)
+                value = -self._solve(state, entries)
+                state.unmake()
+                if value > best_value:
+                    best_value = value
+                    best_move = state.to_canonical(index)
+
+        entries[key] = (best_value, best_move)
+        return best_value
+
+    # قيمة الحالة لصاحب الدور (None إذا لم يكن الجدول جاهزاً أو الحالة غير معروفة)
+    def value(self, state: GameState) -> Optional[int]:
+        if not self.ready:
+            return None
+        entry = self._entries.get(state.key)
+        return entry[0] if entry is not None else None
+
+    # أفضل حركة للحالة الحالية
+    def best_move(self, state: GameState) -> Optional[Move]:
+        if not self.ready:
+            return None
+        entry = self._entries.get(state.key)
+        if entry is None or entry[1] is None:
+            return None
+        index = state.from_canonical(entry[1])
+        return Move(index // self.size, index % self.size)
+
+    # تحميل الجدول من الملف إذا كان صالحاً لنفس الإصدار ومفاتيح Zobrist
+    def _load(self) -> Optional[Dict[int, Tuple[int, Optional[int]]]]:
+        try:
+            with open(data_path(self.filename), 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != self.VERSION or data.get('seed') != ZOBRIST_SEED or \
+                data.get('size') != self.size:
+            return None
+        return {key: (value, move) for key, value, move in data['entries']}
+
+    # حفظ الجدول على القرص (الفشل في الحفظ لا يمنع استخدام الجدول)
+    # الكتابة في ملف مؤقت ثم استبداله دفعة واحدة، حتى لا يقرأ تشغيل آخر ملفاً نصف مكتوب
+    def _save(self, entries: Dict[int, Tuple[int, Optional[int]]]):
+        data = {
+            'version': self.VERSION,
+            'seed': ZOBRIST_SEED,
+            'size': self.size,
+            'entries': [[key, value, move] for key, (value, move) in entries.items()],
+        }
+        path = data_path(self.filename)
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+
+_tables: Dict[int, PerfectPlayTable] = {}
+
+
+# الحصول على الجدول المشترك لحجم معين (None إذا كان الحجم غير مدعوم)
+def perfect_play_table(size: int) -> Optional[PerfectPlayTable]:
+    if size not in PERFECT_PLAY_SIZES:
+        return None
+    if size not in _tables:
+        _tables[size] = PerfectPlayTable(size)
+    return _tables[size]
@@ -0,0 +1,108 @@
+# التفكير المسبق (pondering): أثناء دور اللاعب يبحث الكمبيوتر في الخلفية عن رده
+# على كل حركة محتملة للاعب، بدءاً بالحركة المتوقعة من جدول التحويلات ثم حسب التقييم
+# عندما يلعب اللاعب فعلاً: إذا كان الرد محسوباً يُرجع فوراً، وإذا كان قيد البحث
+# يكتمل نفس البحث بدلاً من البدء من جديد، وإلا يتوقف التفكير ويبدأ البحث العادي
+import threading
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from player import Player
+from move import Move
+from game_state import GameState
+from background_search import CANCEL_TIMEOUT, SearchTask
+from search_budget import SearchBudget
+from transposition import CLOSED, TranspositionTable
+
+# الفترة بين كل فحص لطلب الإلغاء أثناء انتظار انتهاء التفكير (بالثواني)
+POLL_INTERVAL = 0.05
+
+
+class Ponderer:
+    # search: دالة البحث العادية (الحالة، الميزانية) -> الحركة
+    # budget_factory: تُنشئ ميزانية البحث لكل رد محتمل (نفس ميزانية مستوى الصعوبة)
+    def __init__(self, search: Callable[[GameState, SearchBudget], Optional[Move]],
+                 budget_factory: Callable[[], SearchBudget], table: TranspositionTable):
+        self.search = search
+        self.budget_factory = budget_factory
+        self.table = table
+        # (قناع X، قناع O) بعد حركة اللاعب -> رد الكمبيوتر المحسوب
+        self.replies: Dict[Tuple[int, int], Optional[Move]] = {}
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._task: Optional[SearchTask] = None
+        self._current: Optional[Tuple[int, int]] = None  # الرد الذي يُبحث الآن
+        self._final = False  # التوقف بعد إكمال البحث الحالي
+
+    # بدء التفكير في حالة دور اللاعب (بعد أن لعب الكمبيوتر)
+    def start(self, state: GameState):
+        self.stop()
+        self.replies = {}
+        self._current = None
+        self._final = False
+        self._task = SearchTask(lambda budget: self._run(state, budget), SearchBudget())
+
+    def _run(self, state: GameState, budget: SearchBudget):
+        for index in self._likely_replies(state):
+            child = state.copy()
+            child.make(index)
+            key = (child.x_bits, child.o_bits)
+            with self._lock:
+                if self._final or budget.cancelled:
+                    return
+                self._current = key
+            if child.is_terminal():
+                continue
+            # الميزانية الفرعية تشترك في إشارة الإلغاء مع مهمة التفكير
+            reply_budget = self.budget_factory()
+            reply_budget.cancel_event = budget.cancel_event
+            move = self.search(child, reply_budget)
+            with self._lock:
+                self._current = None
+                if budget.cancelled:
+                    return  # نتيجة بحث غير مكتمل لا تُحفظ
+                self.replies[key] = move
+
+    # ترتيب حركات اللاعب المحتملة: حركة جدول التحويلات أولاً ثم الأفضل للاعب حسب التقييم
+    def _likely_replies(self, state: GameState) -> Iterator[int]:
+        entry = self.table.probe(state.key)
+        predicted = None
+        if entry is not None and entry.flag != CLOSED and entry.move is not None:
+            predicted = state.from_canonical(entry.move)
+            yield predicted
+
+        # التقييم من وجهة نظر O، لذلك القيمة الأصغر أفضل للاعب X
+        sign = 1.0 if state.player == Player.X else -1.0
+        scored = []
+        for index in state.candidate_moves():
+            if index == predicted:
+                continue
+            state.make(index)
+            value = sign * state.score
+            state.unmake()
+            scored.append((value, index))
+        for _, index in sorted(scored):
+            yield index
+
+    # إنهاء التفكير بعد حركة اللاعب الفعلية وإرجاع الرد إذا كان محسوباً
+    # تُستدعى من خيط البحث الخلفي وليس من خيط الواجهة لأنها قد تنتظر اكتمال البحث الحالي
+    def finish(self, x_bits: int, o_bits: int, budget: SearchBudget) -> Optional[Move]:
+        key = (x_bits, o_bits)
+        with self._lock:
+            task = self._task
+            self._final = True
+            if task is not None and self._current != key:
+                task.cancel()  # التخمين خاطئ أو الرد محسوب مسبقاً
+        if task is not None:
+            while not task.wait(POLL_INTERVAL):
+                if budget.cancelled:
+                    task.cancel()
+            self._task = None
+        move = self.replies.get(key)
+        if move is not None:
+            self.hits += 1
+        return move
+
+    # إيقاف التفكير وانتظار توقف الخيط لمدة محدودة (عند بدء لعبة جديدة أو مغادرة اللعبة)
+    # تُرجع False إذا بقي الخيط يعمل، والخيط الملغى لا يحفظ أي رد بعد ذلك
+    def stop(self, timeout: float = CANCEL_TIMEOUT) -> bool:
+        task = self._task
+        self._task = None
+        return task is None or task.stop(timeout)
@@ -0,0 +1,242 @@
+# ذاكرة دائمة لنتائج البحث تبقى بين الجلسات (ملف SQLite في مجلد البيانات)
+# المفتاح: قواعد اللوحة والمفتاح القانوني للحالة والمحرك ومستوى الصعوبة، والقيمة: أفضل حركة
+# بالشكل القانوني مع قيمة البحث وعمقه وإصدار المحركات الذي أنتجها
+# أمام الملف ذاكرة LRU في الذاكرة، والكتابة تتم في خيط خلفي على دفعات، وقراءة الملف لا تنتظر
+# أي قفل: إذا كان الملف مشغولاً تُعامل القراءة كأنها لم تجد شيئاً
+import atexit
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from game_state import GameState
+from storage import data_path
+from zobrist import ZOBRIST_SEED
+
+try:
+    import sqlite3
+except ImportError:  # بعض توزيعات Python لا تتضمن sqlite3، واللعبة تعمل بدون الذاكرة الدائمة
+    sqlite3 = None
+
+# يُرفع عند أي تغيير في المحركات أو التقييم يجعل النتائج القديمة غير صالحة
+ENGINE_VERSION = 1
+CACHE_FILENAME = 'positions.sqlite'
+# عدد المدخلات في ذاكرة LRU
+DEFAULT_MEMORY_ENTRIES = 4096
+# الحد الأقصى لحجم الملف (بالبايت)، وعند تجاوزه تُحذف المدخلات الأقدم استخداماً
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# نسبة المدخلات المحذوفة عند تجاوز الحد
+EVICT_FRACTION = 0.25
+# أكبر عدد من العمليات تُكتب في معاملة واحدة
+WRITE_BATCH = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    size INTEGER NOT NULL,
+    win_length INTEGER NOT NULL,
+    neighborhood INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    engine TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    move INTEGER NOT NULL,
+    value REAL NOT NULL,
+    depth INTEGER NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (size, win_length, neighborhood, key, engine, difficulty)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS positions_used ON positions (used);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+# الإدراج أو الاستبدال: النتيجة الأعمق تبقى، إلا إذا كانت المخزنة من إصدار أقدم
+_UPSERT = """
+INSERT INTO positions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (size, win_length, neighborhood, key, engine, difficulty) DO UPDATE SET
+    version = excluded.version, move = excluded.move, value = excluded.value,
+    depth = excluded.depth, used = excluded.used
+WHERE excluded.depth >= positions.depth OR positions.version != excluded.version
+"""
+
+_TOUCH = """
+UPDATE positions SET used = ?
+WHERE size = ? AND win_length = ? AND neighborhood = ? AND key = ? AND engine = ? AND difficulty = ?
+"""
+
+_SELECT = """
+SELECT move, value, depth FROM positions
+WHERE size = ? AND win_length = ? AND neighborhood = ? AND key = ? AND engine = ? AND difficulty = ?
+    AND version = ?
+"""
+
+
+class CacheEntry(NamedTuple):
+    move: int      # أفضل حركة كرقم خلية في الشكل القانوني للحالة
+    value: float   # قيمة البحث لصاحب الدور (0 للمحركات التي لا تُرجع قيمة)
+    depth: int     # عمق البحث المكتمل (0 للمحركات التي لا تبحث بالعمق)
+
+
+# مفتاح المدخل: القواعد، مفتاح الحالة كعدد صحيح بإشارة (SQLite يخزن 64 بت بإشارة)، المحرك والمستوى
+def _entry_key(state: GameState, engine: str, difficulty: str) -> Tuple:
+    key = state.key
+    if key >= 1 << 63:
+        key -= 1 << 64
+    neighborhood = -1 if state.neighborhood is None else state.neighborhood
+    return state.size, state.win_length, neighborhood, key, engine, difficulty
+
+
+class PositionCache:
+    # path: مسار الملف (None للمسار الافتراضي في مجلد البيانات)
+    def __init__(self, path: Optional[str] = None, memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: 'OrderedDict[Tuple, CacheEntry]' = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._pending: 'queue.Queue' = queue.Queue()
+        # اتصال القراءة مشترك بين الخيوط، ومن يجده مشغولاً لا ينتظره
+        self._reader: Optional['sqlite3.Connection'] = None
+        self._read_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self.available = sqlite3 is not None
+        if self.available:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+    # البحث عن نتيجة سابقة للحالة (None إذا لم توجد)
+    def lookup(self, state: GameState, engine: str, difficulty: str) -> Optional[CacheEntry]:
+        key = _entry_key(state, engine, difficulty)
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            entry = self._read(key)
+            if entry is not None:
+                self._remember(key, entry)
+                self._pending.put((_TOUCH, (time.time(),) + key))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    # حفظ نتيجة بحث: تُضاف إلى الذاكرة فوراً وتُكتب إلى الملف لاحقاً في الخيط الخلفي
+    def store(self, state: GameState, engine: str, difficulty: str, move: int,
+              value: float = 0.0, depth: int = 0):
+        key = _entry_key(state, engine, difficulty)
+        with self._memory_lock:
+            old = self._memory.get(key)
+        if old is not None and old.depth > depth:
+            return
+        entry = CacheEntry(state.to_canonical(move), value, depth)
+        self._remember(key, entry)
+        if self.available:
+            self._pending.put((_UPSERT, key + (ENGINE_VERSION, entry.move, value, depth, time.time())))
+
+    # انتظار كتابة كل ما في الطابور ثم إيقاف الخيط الخلفي
+    def close(self):
+        if self._writer is not None and self._writer.is_alive():
+            self._pending.put(None)
+            self._writer.join()
+        self._writer = None
+
+    def _remember(self, key: Tuple, entry: CacheEntry):
+        with self._memory_lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _connect(self, timeout: float) -> 'sqlite3.Connection':
+        return sqlite3.connect(self.path or data_path(CACHE_FILENAME), timeout=timeout,
+                               check_same_thread=False)
+
+    # القراءة من الملف دون انتظار: أي قفل أو خطأ يُعامل كعدم وجود النتيجة
+    def _read(self, key: Tuple) -> Optional[CacheEntry]:
+        if not self.available or not self._read_lock.acquire(blocking=False):
+            return None
+        try:
+            if self._reader is None:
+                self._reader = self._connect(0.0)
+            row = self._reader.execute(_SELECT, key + (ENGINE_VERSION,)).fetchone()
+        except sqlite3.Error:
+            return None
+        finally:
+            self._read_lock.release()
+        return None if row is None else CacheEntry(*row)
+
+    # خيط الكتابة: يجمع العمليات المنتظرة في معاملة واحدة ثم يتحقق من حجم الملف
+    def _write_loop(self):
+        try:
+            connection = self._connect(5.0)
+            self._prepare(connection)
+        except sqlite3.Error:
+            self.available = False
+            return
+        while True:
+            batch = [self._pending.get()]
+            while batch[-1] is not None and len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            try:
+                with connection:
+                    for statement, parameters in batch:
+                        connection.execute(statement, parameters)
+                self._evict(connection)
+            except sqlite3.Error:
+                pass  # الفشل في الكتابة لا يؤثر على اللعب، والنتائج تبقى في الذاكرة
+            if stop:
+                connection.close()
+                return
+
+    # إنشاء الجداول، وحذف كل المدخلات إذا تغيرت مفاتيح Zobrist
+    @staticmethod
+    def _prepare(connection: 'sqlite3.Connection'):
+        connection.execute('PRAGMA auto_vacuum=INCREMENTAL')  # قبل إنشاء أي جدول
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.executescript(_SCHEMA)
+        row = connection.execute("SELECT value FROM meta WHERE name = 'seed'").fetchone()
+        if row is None or row[0] != ZOBRIST_SEED:
+            with connection:
+                connection.execute('DELETE FROM positions')
+                connection.execute("INSERT OR REPLACE INTO meta VALUES ('seed', ?)", (ZOBRIST_SEED,))
+        with connection:
+            connection.execute('DELETE FROM positions WHERE version != ?', (ENGINE_VERSION,))
+
+    # عند تجاوز حد الحجم تُحذف المدخلات الأقدم استخداماً وتُعاد الصفحات الفارغة للنظام
+    def _evict(self, connection: 'sqlite3.Connection'):
+        page_size = connection.execute('PRAGMA page_size').fetchone()[0]
+        pages = connection.execute('PRAGMA page_count').fetchone()[0]
+        pages -= connection.execute('PRAGMA freelist_count').fetchone()[0]
+        if page_size * pages <= self.max_bytes:
+            return
+        count = connection.execute('SELECT COUNT(*) FROM positions').fetchone()[0]
+        with connection:
+            connection.execute(
+                'DELETE FROM positions WHERE (size, win_length, neighborhood, key, engine, difficulty) '
+                'IN (SELECT size, win_length, neighborhood, key, engine, difficulty FROM positions '
+                'ORDER BY used LIMIT ?)', (max(1, int(count * EVICT_FRACTION)),))
+        connection.execute('PRAGMA incremental_vacuum')
+
+
+_shared: Optional[PositionCache] = None
+_shared_lock = threading.Lock()
+
+
+# الذاكرة المشتركة لجميع لاعبي الكمبيوتر في العملية، تُكتب بقيتها إلى الملف عند الخروج
+def shared_position_cache() -> PositionCache:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = PositionCache()
+            atexit.register(_shared.close)
+        return _shared
@@ -0,0 +1,39 @@
+from enum import Enum
+
+# قواعد اللعبة: حجم اللوحة وعدد العلامات المتتالية المطلوبة للفوز (k في صف)
+# neighborhood: بُعد الحركات التي يدرسها الكمبيوتر عن العلامات الموجودة (None لجميع الخلايا)
+class Rules(Enum):
+    CLASSIC = {
+        'label': '3×3',
+        'size': 3,
+        'win_length': 3,         # The original game: a full row, column or diagonal
+        'neighborhood': None     # The AI considers every empty cell
+    }
+
+    FOUR = {
+        'label': '4×4',
+        'size': 4,
+        'win_length': 4,         # Solved by the 4x4 tablebase when it is built
+        'neighborhood': None
+    }
+
+    FIVE = {
+        'label': '5×5, 4 in a row',
+        'size': 5,
+        'win_length': 4,
+        'neighborhood': None
+    }
+
+    SEVEN = {
+        'label': '7×7, 5 in a row',
+        'size': 7,
+        'win_length': 5,
+        'neighborhood': 2        # Only empty cells within two cells of a mark
+    }
+
+    GOMOKU = {
+        'label': '15×15 Gomoku',
+        'size': 15,
+        'win_length': 5,         # Five in a row anywhere on the board
+        'neighborhood': 2
+    }
@@ -0,0 +1,58 @@
+# ميزانية البحث: حد زمني و/أو حد لعدد العقد و/أو حد للعمق
+# جميع محركات البحث تتحقق منها دورياً وتُرجع أفضل حركة وجدتها عند انتهائها
+# يمكن أيضاً إلغاء البحث من خيط آخر (مثلاً عند بدء لعبة جديدة أو مغادرة اللعبة)
+import threading
+import time
+from typing import Optional
+
+# عدد العقد بين كل فحص للميزانية في المحركات
+CHECK_INTERVAL = 256
+
+
+# استثناء داخلي يُرفع عند انتهاء الميزانية أثناء البحث
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchBudget:
+    def __init__(self, time_limit: Optional[float] = None, node_limit: Optional[int] = None,
+                 max_depth: Optional[int] = None, cancel_event=None):
+        self.time_limit = time_limit  # الحد الزمني بالثواني
+        self.node_limit = node_limit  # الحد الأقصى لعدد العقد
+        self.max_depth = max_depth    # الحد الأقصى لعمق البحث
+        self.deadline: Optional[float] = None
+        # إشارة الإلغاء (threading.Event، أو multiprocessing.Event في العمليات الفرعية)
+        self.cancel_event = cancel_event if cancel_event is not None else threading.Event()
+
+    # إنشاء ميزانية من مستوى صعوبة
+    @classmethod
+    def from_difficulty(cls, difficulty) -> 'SearchBudget':
+        settings = difficulty.value
+        return cls(settings['time_limit'], settings['node_limit'], settings['max_depth'])
+
+    # بدء احتساب الوقت (يُستدعى في بداية كل بحث)
+    def start(self):
+        self.deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+
+    # طلب إيقاف البحث (آمن للاستدعاء من أي خيط)
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    # هل انتهت الميزانية أو أُلغي البحث؟
+    def expired(self, nodes: int) -> bool:
+        if self.cancel_event.is_set():
+            return True
+        if self.node_limit is not None and nodes >= self.node_limit:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    # عدد العقد عند الفحص التالي: بعد CHECK_INTERVAL عقدة، أو عند حد العقد إذا كان أقرب
+    # حتى لا يتجاوز البحث حداً أصغر من فترة الفحص (مثل مستوى EASY)
+    def next_check(self, nodes: int) -> int:
+        if self.node_limit is not None and nodes < self.node_limit:
+            return min(nodes + CHECK_INTERVAL, self.node_limit)
+        return nodes + CHECK_INTERVAL
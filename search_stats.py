@@ -0,0 +1,116 @@
+# إحصاءات كل عملية بحث: عدد العقد، أكبر حجم للقائمة المفتوحة، إصابات جدول التحويلات،
+# زمن كل مرحلة والحركة المختارة
+# تُجمع فقط عند تفعيل القياس (AIPlayer.instrument)، وإلا لا يُنشأ أي كائن ولا يُقاس أي وقت
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from move import Move
+
+# متغير البيئة الذي يحدد ملف السجل (سطر JSON لكل حركة)
+TRACE_ENV = 'TIC_TAC_TOE_TRACE'
+
+
+class SearchStats:
+    # context: 'move' لحركة فعلية أو 'ponder' لبحث أثناء دور اللاعب
+    def __init__(self, engine: str, size: int, player: str, table, context: str = 'move'):
+        self.engine = engine
+        self.context = context
+        self.size = size
+        self.player = player
+        self.source = engine  # مصدر الحركة: جدول اللعب المثالي، قاعدة النتائج أو المحرك
+        self.nodes = 0
+        self.depth = 0  # آخر عمق مكتمل (ألفا-بيتا)
+        self.peak_frontier = 0  # أكبر حجم للقائمة المفتوحة (A*)
+        self.closed = 0  # عدد الحالات المغلقة (A*)
+        self.pruned = 0  # العقد المحذوفة من القائمة المفتوحة عند بلوغ حد الذاكرة (A*)
+        self.peak_bytes = 0  # أكبر ذاكرة تقديرية للقائمة المفتوحة أو مسار IDA* (بالبايت)
+        self.move: Optional[Move] = None
+        self.phases: Dict[str, float] = {}  # اسم المرحلة -> الزمن بالثواني
+        self._table = table
+        self._hits = table.hits
+        self._probes = table.probes
+        self.tt_hits = 0
+        self.tt_probes = 0
+        self.started = time.perf_counter()
+        self._mark = self.started
+        self.elapsed = 0.0
+
+    # إنهاء المرحلة الحالية وتسجيل زمنها
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def finish(self, move: Optional[Move], nodes: int):
+        self.mark('search')
+        self.move = move
+        self.nodes = nodes
+        self.elapsed = time.perf_counter() - self.started
+        self.tt_hits = self._table.hits - self._hits
+        self.tt_probes = self._table.probes - self._probes
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'engine': self.engine,
+            'context': self.context,
+            'source': self.source,
+            'size': self.size,
+            'player': self.player,
+            'move': None if self.move is None else [self.move.row, self.move.col],
+            'nodes': self.nodes,
+            'depth': self.depth,
+            'peak_frontier': self.peak_frontier,
+            'closed': self.closed,
+            'pruned': self.pruned,
+            'peak_bytes': self.peak_bytes,
+            'tt_hits': self.tt_hits,
+            'tt_probes': self.tt_probes,
+            'elapsed': self.elapsed,
+            'nodes_per_second': self.nodes_per_second,
+            'phases': self.phases,
+        }
+
+    # ملخص من عدة أسطر لعرضه في واجهة التصحيح
+    def summary(self) -> str:
+        move = '-' if self.move is None else f'({self.move.row}, {self.move.col})'
+        lines = [
+            f'{self.source}  move {move}  {self.elapsed * 1000:.1f} ms',
+            f'nodes {self.nodes:,}  ({self.nodes_per_second:,.0f}/s)  depth {self.depth}',
+            f'TT {self.tt_hits:,}/{self.tt_probes:,} hits ({self.hit_rate:.0%})',
+        ]
+        if self.engine == 'astar':
+            lines.append(f'open peak {self.peak_frontier:,}  closed {self.closed:,}  '
+                         f'pruned {self.pruned:,}  {self.peak_bytes / 1024:,.0f} KiB')
+        elif self.engine == 'idastar':
+            lines.append(f'path peak {self.peak_frontier}  {self.peak_bytes / 1024:,.1f} KiB')
+        lines.append('  '.join(f'{name} {seconds * 1000:.1f} ms' for name, seconds in self.phases.items()))
+        return '\n'.join(lines)
+
+
+# سجل الحركات بصيغة JSON lines: سطر لكل عملية بحث
+class SearchTrace:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    # إنشاء سجل من متغير البيئة إذا كان محدداً
+    @classmethod
+    def from_environment(cls) -> Optional['SearchTrace']:
+        path = os.environ.get(TRACE_ENV)
+        return cls(path) if path else None
+
+    def write(self, stats: SearchStats):
+        line = json.dumps(stats.to_dict())
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(line + '\n')
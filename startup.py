@@ -0,0 +1,63 @@
+# قياس زمن بدء التشغيل: زمن الاستيراد، بناء القائمة وظهور أول إطار
+# يُفعَّل بمتغير البيئة TIC_TAC_TOE_STARTUP: القيمة 1 تطبع التقرير، وأي قيمة أخرى مسار ملف JSON
+# تُضاف إليه التقارير سطراً لكل تشغيل، حتى يظهر أي تراجع في زمن البدء عند المقارنة
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+STARTUP_ENV = 'TIC_TAC_TOE_STARTUP'
+# وحدات تُحمَّل عند أول استخدام أو في الخلفية بعد ظهور القائمة، ويجب ألا تكون محملة قبل ذلك
+DEFERRED_MODULES = ('ai_game', 'two_player_game', 'ai_player', 'perfect_play', 'numpy', 'webbrowser')
+
+
+class StartupTimer:
+    # started: قيمة time.perf_counter() في أول سطر من البرنامج (قبل أي استيراد)
+    def __init__(self, started: float, output: str):
+        self.started = started
+        self.output = output
+        self.phases: Dict[str, float] = {}  # اسم المرحلة -> الزمن بالثواني
+        self._mark = started
+        self.deferred_loaded = []  # الوحدات المؤجلة التي حُمِّلت قبل ظهور القائمة
+        self.modules = 0
+
+    # إنشاء مؤقت من متغير البيئة إذا كان محدداً
+    @classmethod
+    def from_environment(cls, started: float) -> Optional['StartupTimer']:
+        output = os.environ.get(STARTUP_ENV)
+        return cls(started, output) if output else None
+
+    # إنهاء المرحلة الحالية وتسجيل زمنها
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases[phase] = now - self._mark
+        self._mark = now
+
+    # تُستدعى بعد رسم أول إطار للقائمة
+    def first_paint(self):
+        self.mark('first_paint')
+        self.deferred_loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+        self.modules = len(sys.modules)
+        self.write()
+
+    def to_dict(self) -> Dict:
+        return {
+            'phases': self.phases,
+            'total': self._mark - self.started,
+            'modules': self.modules,
+            'deferred_loaded': self.deferred_loaded,
+        }
+
+    def write(self):
+        report = self.to_dict()
+        if self.output == '1':
+            phases = '  '.join(f'{name} {seconds * 1000:.1f} ms' for name, seconds in self.phases.items())
+            print(f"startup: {phases}  total {report['total'] * 1000:.1f} ms  "
+                  f"{self.modules} modules", file=sys.stderr)
+            if self.deferred_loaded:
+                print(f"startup: loaded before the menu appeared: {', '.join(self.deferred_loaded)}",
+                      file=sys.stderr)
+            return
+        with open(self.output, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(report) + '\n')
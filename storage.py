@@ -0,0 +1,12 @@
+# مسارات الملفات المحفوظة على القرص (الجداول المحسوبة مسبقاً وغيرها)
+import os
+
+# المجلد الافتراضي داخل مجلد المستخدم، ويمكن تغييره بمتغير البيئة TIC_TAC_TOE_DATA
+DATA_DIR = os.environ.get('TIC_TAC_TOE_DATA',
+                          os.path.join(os.path.expanduser('~'), '.tic_tac_toe'))
+
+
+# إرجاع المسار الكامل لملف داخل مجلد البيانات مع إنشاء المجلد إذا لم يكن موجوداً
+def data_path(filename: str) -> str:
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
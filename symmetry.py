@@ -0,0 +1,100 @@
+# تماثلات اللوحة المربعة (الدورانات الأربعة والانعكاسات الأربعة - المجموعة D4)
+# تُستخدم لتحويل كل حالة إلى شكلها القانوني حتى تُعامل الحالات المتماثلة كحالة واحدة
+import operator
+from functools import lru_cache
+from typing import List, Tuple
+from player import Player
+from zobrist import zobrist_keys
+
+
+# توليد التباديل الثمانية لخلايا اللوحة
+# perm[i] هو رقم الخلية التي تنتقل إليها الخلية i بعد التحويل (التحويل الأول هو المطابقة)
+@lru_cache(maxsize=None)
+def symmetries(size: int) -> Tuple[Tuple[int, ...], ...]:
+    last = size - 1
+    mappings = (
+        lambda r, c: (r, c),                # المطابقة
+        lambda r, c: (c, last - r),         # دوران 90 درجة
+        lambda r, c: (last - r, last - c),  # دوران 180 درجة
+        lambda r, c: (last - c, r),         # دوران 270 درجة
+        lambda r, c: (r, last - c),         # انعكاس أفقي
+        lambda r, c: (last - r, c),         # انعكاس رأسي
+        lambda r, c: (c, r),                # انعكاس حول القطر الرئيسي
+        lambda r, c: (last - c, last - r),  # انعكاس حول القطر الثانوي
+    )
+    perms = []
+    for mapping in mappings:
+        perm = []
+        for index in range(size * size):
+            row, col = mapping(index // size, index % size)
+            perm.append(row * size + col)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+# التباديل العكسية لإرجاع الحركات من الشكل القانوني إلى اللوحة الأصلية
+@lru_cache(maxsize=None)
+def inverse_symmetries(size: int) -> Tuple[Tuple[int, ...], ...]:
+    inverses = []
+    for perm in symmetries(size):
+        inverse = [0] * len(perm)
+        for index, target in enumerate(perm):
+            inverse[target] = index
+        inverses.append(tuple(inverse))
+    return tuple(inverses)
+
+
+# تطبيق تحويل على قناع بتات
+def transform_bits(bits: int, perm: Tuple[int, ...]) -> int:
+    result = 0
+    while bits:
+        low = bits & -bits
+        result |= 1 << perm[low.bit_length() - 1]
+        bits ^= low
+    return result
+
+
+# مفاتيح Zobrist لكل حركة تحت التحويلات الثمانية
+# keys[player][index] هو صف من ثمانية مفاتيح، واحد لكل تحويل
+@lru_cache(maxsize=None)
+def symmetric_move_keys(size: int) -> dict:
+    keys = zobrist_keys(size)
+    perms = symmetries(size)
+    return {
+        player: tuple(tuple(keys.move_key(player, perm[index]) for perm in perms)
+                      for index in range(size * size))
+        for player in (Player.X, Player.O)
+    }
+
+
+# حساب تجزئات الحالة تحت التحويلات الثمانية من الصفر
+def symmetric_hashes(size: int, x_bits: int, o_bits: int, player: Player) -> Tuple[int, ...]:
+    keys = zobrist_keys(size)
+    return tuple(keys.hash(transform_bits(x_bits, perm), transform_bits(o_bits, perm), player)
+                 for perm in symmetries(size))
+
+
+# تحديث التجزئات الثمانية بعد وضع لاعب في خلية
+def update_hashes(hashes: Tuple[int, ...], size: int, player: Player, index: int) -> Tuple[int, ...]:
+    return tuple(map(operator.xor, hashes, symmetric_move_keys(size)[player][index]))
+
+
+# التحويلات التي تترك الحالة كما هي (مجموعة التثبيت)
+def stabilizer(size: int, x_bits: int, o_bits: int) -> List[int]:
+    return [t for t, perm in enumerate(symmetries(size))
+            if transform_bits(x_bits, perm) == x_bits and transform_bits(o_bits, perm) == o_bits]
+
+
+# الخلايا الفارغة بعد حذف الحركات المتماثلة (حركة واحدة من كل صنف)
+def unique_move_indices(size: int, x_bits: int, o_bits: int) -> List[int]:
+    perms = symmetries(size)
+    stable = [perms[t] for t in stabilizer(size, x_bits, o_bits) if t != 0]
+    occupied = x_bits | o_bits
+    seen = set()
+    moves = []
+    for index in range(size * size):
+        if occupied & (1 << index) or index in seen:
+            continue
+        moves.append(index)
+        seen.update(perm[index] for perm in stable)
+    return moves
@@ -0,0 +1,236 @@
+# قاعدة نتائج كاملة (tablebase) للوحات الصغيرة مثل 4×4
+# يتم الحل بالتحليل العكسي (retrograde): من اللوحات الممتلئة إلى اللوحة الفارغة طبقة بعد طبقة،
+# وتُخزَّن النتيجة في مصفوفة مسطحة بقيمتين بت لكل حالة، مفهرسة برتبة الحالة في النظام الثلاثي
+# الاستخدام لبناء الملف: python tablebase.py --size 4
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+from player import Player
+from move import Move
+from bitboard import has_line, win_table
+from game_state import GameState
+from storage import data_path
+
+# قيم النتائج من وجهة نظر صاحب الدور (0 يعني حالة غير معروفة أو غير قانونية)
+UNKNOWN = 0
+LOSS = 1
+DRAW = 2
+WIN = 3
+
+MAGIC = b'TTTB'
+VERSION = 1
+HEADER = struct.Struct('<4sBBH')  # المعرّف، الإصدار، الحجم، محجوز
+
+
+# اسم ملف القاعدة لحجم معين
+def tablebase_filename(size: int) -> str:
+    return f'tablebase_{size}x{size}.bin'
+
+
+# جداول تحويل كل 8 خلايا (بايت واحد من القناع) إلى قيمتها في النظام الثلاثي
+# rank = مجموع (رقم الخلية: 1 للاعب X و 2 للاعب O) × 3^index
+@lru_cache(maxsize=None)
+def _ternary_tables(size: int) -> Tuple[Tuple[int, ...], ...]:
+    cells = size * size
+    tables = []
+    for chunk in range(0, cells, 8):
+        table = []
+        for byte in range(256):
+            value = 0
+            for bit in range(8):
+                if byte >> bit & 1 and chunk + bit < cells:
+                    value += 3 ** (chunk + bit)
+            table.append(value)
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+# رتبة الحالة في النظام الثلاثي
+def position_rank(size: int, x_bits: int, o_bits: int) -> int:
+    rank = 0
+    for chunk, table in enumerate(_ternary_tables(size)):
+        shift = chunk * 8
+        rank += table[(x_bits >> shift) & 255] + 2 * table[(o_bits >> shift) & 255]
+    return rank
+
+
+# بناء القاعدة بالتحليل العكسي وإرجاعها كمصفوفة بايتات (4 حالات في كل بايت)
+def build_tablebase(size: int, progress=None) -> bytearray:
+    cells = size * size
+    packed = bytearray((3 ** cells + 3) // 4)
+    powers = [3 ** cell for cell in range(cells)]
+    wins = win_table(size)
+
+    def is_line(bits: int) -> bool:
+        return wins[bits] == 1 if wins is not None else has_line(bits, size)
+
+    # الطبقات من اللوحة الممتلئة إلى الفارغة: نتائج الأبناء تكون محسوبة دائماً قبل الآباء
+    for stones in range(cells, -1, -1):
+        x_count = (stones + 1) // 2
+        o_count = stones // 2
+        x_to_move = stones % 2 == 0
+        digit = 1 if x_to_move else 2
+        started = time.time()
+        layer_size = 0
+
+        for x_cells in combinations(range(cells), x_count):
+            x_bits = 0
+            x_rank = 0
+            for cell in x_cells:
+                x_bits |= 1 << cell
+                x_rank += powers[cell]
+            x_line = is_line(x_bits)
+            free = [cell for cell in range(cells) if not x_bits >> cell & 1]
+
+            for o_cells in combinations(free, o_count):
+                o_bits = 0
+                rank = x_rank
+                for cell in o_cells:
+                    o_bits |= 1 << cell
+                    rank += 2 * powers[cell]
+                layer_size += 1
+
+                mover_line, previous_line = (x_line, is_line(o_bits)) if x_to_move \
+                    else (is_line(o_bits), x_line)
+                if previous_line:
+                    value = LOSS  # اللاعب السابق فاز بالفعل
+                elif mover_line:
+                    continue  # حالة لا يمكن الوصول إليها
+                elif stones == cells:
+                    value = DRAW
+                else:
+                    value = LOSS
+                    empty = ~(x_bits | o_bits)
+                    for cell in range(cells):
+                        if not empty >> cell & 1:
+                            continue
+                        child = rank + digit * powers[cell]
+                        child_value = (packed[child >> 2] >> ((child & 3) << 1)) & 3
+                        if child_value == LOSS:
+                            value = WIN
+                            break
+                        if child_value == DRAW:
+                            value = DRAW
+
+                packed[rank >> 2] |= value << ((rank & 3) << 1)
+
+        if progress:
+            progress(stones, layer_size, time.time() - started)
+    return packed
+
+
+# كتابة القاعدة في ملف ثنائي: رأس صغير ثم البايتات المضغوطة
+def write_tablebase(path: str, size: int, packed: bytearray):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, size, 0))
+        file.write(packed)
+    os.replace(temp_path, path)
+
+
+class Tablebase:
+    # فتح ملف القاعدة عبر mmap: لا توجد تكلفة تحميل، والنظام يقرأ الصفحات عند الحاجة فقط
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"Invalid tablebase file: {path}")
+        magic, version, size, _ = HEADER.unpack_from(self._map, 0)
+        expected = HEADER.size + (3 ** (size * size) + 3) // 4
+        if magic != MAGIC or version != VERSION or len(self._map) != expected:
+            self.close()
+            raise ValueError(f"Invalid tablebase file: {path}")
+        self.size = size
+
+    # نتيجة الحالة لصاحب الدور (WIN / DRAW / LOSS أو UNKNOWN)
+    def probe(self, x_bits: int, o_bits: int) -> int:
+        rank = position_rank(self.size, x_bits, o_bits)
+        return (self._map[HEADER.size + (rank >> 2)] >> ((rank & 3) << 1)) & 3
+
+    def value(self, state: GameState) -> int:
+        return self.probe(state.x_bits, state.o_bits)
+
+    # أفضل حركة: الفوز الفوري أولاً، ثم حركة تترك الخصم في حالة خسارة، ثم التعادل
+    def best_move(self, state: GameState) -> Optional[Move]:
+        size = self.size
+        occupied = state.x_bits | state.o_bits
+        best_index, best_rank = None, -1
+        # ترتيب النتائج للخصم بعد الحركة: خسارته هي الأفضل لنا
+        preference = {LOSS: 3, DRAW: 2, WIN: 1, UNKNOWN: 0}
+        for index in range(size * size):
+            bit = 1 << index
+            if occupied & bit:
+                continue
+            if state.player == Player.X:
+                x_bits, o_bits, mine = state.x_bits | bit, state.o_bits, state.x_bits | bit
+            else:
+                x_bits, o_bits, mine = state.x_bits, state.o_bits | bit, state.o_bits | bit
+            if has_line(mine, size):
+                return Move(index // size, index % size)
+            rank = preference[self.probe(x_bits, o_bits)]
+            if rank > best_rank:
+                best_index, best_rank = index, rank
+        if best_index is None or best_rank == 0:
+            return None
+        return Move(best_index // size, best_index % size)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+# القواعد المفتوحة: الحجم -> (زمن تعديل الملف عند فتحه، القاعدة)
+# فقط الفتح الناجح يُحفظ، فالملف الذي يُبنى أثناء تشغيل اللعبة يُستخدم عند الحركة التالية
+_open_tablebases: Dict[int, Tuple[float, Tablebase]] = {}
+
+
+# فتح قاعدة النتائج لحجم معين إذا كان ملفها موجوداً وصالحاً (None غير ذلك)
+# إذا تغير الملف منذ فتحه (أُعيد بناؤه) يُفتح من جديد
+def open_tablebase(size: int) -> Optional[Tablebase]:
+    path = data_path(tablebase_filename(size))
+    try:
+        modified = os.stat(path).st_mtime
+    except OSError:
+        return None
+    cached = _open_tablebases.get(size)
+    if cached is not None and cached[0] == modified:
+        return cached[1]
+    try:
+        tablebase = Tablebase(path)
+    except (OSError, ValueError):
+        return None
+    _open_tablebases[size] = (modified, tablebase)
+    return tablebase
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Build a retrograde tablebase for small boards")
+    parser.add_argument('--size', type=int, default=4, help="board size (default: 4)")
+    parser.add_argument('--output', help="output file (default: data directory)")
+    args = parser.parse_args(argv)
+
+    path = args.output or data_path(tablebase_filename(args.size))
+
+    def report(stones: int, positions: int, seconds: float):
+        print(f"layer {stones:2d}: {positions:10d} positions in {seconds:7.1f}s", flush=True)
+
+    started = time.time()
+    packed = build_tablebase(args.size, report)
+    write_tablebase(path, args.size, packed)
+    print(f"wrote {path} ({HEADER.size + len(packed)} bytes) in {time.time() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,48 @@
+# اختبارات محرك ألفا-بيتا: الحركات على 3×3 تحافظ على القيمة النظرية، والميزانية تُحترم
+import random
+import pytest
+from player import Player
+from game_state import GameState
+from ai_player import AIPlayer
+from alphabeta import AlphaBetaSearch
+from difficulty import Difficulty
+from search_budget import CHECK_INTERVAL, SearchBudget
+from transposition import TranspositionTable
+
+
+def test_moves_match_oracle(positions_3x3, oracle_3x3):
+    player = AIPlayer(Difficulty.MEDIUM, 'alphabeta')
+    wrong = []
+    for state in positions_3x3:
+        move = player.get_move(state.copy(), SearchBudget())
+        if not oracle_3x3.agrees(state, move.row * 3 + move.col):
+            wrong.append((state.x_bits, state.o_bits, move))
+    assert wrong == []
+
+
+# حد العقد يُحترم حتى إذا كان أصغر من فترة الفحص (مثل مستوى EASY)
+# التقييم الجماعي قد يضيف أبناء عقدة واحدة بعد الحد
+@pytest.mark.parametrize('node_limit', [1, 50, 200, CHECK_INTERVAL + 10])
+def test_node_limit_below_check_interval(node_limit):
+    rng = random.Random(node_limit)
+    for _ in range(5):
+        state = GameState.from_bits(6, 0, 0, Player.X, win_length=4)
+        for _ in range(rng.randrange(2, 8)):
+            state.make(rng.choice(list(state.legal_moves())))
+        state.history.clear()
+        search = AlphaBetaSearch(TranspositionTable(), lambda state: state.score)
+        move = search.search(state, SearchBudget(node_limit=node_limit))
+        assert not (state.x_bits | state.o_bits) >> (move.row * 6 + move.col) & 1
+        assert search.nodes <= node_limit + 6 * 6
+
+
+# الإلغاء من البداية يوقف البحث عند أول فحص ويعيد الحالة كما كانت
+# (التقييم الجماعي قد يضيف أبناء عقدة واحدة بعد الفحص)
+def test_cancelled_search_restores_state():
+    state = GameState.from_bits(5, 0b1, 0b10, Player.X, win_length=4)
+    budget = SearchBudget()
+    budget.cancel()
+    search = AlphaBetaSearch(TranspositionTable(), lambda state: state.score)
+    search.search(state, budget)
+    assert (state.x_bits, state.o_bits, state.player, state.history) == (0b1, 0b10, Player.X, [])
+    assert search.nodes <= CHECK_INTERVAL + 5 * 5
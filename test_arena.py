@@ -0,0 +1,42 @@
+# اختبارات الساحة: مباريات كاملة في عملية فرعية، مع سجل المباريات وبدونه
+import pytest
+from arena import main, run_arena
+from game_record import read_records
+
+
+def _config(size: int, win_length: int, record=None):
+    return {
+        'size': size, 'win_length': win_length, 'neighborhood': 1,
+        'engine_a': 'alphabeta', 'engine_b': 'mcts',
+        'difficulty_a': 'EASY', 'difficulty_b': 'EASY',
+        'time_limit': 0.05, 'node_limit': 200, 'max_depth': 2,
+        'random_plies': 2, 'seed': 1, 'record': record,
+    }
+
+
+# لوحة أكبر من 256 خلية تعمل ما دام السجل غير مطلوب
+def test_large_board_without_record():
+    report = run_arena(_config(17, 3), games=2, workers=1)
+    assert report['games'] == 2
+    for side in ('a', 'b'):
+        assert report[side]['moves'] > 0
+        assert report[side]['wins'] + report[side]['draws'] + report[side]['losses'] == \
+            pytest.approx(1.0)
+
+
+# كل مباراة تُكتب في السجل مرة واحدة بمحركي X و O الصحيحين
+def test_record_holds_every_game(tmp_path):
+    path = str(tmp_path / 'games.bin')
+    report = run_arena(_config(5, 4, path), games=4, workers=1)
+    records = list(read_records(path))
+    assert len(records) == report['games'] == 4
+    assert sorted((record.x_player, record.o_player) for record in records) == \
+        [('alphabeta', 'mcts')] * 2 + [('mcts', 'alphabeta')] * 2
+    assert all(record.size == 5 and record.win_length == 4 and len(record.moves) >= 5
+               for record in records)
+
+
+def test_record_rejected_on_large_board(tmp_path):
+    with pytest.raises(SystemExit):
+        main(['--size', '17', '--record', str(tmp_path / 'games.bin')])
+    assert not (tmp_path / 'games.bin').exists()
@@ -0,0 +1,53 @@
+# اختبارات A* و IDA*: حد ذاكرة القائمة المفتوحة، وذاكرة IDA* المقتصرة على المسار الحالي
+import pytest
+from player import Player
+from game_state import GameState
+from search_budget import SearchBudget
+from difficulty import Difficulty
+from ai_player import AIPlayer, node_bytes
+
+SIZE = 9
+
+
+# موقع في وسط اللعبة على 9×9 (خمسة في صف) دون فوز فوري أو تهديدات
+def _position() -> GameState:
+    cells = [(4, 4), (3, 3), (4, 5), (5, 3), (2, 6), (6, 6)]
+    state = GameState.from_bits(SIZE, 0, 0, Player.X, win_length=5)
+    for row, col in cells:
+        state.make(row * SIZE + col)
+    return GameState.from_bits(SIZE, state.x_bits, state.o_bits, state.player, win_length=5)
+
+
+def _player(engine: str) -> AIPlayer:
+    player = AIPlayer(Difficulty.EASY, engine)
+    player.instrument = True
+    return player
+
+
+# القائمة المفتوحة لا تتجاوز memory_limit، والعقد الزائدة تُحذف بدلاً من ذلك
+@pytest.mark.parametrize('max_open', [16, 64])
+def test_astar_open_set_respects_memory_limit(max_open):
+    player = _player('astar')
+    player.memory_limit = max_open * node_bytes(SIZE)
+    state = _position()
+    move = player.get_move(state, SearchBudget(node_limit=2000))
+    stats = player.last_stats
+    assert move is not None and move.row * SIZE + move.col in state.legal_moves()
+    assert stats.pruned > 0
+    assert 0 < stats.peak_frontier <= max_open
+    assert stats.peak_bytes <= player.memory_limit
+
+
+# ذاكرة IDA* هي المسار فقط: أعمق مسار لا يتجاوز عدد الخلايا الفارغة
+# وحد العقد يُحترم بدقة حتى لو كان أصغر من فترة فحص الميزانية
+@pytest.mark.parametrize('node_limit', [50, 2000])
+def test_idastar_memory_is_bounded_by_path_depth(node_limit):
+    player = _player('idastar')
+    state = _position()
+    empty = SIZE * SIZE - bin(state.x_bits | state.o_bits).count('1')
+    move = player.get_move(state, SearchBudget(node_limit=node_limit))
+    stats = player.last_stats
+    assert move is not None
+    assert 0 < stats.peak_frontier <= empty
+    assert stats.peak_bytes == stats.peak_frontier * node_bytes(SIZE)
+    assert player.nodes <= node_limit
@@ -0,0 +1,71 @@
+# اختبارات التقييم الجماعي: كل لوحة في الدفعة تُقيَّم كما تُقيَّم الحالة الفردية
+import random
+import pytest
+from player import Player
+from game_state import GameState
+
+pytest.importorskip('numpy')
+from batch_eval import encode_states, evaluate_batch, score_children  # noqa: E402
+
+# (حجم اللوحة، طول الفوز)
+VARIANTS = [(3, None), (4, 3), (7, 4), (9, 5), (17, 5)]
+WINNERS = {0: None, 1: Player.X, 2: Player.O}
+
+
+def _random_states(size, win_length, rng, count=40):
+    states = []
+    for _ in range(count):
+        state = GameState.from_bits(size, 0, 0, Player.X, win_length=win_length)
+        for _ in range(rng.randrange(size * size)):
+            if state.is_terminal():
+                break
+            state.make(rng.choice(list(state.legal_moves())))
+        states.append(state)
+    return states
+
+
+def _winner(state: GameState):
+    for player in (Player.X, Player.O):
+        if state.check_winner(player):
+            return player
+    return None
+
+
+@pytest.mark.parametrize('size, win_length', VARIANTS)
+def test_batch_matches_single_states(size, win_length):
+    states = _random_states(size, win_length, random.Random(size))
+    terminal, winners, scores = evaluate_batch(encode_states(states), win_length=win_length)
+    for index, state in enumerate(states):
+        assert bool(terminal[index]) == state.is_terminal()
+        assert WINNERS[int(winners[index])] == _winner(state)
+        assert scores[index] == pytest.approx(state.score)
+
+
+# تقييم الأبناء دفعة واحدة يطابق تنفيذ كل حركة ثم قراءة الحالة
+@pytest.mark.parametrize('size, win_length', VARIANTS)
+def test_children_match_make(size, win_length):
+    for state in _random_states(size, win_length, random.Random(size + 1), count=10):
+        if state.is_terminal():
+            continue
+        indices, terminal, winners, scores = score_children(state)
+        assert indices == list(state.legal_moves())
+        for position, index in enumerate(indices):
+            state.make(index)
+            assert bool(terminal[position]) == state.is_terminal()
+            assert WINNERS[int(winners[position])] == _winner(state)
+            assert scores[position] == pytest.approx(state.score)
+            state.unmake()
+
+
+def test_custom_weights():
+    weights = (0.0, 2.0, 30.0, 400.0)
+    state = GameState.from_bits(5, 0, 0, Player.X, weights=weights, win_length=3)
+    for index in (12, 6, 13, 18):
+        state.make(index)
+    _, _, scores = evaluate_batch(encode_states([state]), weights, 3)
+    assert scores[0] == pytest.approx(state.score)
+    _, _, _, children = score_children(state, [0, 24])
+    for position, index in enumerate((0, 24)):
+        state.make(index)
+        assert children[position] == pytest.approx(state.score)
+        state.unmake()
@@ -0,0 +1,85 @@
+# اختبارات الحركات المرشحة: الخلايا القريبة من العلامات فقط، والحركات الإجبارية أولاً
+import random
+import pytest
+from player import Player
+from game_state import GameState
+from bitboard import has_line_through
+
+# (حجم اللوحة، طول الفوز، الجوار)
+VARIANTS = [(5, 4, 1), (7, 4, 2), (9, 5, 1), (15, 5, 2)]
+
+
+def _random_positions(size, win_length, neighborhood, rng, count=60):
+    positions = []
+    for _ in range(count):
+        state = GameState.from_bits(size, 0, 0, Player.X, win_length=win_length,
+                                    neighborhood=neighborhood)
+        for _ in range(rng.randrange(1, size * size // 2)):
+            state.make(rng.choice(list(state.legal_moves())))
+            if state.is_terminal():
+                break
+        if not state.is_terminal():
+            positions.append(state)
+    return positions
+
+
+# الخلايا الفارغة التي تبعد عن علامة ما مسافة لا تتجاوز الجوار (في الاتجاهين)
+def _expected_mask(state: GameState) -> int:
+    size, distance = state.size, state.neighborhood
+    occupied = state.x_bits | state.o_bits
+    stones = [(index // size, index % size) for index in range(size * size) if occupied >> index & 1]
+    mask = 0
+    for index in range(size * size):
+        row, col = divmod(index, size)
+        if not occupied >> index & 1 and any(abs(row - r) <= distance and abs(col - c) <= distance
+                                               for r, c in stones):
+            mask |= 1 << index
+    return mask
+
+
+def _kind(state: GameState, index: int) -> int:
+    own, other = (state.x_bits, state.o_bits) if state.player == Player.X else \
+        (state.o_bits, state.x_bits)
+    if has_line_through(own | 1 << index, state.size, index, state.win_length):
+        return 0  # فوز فوري
+    if has_line_through(other | 1 << index, state.size, index, state.win_length):
+        return 1  # منع فوز الخصم
+    return 2
+
+
+@pytest.mark.parametrize('size, win_length, neighborhood', VARIANTS)
+def test_mask_is_empty_cells_near_stones(size, win_length, neighborhood):
+    for state in _random_positions(size, win_length, neighborhood, random.Random(size)):
+        assert state.candidate_mask() == _expected_mask(state)
+
+
+# اللوحة الفارغة: خلية المركز، أو الخلايا الأربع الوسطى للحجم الزوجي
+@pytest.mark.parametrize('size, center', [(5, [12]), (6, [14, 15, 20, 21]), (15, [112])])
+def test_empty_board_offers_the_center(size, center):
+    state = GameState.from_bits(size, 0, 0, Player.X, win_length=4, neighborhood=1)
+    assert sorted(state.candidate_moves()) == center
+
+
+# بدون جوار: جميع الخلايا الفارغة بالترتيب
+def test_without_neighborhood_every_empty_cell():
+    state = GameState.from_bits(5, 1 << 12, 1 << 6, Player.X, win_length=4)
+    assert state.candidate_moves() == list(state.legal_moves())
+
+
+# الترتيب: الفوز الفوري ثم منع فوز الخصم ثم باقي الحركات، و forced_only يُرجع أول مجموعة غير فارغة
+@pytest.mark.parametrize('size, win_length, neighborhood', VARIANTS)
+def test_forced_moves_come_first(size, win_length, neighborhood):
+    forced = 0
+    for state in _random_positions(size, win_length, neighborhood, random.Random(size + 1)):
+        moves = state.candidate_moves()
+        mask = state.candidate_mask()
+        assert sorted(moves) == [index for index in range(size * size) if mask >> index & 1]
+        kinds = [_kind(state, index) for index in moves]
+        assert kinds == sorted(kinds)
+        only = state.candidate_moves(forced_only=True)
+        if kinds and kinds[0] < 2:
+            forced += 1
+            assert only == [index for index, kind in zip(moves, kinds) if kind == kinds[0]]
+        else:
+            assert only == moves
+    assert forced > 0
@@ -0,0 +1,68 @@
+# اختبارات سجل المباريات الثنائي: الترميز ثم القراءة يعيد نفس السجلات
+import pytest
+from player import Player
+from game_record import FILE_HEADER, PLAYERS, RECORD, GameRecord, GameRecordWriter, append_game, \
+    read_records
+
+RECORDS = [
+    GameRecord(3, 3, 'human', 'alphabeta', Player.X, bytes([4, 0, 8, 2, 6, 1, 7])),
+    GameRecord(3, 3, 'mcts', 'astar', None, bytes([4, 0, 8, 2, 1, 7, 6, 3, 5])),
+    GameRecord(15, 5, 'idastar', 'parallel', Player.O, bytes([112, 113, 97, 128, 224])),
+    GameRecord(16, 5, 'human', 'human', None, bytes(range(256))),
+    GameRecord(4, 4, 'alphabeta', 'human', Player.O, b''),
+]
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / 'games.bin')
+    with GameRecordWriter(path) as writer:
+        for record in RECORDS:
+            writer.write(record)
+    assert list(read_records(path)) == RECORDS
+
+
+# الإضافة إلى ملف موجود لا تكرر معرّف الصيغة
+def test_append_keeps_a_single_header(tmp_path):
+    path = str(tmp_path / 'games.bin')
+    for record in RECORDS:
+        append_game(record, path)
+    data = (tmp_path / 'games.bin').read_bytes()
+    assert data.startswith(FILE_HEADER)
+    assert data.count(FILE_HEADER) == 1
+    assert len(data) == len(FILE_HEADER) + sum(RECORD.size + len(record.moves) for record in RECORDS)
+    assert list(read_records(path)) == RECORDS
+
+
+# كل لاعب وكل نتيجة تُرمَّز وتُقرأ كما هي
+@pytest.mark.parametrize('name', PLAYERS)
+@pytest.mark.parametrize('winner', [None, Player.X, Player.O])
+def test_every_player_and_result(tmp_path, name, winner):
+    path = str(tmp_path / 'games.bin')
+    record = GameRecord(5, 4, name, PLAYERS[-1], winner, bytes([12, 13]))
+    append_game(record, path)
+    assert list(read_records(path)) == [record]
+
+
+# سجل ناقص في نهاية الملف (انقطاع أثناء الكتابة) يُتجاهل والسجلات السابقة تبقى مقروءة
+def test_truncated_record_is_ignored(tmp_path):
+    path = tmp_path / 'games.bin'
+    with GameRecordWriter(str(path)) as writer:
+        for record in RECORDS[:2]:
+            writer.write(record)
+    complete = path.read_bytes()
+    for cut in (1, RECORD.size, RECORD.size + 3):
+        path.write_bytes(complete + RECORDS[2].encode()[:cut])
+        assert list(read_records(str(path))) == RECORDS[:2]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a record file')
+    with pytest.raises(ValueError):
+        list(read_records(str(path)))
+
+
+# لوحة أكبر من 16×16 لا تتسع خلاياها في بايت واحد
+def test_encode_rejects_large_boards():
+    with pytest.raises(ValueError):
+        GameRecord(17, 5, 'human', 'alphabeta', None, b'').encode()
@@ -0,0 +1,40 @@
+# اختبارات الحالة: التحديث التدريجي مع كل حركة (وعند التراجع عنها) يطابق البناء من الصفر
+import random
+import pytest
+from player import Player
+from game_state import GameState
+
+# (حجم اللوحة، طول الفوز، الجوار)
+VARIANTS = [(3, None, None), (4, 3, None), (5, 4, 1), (7, 4, 2), (9, 5, 1)]
+
+
+def _rebuilt(state: GameState) -> GameState:
+    return GameState.from_bits(state.size, state.x_bits, state.o_bits, state.player,
+                               win_length=state.win_length, neighborhood=state.neighborhood)
+
+
+def _assert_same(state: GameState, expected: GameState):
+    assert (state.x_bits, state.o_bits, state.player) == (expected.x_bits, expected.o_bits, expected.player)
+    assert state.line_codes == expected.line_codes
+    assert state.hashes == expected.hashes
+    assert state.hash == expected.hash
+    assert state.near_bits == expected.near_bits
+    assert state.score == pytest.approx(expected.score)
+
+
+# بعد كل make وكل unmake: رموز الخطوط والتقييم والتجزئات والجوار كما لو بُنيت الحالة من جديد
+@pytest.mark.parametrize('size, win_length, neighborhood', VARIANTS)
+def test_incremental_updates_match_full_rebuild(size, win_length, neighborhood):
+    rng = random.Random(size)
+    for _ in range(5):
+        state = GameState.from_bits(size, 0, 0, Player.X, win_length=win_length,
+                                    neighborhood=neighborhood)
+        snapshots = [_rebuilt(state)]
+        while not state.is_terminal():
+            state.make(rng.choice(list(state.legal_moves())))
+            _assert_same(state, _rebuilt(state))
+            snapshots.append(_rebuilt(state))
+        while state.history:
+            snapshots.pop()
+            state.unmake()
+            _assert_same(state, snapshots[-1])
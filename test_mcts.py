@@ -0,0 +1,25 @@
+# اختبارات MCTS على 3×3: بذرة وميزانية ملف القياس، فالنتيجة ثابتة في كل تشغيل
+from ai_player import AIPlayer
+from difficulty import Difficulty
+from search_budget import SearchBudget
+from benchmark import ENGINE_BUDGET, ENGINE_SEED
+
+
+def test_moves_match_oracle(positions_3x3, oracle_3x3):
+    player = AIPlayer(Difficulty.MEDIUM, 'mcts', seed=ENGINE_SEED)
+    wrong = []
+    for state in positions_3x3:
+        move = player.get_move(state.copy(), SearchBudget(node_limit=ENGINE_BUDGET['node_limit']))
+        if move is None or not oracle_3x3.agrees(state, move.row * 3 + move.col):
+            wrong.append((state.x_bits, state.o_bits, move))
+    assert wrong == []
+
+
+# نفس البذرة تعطي نفس الحركات
+def test_seed_makes_moves_reproducible(positions_3x3):
+    def moves():
+        player = AIPlayer(Difficulty.MEDIUM, 'mcts', seed=ENGINE_SEED)
+        return [player.get_move(state.copy(), SearchBudget(node_limit=300))
+                for state in positions_3x3[::20]]
+
+    assert moves() == moves()
@@ -0,0 +1,60 @@
+# اختبارات البحث المتوازي: حركة قانونية من العمليات الفرعية، والإلغاء يوقف البحث دون حركة
+import threading
+import time
+import pytest
+from player import Player
+from game_state import GameState
+from search_budget import SearchBudget
+from difficulty import Difficulty
+from ai_player import AIPlayer
+from parallel_search import STOP_TIMEOUT, ParallelSearch
+
+
+# موقع مفتوح على 9×9 (خمسة في صف): لا يُحل خلال الوقت، فالبحث بلا حدود يستمر حتى يُلغى
+def _position() -> GameState:
+    state = GameState.from_bits(9, 0, 0, Player.X, win_length=5)
+    for index in (40, 41, 31, 49):
+        state.make(index)
+    return GameState.from_bits(9, state.x_bits, state.o_bits, state.player, win_length=5)
+
+
+@pytest.fixture(scope='module')
+def search():
+    search = ParallelSearch(workers=2, capacity=1 << 12)
+    yield search
+    search.close()
+
+
+def test_returns_legal_move(search):
+    state = _position()
+    move = search.search(state, SearchBudget(time_limit=0.5, max_depth=3))
+    assert move is not None
+    assert move.row * state.size + move.col in state.legal_moves()
+    assert search.nodes > 0 and search.completed_depth > 0
+
+
+# البحث بلا حدود يتوقف عند الإلغاء من خيط آخر ويُرجع None، ثم تعمل العمليات للبحث التالي
+def test_cancel_stops_search(search):
+    state = _position()
+    budget = SearchBudget()
+    threading.Timer(0.3, budget.cancel).start()
+    started = time.perf_counter()
+    assert search.search(state, budget) is None
+    assert time.perf_counter() - started < 0.3 + STOP_TIMEOUT + 1.0
+    assert search.search(state, SearchBudget(time_limit=0.3, max_depth=2)) is not None
+
+
+# اللاعب بالمحرك المتوازي لا يكمل ببحث ألفا-بيتا بعد الإلغاء
+def test_player_returns_none_when_cancelled():
+    player = AIPlayer(Difficulty.EASY, 'parallel')
+    player.parallel_search = ParallelSearch(workers=1, capacity=1 << 12)
+    try:
+        state = _position()
+        assert player.get_move(state, SearchBudget(time_limit=0.5, max_depth=2)) is not None
+        budget = SearchBudget()
+        budget.cancel()
+        assert player.get_move(state, budget) is None
+        assert player.alpha_beta.nodes == 0
+    finally:
+        player.close()
+    assert player.parallel_search is None
@@ -0,0 +1,40 @@
+# اختبارات جدول اللعب المثالي على 3×3: الحل، الحفظ الذري ثم التحميل من الملف
+import storage
+from perfect_play import PerfectPlayTable
+
+
+def _wrong_moves(table, positions, oracle):
+    wrong = []
+    for state in positions:
+        move = table.best_move(state)
+        if move is None or not oracle.agrees(state, move.row * 3 + move.col):
+            wrong.append((state.x_bits, state.o_bits, move))
+    return wrong
+
+
+# الجدول يُحل ويُحفظ في مجلد مؤقت، ثم يُحمَّل الملف المحفوظ في جدول ثانٍ بنفس النتائج
+# قيمة الجدول لصاحب الدور لها نفس إشارة قيمة الـ oracle
+def test_table_matches_oracle(tmp_path, monkeypatch, positions_3x3, oracle_3x3):
+    monkeypatch.setattr(storage, 'DATA_DIR', str(tmp_path))
+    built = PerfectPlayTable(3)
+    assert built.wait(60)
+    assert _wrong_moves(built, positions_3x3, oracle_3x3) == []
+    assert (tmp_path / built.filename).exists()
+    assert not (tmp_path / (built.filename + '.tmp')).exists()
+
+    loaded = PerfectPlayTable(3)
+    assert loaded.wait(60)
+    assert _wrong_moves(loaded, positions_3x3, oracle_3x3) == []
+    for state in positions_3x3:
+        value = loaded.value(state)
+        assert (value > 0) - (value < 0) == oracle_3x3.value(state.grid, state.player)
+
+
+# ملف تالف يُتجاهل ويُعاد حل الجدول وكتابة الملف
+def test_corrupt_file_is_rebuilt(tmp_path, monkeypatch, positions_3x3, oracle_3x3):
+    monkeypatch.setattr(storage, 'DATA_DIR', str(tmp_path))
+    table = PerfectPlayTable(3)
+    (tmp_path / table.filename).write_text('{"version": 1, "entries": [', encoding='utf-8')
+    assert table.wait(60)
+    assert _wrong_moves(table, positions_3x3, oracle_3x3) == []
+    assert PerfectPlayTable(3)._load() is not None
@@ -0,0 +1,104 @@
+# اختبارات الذاكرة الدائمة: حذف الأقدم استخداماً من الذاكرة، والكتابة المؤجلة إلى الملف
+import random
+import sqlite3
+from typing import List
+import pytest
+from player import Player
+from game_state import GameState
+from position_cache import PositionCache, _entry_key
+
+
+# مواقع مختلفة (لا يتماثل أي اثنين منها) مع حركة قانونية لكل منها
+def _positions(count: int, seed: int = 7) -> List[GameState]:
+    rng = random.Random(seed)
+    positions, keys = [], set()
+    while len(positions) < count:
+        state = GameState.from_bits(7, 0, 0, Player.X, win_length=4)
+        for _ in range(rng.randrange(1, 8)):
+            state.make(rng.choice(list(state.legal_moves())))
+        if state.key not in keys and not state.is_terminal():
+            keys.add(state.key)
+            positions.append(GameState.from_bits(7, state.x_bits, state.o_bits, state.player,
+                                                 win_length=4))
+    return positions
+
+
+def _move(state: GameState) -> int:
+    return next(state.legal_moves())
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'positions.sqlite')
+
+
+# الذاكرة تحتفظ بآخر memory_entries مدخلات استُخدمت، والقراءة تجعل المدخل الأحدث استخداماً
+def test_memory_evicts_least_recently_used(path):
+    cache = PositionCache(path, memory_entries=3)
+    try:
+        states = _positions(4)
+        for state in states[:3]:
+            cache.store(state, 'alphabeta', 'HARD', _move(state))
+        assert cache.lookup(states[0], 'alphabeta', 'HARD') is not None
+        cache.store(states[3], 'alphabeta', 'HARD', _move(states[3]))
+        keys = [_entry_key(state, 'alphabeta', 'HARD') for state in states]
+        assert list(cache._memory) == [keys[2], keys[0], keys[3]]
+    finally:
+        cache.close()
+
+
+# الكتابة تتم في الخيط الخلفي، و close() ينتظرها: ذاكرة جديدة على نفس الملف تجد كل النتائج
+def test_write_behind_flushes_on_close(path):
+    states = _positions(300)
+    cache = PositionCache(path, memory_entries=10)
+    for depth, state in enumerate(states):
+        cache.store(state, 'alphabeta', 'HARD', _move(state), value=depth / 10, depth=depth)
+    cache.close()
+
+    reopened = PositionCache(path, memory_entries=10)
+    try:
+        for depth, state in enumerate(states):
+            entry = reopened.lookup(state, 'alphabeta', 'HARD')
+            assert entry is not None
+            assert entry == (state.to_canonical(_move(state)), pytest.approx(depth / 10), depth)
+            assert reopened.lookup(state, 'mcts', 'HARD') is None
+        assert reopened.hits == len(states)
+    finally:
+        reopened.close()
+
+
+# النتيجة الأعمق تبقى: بحث أقل عمقاً لا يستبدلها في الذاكرة ولا في الملف
+def test_shallower_result_is_kept_out(path):
+    state = _positions(1)[0]
+    moves = list(state.legal_moves())
+    cache = PositionCache(path)
+    cache.store(state, 'alphabeta', 'HARD', moves[0], depth=6)
+    cache.store(state, 'alphabeta', 'HARD', moves[1], depth=2)
+    assert cache.lookup(state, 'alphabeta', 'HARD').depth == 6
+    cache.close()
+    reopened = PositionCache(path, memory_entries=1)
+    try:
+        assert reopened.lookup(state, 'alphabeta', 'HARD') == (state.to_canonical(moves[0]), 0.0, 6)
+    finally:
+        reopened.close()
+
+
+# تجاوز حد الحجم يحذف المدخلات الأقدم استخداماً من الملف
+def test_file_size_is_capped(path):
+    states = _positions(3000)
+    cache = PositionCache(path, memory_entries=1, max_bytes=64 * 1024)
+    for state in states:
+        cache.store(state, 'alphabeta', 'HARD', _move(state))
+    cache.close()
+    connection = sqlite3.connect(path)
+    try:
+        count = connection.execute('SELECT COUNT(*) FROM positions').fetchone()[0]
+    finally:
+        connection.close()
+    assert 0 < count < len(states)
+    reopened = PositionCache(path, memory_entries=1)
+    try:
+        assert reopened.lookup(states[-1], 'alphabeta', 'HARD') is not None
+        assert reopened.lookup(states[0], 'alphabeta', 'HARD') is None
+    finally:
+        reopened.close()
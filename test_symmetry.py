@@ -0,0 +1,68 @@
+# اختبارات التماثل: تحويلات اللوحة قابلة للعكس، والمواقع المتماثلة تشترك في المفتاح القانوني
+import random
+import pytest
+from player import Player
+from game_state import GameState
+from symmetry import inverse_symmetries, symmetries, transform_bits, unique_move_indices
+
+# (حجم اللوحة، طول الفوز، الجوار)
+VARIANTS = [(3, None, None), (4, 3, None), (5, 4, 1), (7, 4, 2), (9, 5, 1)]
+
+
+# وضع عشوائي غير منتهٍ
+def _random_position(rng: random.Random, size: int, win_length, neighborhood) -> GameState:
+    state = GameState.from_bits(size, 0, 0, Player.X, win_length=win_length, neighborhood=neighborhood)
+    for _ in range(rng.randrange(size * size)):
+        state.make(rng.choice(list(state.legal_moves())))
+        if state.is_terminal():
+            state.unmake()
+            break
+    return state
+
+
+# كل تحويل يعود إلى اللوحة الأصلية بتطبيق عكسه
+@pytest.mark.parametrize('size', [3, 4, 5, 7])
+def test_symmetry_inverses_round_trip(size):
+    rng = random.Random(size)
+    for perm, inverse in zip(symmetries(size), inverse_symmetries(size)):
+        assert sorted(perm) == list(range(size * size))
+        for _ in range(20):
+            bits = rng.getrandbits(size * size)
+            assert transform_bits(transform_bits(bits, perm), inverse) == bits
+
+
+# تحويل الحركة إلى الشكل القانوني ثم إرجاعها يعطي نفس الخلية، والمواقع المتماثلة تشترك في المفتاح
+@pytest.mark.parametrize('size, win_length, neighborhood', VARIANTS)
+def test_canonical_moves_and_keys(size, win_length, neighborhood):
+    rng = random.Random(size * 7)
+    for _ in range(10):
+        state = _random_position(rng, size, win_length, neighborhood)
+        for index in state.legal_moves():
+            assert state.from_canonical(state.to_canonical(index)) == index
+        for perm in symmetries(size):
+            image = GameState.from_bits(size, transform_bits(state.x_bits, perm),
+                                        transform_bits(state.o_bits, perm), state.player,
+                                        win_length=win_length, neighborhood=neighborhood)
+            assert image.key == state.key
+            assert sorted(image.hashes) == sorted(state.hashes)
+            assert image.score == pytest.approx(state.score)
+
+
+# الحركات الفريدة تغطي كل الحركات الممكنة، ولا تتكرر فيها حالتان متماثلتان
+@pytest.mark.parametrize('size', [3, 4, 5])
+def test_unique_moves_cover_every_move_once(size):
+    rng = random.Random(size * 11)
+    for _ in range(20):
+        state = _random_position(rng, size, None, None)
+        child_keys = set()
+        for index in state.legal_moves():
+            state.make(index)
+            child_keys.add(state.key)
+            state.unmake()
+        unique_keys = []
+        for index in unique_move_indices(size, state.x_bits, state.o_bits):
+            state.make(index)
+            unique_keys.append(state.key)
+            state.unmake()
+        assert len(unique_keys) == len(set(unique_keys))
+        assert set(unique_keys) == child_keys
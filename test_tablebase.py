@@ -0,0 +1,58 @@
+# اختبارات قاعدة النتائج على 3×3: القيم وأفضل الحركات مقارنة بالـ oracle، ثم الفتح من الملف عبر mmap
+import os
+import pytest
+import storage
+import tablebase
+from tablebase import DRAW, LOSS, WIN, Tablebase, build_tablebase, open_tablebase, \
+    tablebase_filename, write_tablebase
+
+SIGN = {WIN: 1, DRAW: 0, LOSS: -1}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(tablebase, '_open_tablebases', {})
+    return tmp_path
+
+
+def test_values_and_moves_match_oracle(data_dir, positions_3x3, oracle_3x3):
+    path = str(data_dir / tablebase_filename(3))
+    write_tablebase(path, 3, build_tablebase(3))
+    assert not os.path.exists(path + '.tmp')
+    table = Tablebase(path)
+    try:
+        for state in positions_3x3:
+            assert SIGN[table.value(state)] == oracle_3x3.value(state.grid, state.player)
+            move = table.best_move(state)
+            assert move is not None and oracle_3x3.agrees(state, move.row * 3 + move.col)
+    finally:
+        table.close()
+
+
+# لا ملف: None، والقاعدة المفتوحة تُعاد كما هي ما دام الملف لم يتغير
+# وبعد إعادة بناء الملف تُفتح من جديد، والملف التالف لا يُحفظ ولا يُرجَع
+def test_open_tablebase_reloads_changed_file(data_dir, positions_3x3):
+    assert open_tablebase(3) is None
+    path = str(data_dir / tablebase_filename(3))
+    packed = build_tablebase(3)
+    write_tablebase(path, 3, packed)
+    first = open_tablebase(3)
+    assert first is not None
+    assert open_tablebase(3) is first
+
+    write_tablebase(path, 3, packed)
+    modified = os.stat(path).st_mtime + 10
+    os.utime(path, (modified, modified))
+    second = open_tablebase(3)
+    assert second is not None and second is not first
+    state = positions_3x3[0]
+    assert second.value(state) == first.value(state)
+
+    with open(path, 'wb') as file:
+        file.write(b'TTTB')
+    os.utime(path, (modified + 10, modified + 10))
+    assert open_tablebase(3) is None
+    assert open_tablebase(3) is None
+    first.close()
+    second.close()
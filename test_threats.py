@@ -0,0 +1,94 @@
+# اختبارات بحث التهديدات: كل سلسلة فوز (VCF) يُرجعها ThreatSearch يجب أن تكون قابلة للعب فعلاً
+# كل حركة للمهاجم تترك للمدافع خلية وحيدة يجب سدها، والسلسلة تنتهي بفوز أو بتهديد مزدوج
+import random
+from typing import List
+import pytest
+from player import Player
+from game_state import GameState
+from bitboard import has_line_through
+from threats import ThreatSearch
+
+# (حجم اللوحة، طول الفوز)
+VARIANTS = [(5, 4), (7, 4), (9, 5)]
+
+
+# الخلايا التي يفوز فيها اللاعب بحركة واحدة
+def _winning_cells(state: GameState, player: Player) -> List[int]:
+    bits = state.x_bits if player == Player.X else state.o_bits
+    return [index for index in state.legal_moves()
+            if has_line_through(bits | 1 << index, state.size, index, state.win_length)]
+
+
+def _assert_valid_line(state: GameState, line: List[int]):
+    attacker = state.player
+    defender = Player.O if attacker == Player.X else Player.X
+    # الفوز الفوري يُلعب مباشرة، وإلا فأول حركة تسد فوز الخصم الوحيد إن وُجد
+    if _winning_cells(state, attacker):
+        assert line[0] in _winning_cells(state, attacker) and len(line) == 1
+    else:
+        blocks = _winning_cells(state, defender)
+        assert len(blocks) <= 1 and (not blocks or line[0] in blocks)
+    for position, index in enumerate(line):
+        assert not (state.x_bits | state.o_bits) >> index & 1
+        if position % 2:
+            state.make(index)
+            # رد المدافع قد يصنع له تهديداً، فحركة المهاجم التالية يجب أن تسده
+            blocks = _winning_cells(state, defender)
+            assert len(blocks) <= 1
+            if blocks and position + 1 < len(line):
+                assert line[position + 1] in blocks
+            continue
+        state.make(index)
+        if position == len(line) - 1:
+            # نهاية السلسلة: فوز، أو تهديدان لا يمكن سدهما والمدافع لا يفوز قبل ذلك
+            won = state.check_winner(attacker)
+            assert won or (len(_winning_cells(state, attacker)) >= 2
+                           and not _winning_cells(state, defender))
+        else:
+            # التهديد يجبر المدافع على خلية واحدة، ولا يملك المدافع فوزاً فورياً بدلاً منها
+            assert _winning_cells(state, attacker) == [line[position + 1]]
+            assert not _winning_cells(state, defender)
+    for _ in line:
+        state.unmake()
+
+
+@pytest.mark.parametrize('size, win_length', VARIANTS)
+def test_vcf_lines_are_playable(size, win_length):
+    rng = random.Random(size * 31 + win_length)
+    search = ThreatSearch()
+    chains = 0
+    for _ in range(300):
+        state = GameState.from_bits(size, 0, 0, Player.X, win_length=win_length)
+        for _ in range(rng.randrange(4, size * size // 2)):
+            state.make(rng.choice(list(state.legal_moves())))
+            if state.is_terminal():
+                break
+        if state.is_terminal():
+            continue
+        state.history.clear()
+        x_bits, o_bits = state.x_bits, state.o_bits
+        forced = search.forced_moves(state)
+        assert (state.x_bits, state.o_bits) == (x_bits, o_bits)
+        if search.line is None:
+            continue
+        assert forced == search.line[:1]
+        _assert_valid_line(state, search.line)
+        chains += len(search.line) > 1
+    assert chains > 0
+
+
+# موقع مبني يدوياً على 7×7 (أربعة في صف): لـ O علامتان في الصف 3 وعلامتان في العمود 3
+# تلتقيان عند الخلية (3، 3)، ولا يملك فوزاً فورياً لكن التهديدات تفوز
+def test_vcf_found_in_known_position():
+    size = 7
+
+    def bits(cells):
+        return sum(1 << (row * size + col) for row, col in cells)
+
+    state = GameState.from_bits(size, bits([(0, 0), (6, 6), (0, 6), (6, 0)]),
+                                bits([(3, 1), (3, 2), (2, 3), (1, 3)]), Player.O, win_length=4)
+    assert not _winning_cells(state, Player.O)
+    search = ThreatSearch()
+    assert search.forced_moves(state) is not None
+    assert search.line is not None
+    _assert_valid_line(state, search.line)
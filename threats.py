@@ -0,0 +1,187 @@
+# بحث فضاء التهديدات: الفوز الإجباري بسلسلة تهديدات متتالية (VCF)
+# التهديد نافذة فوز فيها علامات لاعب واحد عدا خلية فارغة واحدة: على الخصم سدها فوراً وإلا خسر
+# المهاجم يجرب فقط الحركات التي تصنع تهديداً، ورد المدافع محدد بخلية واحدة،
+# لذلك تبلغ السلسلة أعماقاً لا يصلها البحث بكامل العرض على اللوحات الكبيرة
+# المحركات تستدعيه قبل البحث: الفوز الإجباري يُلعب مباشرة، وإذا كان للخصم فوز إجباري
+# تُحصر الحركات في التي تمنعه
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from player import Player
+from game_state import GameState
+from bitboard import cell_line_powers, full_mask, win_masks
+from evaluation import pattern_scores
+from search_budget import CHECK_INTERVAL, SearchBudget, SearchTimeout
+
+# أصغر حجم لوحة يُستخدم عنده البحث (اللوحات الأصغر يحسمها ألفا-بيتا والجداول المحلولة)
+THREAT_MIN_SIZE = 7
+# الحد الأقصى لعدد العقد في بحث واحد (الفوز والدفاع معاً)
+DEFAULT_NODE_LIMIT = 20000
+# الحد الأقصى لعدد تهديدات المهاجم في السلسلة
+DEFAULT_MAX_DEPTH = 20
+# نسبة الحد الزمني للحركة المخصصة لبحث التهديدات، والباقي للمحرك
+TIME_SHARE = 0.25
+
+
+# عدد علامات اللاعب في كل نافذة من جدول الأنماط بأوزان تساوي العدد نفسه:
+# القيمة موجبة لعلامات O وحدها، سالبة لعلامات X وحدها، وصفر للنافذة المختلطة أو الفارغة
+@lru_cache(maxsize=None)
+def line_counts(win_length: int) -> Sequence[float]:
+    return pattern_scores(win_length, win_length, tuple(float(count) for count in range(win_length + 1)))
+
+
+def _cells(mask: int) -> List[int]:
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+class ThreatSearch:
+    def __init__(self, node_limit: int = DEFAULT_NODE_LIMIT, max_depth: int = DEFAULT_MAX_DEPTH):
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.nodes = 0
+        self.line: Optional[List[int]] = None  # آخر سلسلة فوز وُجدت (حركات الطرفين بالتناوب)
+        # المواقع التي ثبت عدم وجود فوز فيها: (القناعان، صاحب الدور) -> أكبر عمق تم فحصه
+        self._failed: Dict[Tuple[int, int, Player], int] = {}
+        self._budget: Optional[SearchBudget] = None
+        self._deadline: Optional[float] = None
+        self._next_check = CHECK_INTERVAL
+
+    # الحركات الإجبارية لصاحب الدور:
+    # [أول حركة في سلسلة فوز]، أو الحركات التي تمنع سلسلة فوز الخصم (قد تكون قائمة فارغة إذا
+    # لم تمنعها أي حركة)، أو None إذا لم يوجد فوز إجباري لأي طرف أو انتهت الميزانية قبل الحسم
+    # الحالة تعود كما كانت عند الانتهاء
+    def forced_moves(self, state: GameState, budget: Optional[SearchBudget] = None) -> Optional[List[int]]:
+        self.nodes = 0
+        self.line = None
+        self._failed.clear()
+        self._budget = budget
+        self._deadline = None
+        if budget is not None and budget.time_limit is not None:
+            self._deadline = time.perf_counter() + budget.time_limit * TIME_SHARE
+        self._next_check = min(CHECK_INTERVAL, self.node_limit)
+        if state.win_length < 3 or state.is_terminal():
+            return None
+
+        base = len(state.history)
+        try:
+            line = self._attack(state, self.max_depth)
+            if line is not None:
+                self.line = line
+                return line[:1]
+            return self._defenses(state)
+        except SearchTimeout:
+            # إرجاع الحالة إلى الجذر بعد الخروج المفاجئ من العمق
+            while len(state.history) > base:
+                state.unmake()
+            return None
+
+    # الحركات التي لا يبقى بعدها فوز إجباري للخصم، أو None إذا لم يكن له فوز إجباري أصلاً
+    def _defenses(self, state: GameState) -> Optional[List[int]]:
+        opponent = Player.X if state.player == Player.O else Player.O
+        # نفس اللوحة والخصم صاحب الدور، كأن اللاعب تنازل عن حركته
+        passed = GameState.from_bits(state.size, state.x_bits, state.o_bits, opponent,
+                                     weights=state.weights, win_length=state.win_length,
+                                     neighborhood=state.neighborhood)
+        if self._attack(passed, self.max_depth) is None:
+            return None
+        defenses = []
+        for index in state.candidate_moves():
+            state.make(index)
+            refuted = self._attack(state, self.max_depth) is None
+            state.unmake()
+            if refuted:
+                defenses.append(index)
+        return defenses
+
+    # البحث عن سلسلة فوز لصاحب الدور
+    # تُرجع حركات السلسلة (المهاجم ثم رد المدافع بالتناوب) أو None
+    def _attack(self, state: GameState, depth: int) -> Optional[List[int]]:
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            # حد العقد يُفحص عند بلوغه تماماً حتى إذا كان أصغر من فترة الفحص
+            self._next_check = min(self.nodes + CHECK_INTERVAL, self.node_limit)
+            if self._expired():
+                raise SearchTimeout()
+
+        sign = 1 if state.player == Player.O else -1
+        wins, blocks, makers = self._scan(state, sign)
+        if wins:
+            return [_cells(wins)[0]]
+        if depth <= 0 or blocks & (blocks - 1):
+            # لا يمكن سد تهديدين للخصم بحركة واحدة
+            return None
+        key = (state.x_bits, state.o_bits, state.player)
+        if self._failed.get(key, -1) >= depth:
+            return None
+
+        # الخلايا التي تصنع أكثر من تهديد أولاً (غالباً تهديد مزدوج يحسم السلسلة)
+        candidates = sorted(makers, key=makers.get, reverse=True)
+        if blocks:
+            # على المهاجم سد تهديد الخصم، ويستمر فقط إذا صنع بذلك تهديداً جديداً
+            candidates = [index for index in candidates if blocks >> index & 1]
+        for index in candidates:
+            state.make(index)
+            threats = self._threats_through(state, index, sign)
+            line = None
+            if threats & (threats - 1):
+                # تهديدان في خليتين مختلفتين: المدافع لا يستطيع سد الاثنين
+                line = [index]
+            else:
+                reply = threats.bit_length() - 1
+                state.make(reply)
+                rest = self._attack(state, depth - 1)
+                state.unmake()
+                if rest is not None:
+                    line = [index, reply] + rest
+            state.unmake()
+            if line is not None:
+                return line
+        self._failed[key] = depth
+        return None
+
+    # مسح نوافذ الفوز من رموز الخطوط المحفوظة في الحالة
+    # sign: 1 إذا كان المهاجم O و -1 إذا كان X
+    # تُرجع (قناع خلايا فوز المهاجم، قناع خلايا فوز المدافع، خلية -> عدد التهديدات التي تصنعها)
+    def _scan(self, state: GameState, sign: int) -> Tuple[int, int, Dict[int, int]]:
+        win_length = state.win_length
+        counts = line_counts(win_length)
+        masks = win_masks(state.size, win_length)
+        empty = ~(state.x_bits | state.o_bits) & full_mask(state.size)
+        threshold = win_length - 2
+        wins = blocks = 0
+        makers: Dict[int, int] = {}
+        for line in [line for line, code in enumerate(state.line_codes)
+                     if abs(counts[code]) >= threshold]:
+            value = counts[state.line_codes[line]] * sign
+            if value == win_length - 1:
+                wins |= masks[line] & empty
+            elif value == -(win_length - 1):
+                blocks |= masks[line] & empty
+            elif value == threshold:
+                for index in _cells(masks[line] & empty):
+                    makers[index] = makers.get(index, 0) + 1
+        return wins, blocks, makers
+
+    # خلايا فوز المهاجم في النوافذ المارة بالخلية التي لعبها للتو
+    def _threats_through(self, state: GameState, index: int, sign: int) -> int:
+        win_length = state.win_length
+        counts = line_counts(win_length)
+        masks = win_masks(state.size, win_length)
+        empty = ~(state.x_bits | state.o_bits) & full_mask(state.size)
+        threats = 0
+        for line, _ in cell_line_powers(state.size, win_length)[index]:
+            if counts[state.line_codes[line]] * sign == win_length - 1:
+                threats |= masks[line] & empty
+        return threats
+
+    def _expired(self) -> bool:
+        if self.nodes >= self.node_limit:
+            return True
+        if self._budget is not None and self._budget.cancelled:
+            return True
+        return self._deadline is not None and time.perf_counter() >= self._deadline
@@ -0,0 +1,58 @@
+# جدول التحويلات (Transposition Table) المشترك بين محركات البحث
+# جدول بحجم ثابت مفهرس بتجزئة Zobrist، مع سياسة استبدال تفضّل العمق الأكبر
+from typing import List, NamedTuple, Optional
+
+# أنواع القيم المخزنة
+EXACT = 0        # قيمة دقيقة
+LOWER_BOUND = 1  # القيمة الحقيقية أكبر من أو تساوي المخزنة
+UPPER_BOUND = 2  # القيمة الحقيقية أصغر من أو تساوي المخزنة
+CLOSED = 3       # علامة زيارة فقط دون قيمة بحث (تستخدمها خوارزمية A*)
+
+
+class TableEntry(NamedTuple):
+    key: int                # تجزئة الحالة الكاملة للتحقق من التصادم
+    value: float            # قيمة الحالة
+    depth: int              # عمق البحث الذي أنتج القيمة
+    flag: int               # نوع القيمة (EXACT / LOWER_BOUND / UPPER_BOUND / CLOSED)
+    move: Optional[int]     # أفضل حركة كرقم خلية
+    generation: int         # رقم البحث الذي خزّن المدخل
+
+
+class TranspositionTable:
+    def __init__(self, capacity: int = 1 << 18):
+        self.capacity = capacity
+        self.generation = 0
+        self.hits = 0
+        self.probes = 0
+        self._slots: List[Optional[TableEntry]] = [None] * capacity
+
+    # بدء بحث جديد: المدخلات القديمة تصبح قابلة للاستبدال أولاً
+    def new_search(self):
+        self.generation += 1
+
+    # البحث عن حالة في الجدول
+    def probe(self, key: int) -> Optional[TableEntry]:
+        self.probes += 1
+        entry = self._slots[key % self.capacity]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    # تخزين نتيجة في الجدول
+    # يتم الاستبدال إذا كان المكان فارغاً، أو لنفس الحالة، أو من بحث سابق، أو بعمق أكبر أو مساوٍ
+    def store(self, key: int, value: float, depth: int, flag: int = EXACT, move: Optional[int] = None):
+        index = key % self.capacity
+        old = self._slots[index]
+        if old is not None and old.key != key and old.generation == self.generation \
+                and old.depth > depth:
+            return
+        if move is None and old is not None and old.key == key:
+            move = old.move  # الاحتفاظ بأفضل حركة معروفة
+        self._slots[index] = TableEntry(key, value, depth, flag, move, self.generation)
+
+    # تفريغ الجدول بالكامل
+    def clear(self):
+        self._slots = [None] * self.capacity
+        self.hits = 0
+        self.probes = 0
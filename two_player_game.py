@@ -5,12 +5,13 @@ from base_game_gui import BaseGameGUI
 from player import Player
 from move import Move
 from theme import Theme
+from rules import Rules
 
 class TwoPlayerGame(BaseGameGUI):
     # تهيئة اللعبة لاعبين
-    def __init__(self, window: tk.Tk, theme: Theme):
+    def __init__(self, window: tk.Tk, theme: Theme, rules: Rules = Rules.CLASSIC):
         # استدعاء المُنشئ الأساسي للواجهة الرسومية
-        super().__init__(window, theme)
+        super().__init__(window, theme, rules)
         # إنشاء الواجهة الرسومية مع عنوان مناسب
         self.create_base_gui("Tic Tac Toe - 2 Players")
         # متغير للرجوع للقائمة الرئيسية
@@ -19,7 +20,7 @@ class TwoPlayerGame(BaseGameGUI):
     # معالجة النقر على أحد المربعات في اللوحة
     def _handle_move(self, row: int, col: int):
         # التحقق من أن المربع فارغ
-        if self.board.grid[row][col] == Player.EMPTY:
+        if self.board.cell(row, col) == Player.EMPTY:
             # إنشاء حركة جديدة وتنفيذها
             move = Move(row, col)
             self._make_move(move)
@@ -28,13 +29,8 @@ class TwoPlayerGame(BaseGameGUI):
     def _make_move(self, move: Move):
         # محاولة تنفيذ الحركة على اللوحة
         if self.board.make_move(move, self.current_player):
-            # الحصول على الزر المقابل للحركة
-            button = self.buttons[move.row][move.col]
             # تحديث شكل الزر بعلامة اللاعب ولونه
-            button.configure(
-                text=self.current_player.value,
-                fg=self.current_theme.value['x_color' if self.current_player == Player.X else 'o_color']
-            )
+            self._set_cell(move.row, move.col, self.current_player)
 
             # إذا لم تنته اللعبة، تبديل دور اللاعب
             if not self._check_game_end():
@@ -47,12 +43,14 @@ class TwoPlayerGame(BaseGameGUI):
         if self.board.check_winner(self.current_player):
             # تحديث النتائج وإظهار رسالة الفوز
             self.update_scores(self.current_player)
+            self.record_game(self.current_player)
             messagebox.showinfo("Game Over", f"Player {self.current_player.value} wins!")
             self.reset_board()
             return True
 
         # التحقق من تعادل (امتلاء اللوحة)
         if self.board.is_full():
+            self.record_game(None)
             messagebox.showinfo("Game Over", "It's a tie!")
             self.reset_board()
             return True
@@ -0,0 +1,40 @@
+# مفاتيح Zobrist لتجزئة حالات اللعبة
+# لكل خلية ولكل لاعب رقم عشوائي بطول 64 بت، وتجزئة الحالة هي XOR لمفاتيح الخلايا المشغولة
+# المولد العشوائي ثابت البذرة حتى تكون المفاتيح متطابقة بين الجلسات والعمليات المختلفة
+import random
+from functools import lru_cache
+from typing import Tuple
+from player import Player
+
+ZOBRIST_SEED = 0x7A1C7AC
+
+
+class ZobristKeys:
+    def __init__(self, size: int):
+        rng = random.Random(ZOBRIST_SEED + size)
+        cells = size * size
+        self.size = size
+        self.x_keys: Tuple[int, ...] = tuple(rng.getrandbits(64) for _ in range(cells))
+        self.o_keys: Tuple[int, ...] = tuple(rng.getrandbits(64) for _ in range(cells))
+        # مفتاح يُضاف عندما يكون الدور على O للتمييز بين نفس اللوحة بدورين مختلفين
+        self.side_key: int = rng.getrandbits(64)
+
+    # المفتاح الخاص بوضع لاعب في خلية (يشمل تبديل الدور)
+    def move_key(self, player: Player, index: int) -> int:
+        keys = self.x_keys if player == Player.X else self.o_keys
+        return keys[index] ^ self.side_key
+
+    # حساب التجزئة من الصفر (تُستخدم فقط عند إنشاء حالة جديدة من لوحة)
+    def hash(self, x_bits: int, o_bits: int, player: Player) -> int:
+        value = self.side_key if player == Player.O else 0
+        for keys, bits in ((self.x_keys, x_bits), (self.o_keys, o_bits)):
+            while bits:
+                low = bits & -bits
+                value ^= keys[low.bit_length() - 1]
+                bits ^= low
+        return value
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> ZobristKeys:
+    return ZobristKeys(size)